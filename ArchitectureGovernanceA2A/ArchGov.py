@@ -1,19 +1,20 @@
+import base64
 import json
 import os
+import sys
 import asyncio
 import warnings
-
-# Third-party imports
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Union, Optional
-
-# Google GenAI and ADK imports
-from google.genai import types
-import google.generativeai as genai
-from google.adk.agents import LlmAgent, SequentialAgent
-from google.adk.models.google_llm import Gemini
-from google.adk.runners import InMemoryRunner
-from google.adk.sessions import InMemorySessionService
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+# Only lightweight modules are imported here. google-genai, ADK and the agents
+# are loaded by build_pipeline(), and opentelemetry by configure_tracing() when
+# ARCHGOV_TRACE_PATH is set, so importing this module (CLI startup, tests, the
+# benchmarks) takes a fraction of a second.
+from cmdb_store import CmdbStore, project
+from cmdb_connectors import DEFAULT_POLICY_PATH
+from models import DeploymentEnv, Compliance
+from archgov_tracing import configure_tracing, shutdown_tracing, span, annotate
 
 # --- Configuration ---
 warnings.filterwarnings("ignore")
@@ -21,34 +22,113 @@ warnings.filterwarnings("ignore")
 # Configure Google GenAI client
 # (Ideally set this in your environment variables for security)
 os.environ["GOOGLE_API_KEY"] = "XX"
-genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
-
-# --- Data Models & CMDB Data ---
-
-class DeploymentEnv:
-    PROD = "prod"
-    UAT = "uat"
-    SANDBOX = "sandbox"
-    QA = "qa"
-
-class Compliance:
-    PCI = "PCI"
-    GDPR = "GDPR"
-    SOC2 = "SOC2"
-
-# We define the Pydantic model for the output to ensure structure
-class ComplianceResult(BaseModel):
-    applicationId: int
-    appName: str
-    isCompliant: bool
-    reason: Optional[str] = None
+
+# Quota is protected by the client-side rate limiter below, so retries back off
+# gently (1, 2, 4, 8 s, capped, with jitter) instead of stalling a run for minutes.
+RETRY_OPTIONS = {
+    "attempts": 5,
+    "exp_base": 2,
+    "initial_delay": 1,
+    "max_delay": 30,
+    "jitter": 1,
+    "http_status_codes": [429, 500, 503, 504],
+}
+
+# Set ARCHGOV_EXPLAIN_COMPLIANCE=1 to have Gemini explain the rule engine's findings
+EXPLAIN_COMPLIANCE = os.environ.get("ARCHGOV_EXPLAIN_COMPLIANCE", "0") == "1"
+
+# Sharding of LLM compliance work: batch size, shards in flight and attempts per shard
+SHARD_SIZE = int(os.environ.get("ARCHGOV_SHARD_SIZE", "200"))
+SHARD_CONCURRENCY = int(os.environ.get("ARCHGOV_SHARD_CONCURRENCY", "8"))
+SHARD_ATTEMPTS = int(os.environ.get("ARCHGOV_SHARD_ATTEMPTS", "3"))
+
+# LLM response cache: set ARCHGOV_LLM_CACHE_PATH="" to disable,
+# ARCHGOV_LLM_REPLAY=1 to run fully offline from previously cached responses
+LLM_CACHE_PATH = os.environ.get("ARCHGOV_LLM_CACHE_PATH", "archgov_llm_cache.sqlite")
+LLM_CACHE_TTL = float(os.environ.get("ARCHGOV_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("ARCHGOV_LLM_CACHE_MAX_ENTRIES", "100000"))
+LLM_REPLAY = os.environ.get("ARCHGOV_LLM_REPLAY", "0") == "1"
+
+# One shared, connection-pooled model per model name for all agents
+MODEL_NAME = os.environ.get("ARCHGOV_MODEL", "gemini-2.5-flash-lite")
+GEMINI_MAX_CONNECTIONS = int(os.environ.get("ARCHGOV_GEMINI_MAX_CONNECTIONS", "100"))
+GEMINI_BASE_URL = os.environ.get("ARCHGOV_GEMINI_BASE_URL") or None
+
+# Process-wide client-side quota per model, with AIMD adaptive concurrency
+GEMINI_RPM = float(os.environ.get("ARCHGOV_GEMINI_RPM", "60"))
+GEMINI_TPM = float(os.environ.get("ARCHGOV_GEMINI_TPM", "250000"))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("ARCHGOV_GEMINI_MAX_CONCURRENCY", "64"))
+
+# Incremental runs: only changed or new applications go through the LLM stages.
+# Set ARCHGOV_FULL_RUN=1 to re-validate everything.
+STATE_PATH = os.environ.get("ARCHGOV_STATE_PATH", "archgov_state.sqlite")
+FULL_RUN = os.environ.get("ARCHGOV_FULL_RUN", "0") == "1"
+
+# Pipeline mode: 'sequential' (SequentialAgent) or 'streaming' (stages connected by
+# bounded queues, so risk assessment starts on the first non-compliant app)
+PIPELINE_MODE = os.environ.get("ARCHGOV_PIPELINE_MODE", "sequential")
+STAGE_QUEUE_SIZE = int(os.environ.get("ARCHGOV_STAGE_QUEUE_SIZE", "32"))
+STAGE_WORKERS = int(os.environ.get("ARCHGOV_STAGE_WORKERS", "4"))
+
+# Upper bound (in characters) for each block of state data templated into a prompt
+CONTEXT_MAX_CHARS = int(os.environ.get("ARCHGOV_CONTEXT_MAX_CHARS", "20000"))
+
+# Persistent sessions: events and state are stored in SQLite, so a crashed run can
+# be resumed from its last completed stage (ARCHGOV_RUN_ID=<session id>, or
+# ARCHGOV_RESUME=1 for the most recent unfinished session)
+SESSION_PATH = os.environ.get("ARCHGOV_SESSION_PATH", "archgov_sessions.sqlite")
+SESSION_BATCH_SIZE = int(os.environ.get("ARCHGOV_SESSION_BATCH_SIZE", "20"))
+RUN_ID = os.environ.get("ARCHGOV_RUN_ID") or None
+RESUME = os.environ.get("ARCHGOV_RESUME", "0") == "1"
+
+# Tracing: when set, agent, LLM, tool and extraction spans are written to this
+# file as OTLP/JSON lines. Disabled (no-op) by default.
+TRACE_PATH = os.environ.get("ARCHGOV_TRACE_PATH", "")
+
+# CMDB source: a CSV, JSON Lines, Parquet or SQLite export loaded through the shared
+# cmdb_connectors package (e.g. "cmdb.csv", "cmdb.sqlite?table=apps").
+# Empty uses the sample inventory below.
+CMDB_SOURCE = os.environ.get("ARCHGOV_CMDB_SOURCE", "")
+
+# Governance policy (YAML or JSON DSL) compiled into the rule engine's rules and
+# rendered into the explainer's prompt. Defaults to policies/architecture_policy.yaml.
+POLICY_PATH = os.environ.get("ARCHGOV_POLICY_PATH", DEFAULT_POLICY_PATH)
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Everything build_pipeline() needs; defaults come from the ARCHGOV_* environment variables above.
+    """
+    model_name: str = MODEL_NAME
+    retry_options: Dict[str, Any] = field(default_factory=lambda: dict(RETRY_OPTIONS))
+    explain_compliance: bool = EXPLAIN_COMPLIANCE
+    shard_size: int = SHARD_SIZE
+    shard_concurrency: int = SHARD_CONCURRENCY
+    shard_attempts: int = SHARD_ATTEMPTS
+    llm_cache_path: str = LLM_CACHE_PATH
+    llm_cache_ttl: float = LLM_CACHE_TTL
+    llm_cache_max_entries: int = LLM_CACHE_MAX_ENTRIES
+    llm_replay: bool = LLM_REPLAY
+    gemini_max_connections: int = GEMINI_MAX_CONNECTIONS
+    gemini_base_url: Optional[str] = GEMINI_BASE_URL
+    gemini_rpm: float = GEMINI_RPM
+    gemini_tpm: float = GEMINI_TPM
+    gemini_max_concurrency: int = GEMINI_MAX_CONCURRENCY
+    state_path: str = STATE_PATH
+    full_run: bool = FULL_RUN
+    pipeline_mode: str = PIPELINE_MODE
+    stage_queue_size: int = STAGE_QUEUE_SIZE
+    stage_workers: int = STAGE_WORKERS
+    context_max_chars: int = CONTEXT_MAX_CHARS
+    session_path: str = SESSION_PATH
+    session_batch_size: int = SESSION_BATCH_SIZE
+    run_id: Optional[str] = RUN_ID
+    resume: bool = RESUME
+    trace_path: str = TRACE_PATH
+    policy_path: str = POLICY_PATH
+
+# --- CMDB Data ---
 
 cmdb_data = [
     { "id": 1, "name": "Customer Payments Gateway", "owner": "Finance Team", "technology": "Java/Spring", "deployment": DeploymentEnv.PROD, "compliance": [Compliance.PCI, Compliance.SOC2], "users": 150000 },
@@ -58,188 +138,209 @@ cmdb_data = [
     { "id": 5, "name": "SOC2 Staging Env", "owner": "Core Platform", "technology": "Go", "deployment": DeploymentEnv.SANDBOX, "compliance": [Compliance.SOC2], "users": 50 },
 ]
 
+cmdb_store = CmdbStore.from_source(CMDB_SOURCE) if CMDB_SOURCE else CmdbStore(cmdb_data)
+
 # --- Tools ---
 
-def get_cmdb_data(applicationName: str = "") -> str:
+CMDB_DEFAULT_PAGE_SIZE = 50
+CMDB_MAX_PAGE_SIZE = 500
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+
+_CURSOR_KEYS = {"offset": int, "page_size": int, "deployment": str, "compliance": str, "owner": str, "fields": list}
+
+def _decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """Returns the listing state in `cursor`, or None if it is not one of ours."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeError):
+        # binascii.Error and json.JSONDecodeError are both ValueErrors
+        return None
+    if not isinstance(state, dict) or any(not isinstance(state.get(k), t) for k, t in _CURSOR_KEYS.items()):
+        return None
+    if state["offset"] < 0 or not 1 <= state["page_size"] <= CMDB_MAX_PAGE_SIZE:
+        return None
+    if not all(isinstance(field, str) for field in state["fields"]):
+        return None
+    return state
+
+def get_cmdb_data(
+    applicationName: str = "",
+    page: int = 1,
+    page_size: int = CMDB_DEFAULT_PAGE_SIZE,
+    deployment: str = "",
+    compliance: str = "",
+    owner: str = "",
+    fields: str = "",
+    cursor: str = "",
+) -> str:
     """
-    Retrieves application details from a mock CMDB.
-    Pass 'all', 'list', or empty string to get all applications.
+    Retrieves application details from the CMDB.
+    Pass 'all', 'list', or empty string to get all applications, one page at a time.
+
+    Args:
+        applicationName: Name of a single application, or 'all' to list applications.
+        page: 1-based page number when listing applications.
+        page_size: Number of applications per page (max 500).
+        deployment: Only list applications in this environment (prod, uat, sandbox, qa);
+            comma-separated environments match any of them, e.g. 'sandbox,qa'.
+        compliance: Only list applications subject to this standard (PCI, GDPR, SOC2,
+            HIPAA, ISO27001); comma-separated standards match any of them, e.g. 'PCI,SOC2'.
+        owner: Only list applications owned by this team.
+        fields: Comma-separated list of fields to return, e.g. 'id,name,deployment'.
+        cursor: The 'next_cursor' value from a previous call; continues that listing.
+
+    Returns a compact JSON object with 'items', 'total', 'page', 'page_size' and
+    'next_cursor' (null on the last page) when listing applications.
     """
     applicationName_lower = applicationName.lower().strip()
+    field_list = [f.strip() for f in fields.split(",") if f.strip()]
     
-    # 1. Return ALL data if requested
-    if applicationName_lower in ["all", "list", "everything", ""]:
-        return json.dumps(cmdb_data, indent=2, default=str)
+    # 1. Return a page of data if requested
+    if cursor or applicationName_lower in ["all", "list", "everything", ""]:
+        if cursor:
+            state = _decode_cursor(cursor)
+            if state is None:
+                return (
+                    f"Sorry, '{cursor}' is not a valid cursor. Pass the 'next_cursor' value from a previous "
+                    "call unchanged, or list applications with applicationName='all' and page=1."
+                )
+        else:
+            page_size = max(1, min(int(page_size), CMDB_MAX_PAGE_SIZE))
+            state = {
+                "offset": (max(1, int(page)) - 1) * page_size,
+                "page_size": page_size,
+                "deployment": deployment,
+                "compliance": compliance,
+                "owner": owner,
+                "fields": field_list,
+            }
+        items, total = cmdb_store.query(
+            deployment=state["deployment"],
+            compliance=state["compliance"],
+            owner=state["owner"],
+            offset=state["offset"],
+            limit=state["page_size"],
+        )
+        next_offset = state["offset"] + state["page_size"]
+        next_cursor = _encode_cursor({**state, "offset": next_offset}) if next_offset < total else None
+        payload = json.dumps({
+            "items": [project(app, state["fields"]) for app in items],
+            "total": total,
+            "page": state["offset"] // state["page_size"] + 1,
+            "page_size": state["page_size"],
+            "next_cursor": next_cursor,
+        }, separators=(",", ":"), default=str)
+        annotate(payload_bytes=len(payload), items=len(items), total=total)
+        return payload
     
     # 2. Search for specific application
-    for app in cmdb_data:
-        if app["name"].lower() == applicationName_lower:
-            return json.dumps(app, indent=2, default=str)
+    app = cmdb_store.get_by_name(applicationName_lower)
+    if app is not None:
+        payload = json.dumps(project(app, field_list), separators=(",", ":"), default=str)
+        annotate(payload_bytes=len(payload), items=1)
+        return payload
     
     # 3. Handle Not Found
-    available = ", ".join(app["name"] for app in cmdb_data)
+    available = ", ".join(cmdb_store.names(CMDB_DEFAULT_PAGE_SIZE))
+    if len(cmdb_store) > CMDB_DEFAULT_PAGE_SIZE:
+        available += f" and {len(cmdb_store) - CMDB_DEFAULT_PAGE_SIZE} more (list them with applicationName='all')"
     return f"Sorry, I don't have information for '{applicationName}'. Available applications: {available}"
 
-# --- Agents ---
-
-# 1. The Standard CMDB Lookup Agent
-cmdb_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-    name="cmdb_agent",
-    description="Helpful agent for looking up application details.",
-    instruction="""
-    You are a CMDB agent. Use get_cmdb_data to answer questions about applications.
-    If the user asks for everything, fetch all data.
-    """,
-    tools=[get_cmdb_data],
-)
-
-# 2. The Compliance Validator Agent (The Logic you requested)
-compliance_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config), # Using 1.5-flash for strong reasoning
-    name="compliance_validator",
-    description="Analyzes applications for security compliance violations.",
-    instruction="""
-    You are a Compliance Validator Agent.
-    
-    Your goal is to:
-    1. Fetch the list of applications using the get_cmdb_data tool (ask for 'all').
-    2. Analyze each application against the following Rules:
-    
-       - NON-COMPLIANT if: Subject to 'PCI' compliance but deployed in a 'sandbox' or 'qa' environment.
-       - NON-COMPLIANT if: Subject to 'GDPR' compliance but has more than 10,000 users in a 'uat' environment.
-       - NON-COMPLIANT if: Subject to 'SOC2' compliance but deployed in a 'sandbox' environment.
-    
-    3. Return a JSON array of objects. Do not wrap in markdown blocks. Just the raw JSON.
-       Each object must have:
-       - 'applicationId': (number, mapped from 'id')
-       - 'appName': (string, mapped from 'name')
-       - 'isCompliant': (boolean)
-       - 'reason': (string if non-compliant, explain specifically which rule failed. null if compliant)
-    """,
-    tools=[get_cmdb_data], 
-)
-
-riskassessment_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config), # Using 1.5-flash for strong reasoning
-    name="riskassessment",
-    description="Analyzes applications for security compliance violations.",
-    instruction="""""
-        As a Risk Assessment Agent, analyze the following non-compliant applications.
-        For each application, identify a primary business or security risk associated with its non-compliance and assign a severity level ('Low', 'Medium', 'High', 'Critical').
-
-        Non-compliant applications:
-        ${JSON.stringify(nonCompliantApps, null, 2)}
-
-        Return a JSON array of objects. Each object should contain 'applicationId', 'appName', 'risk' description, and 'severity'.
-    """,    
-)
-
-recommendation_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config), # Using 1.5-flash for strong reasoning
-    name="recommendation",
-    description="Analyzes applications and provide recommendations for security compliance violations.",
-    instruction="""""
-        As a Recommendation Agent, your task is to create a well-defined, actionable recommendation for each identified risk. 
-        Each recommendation must be a specific, single-step action item that can be assigned to a team to mitigate the risk. 
-        Start each recommendation with an action verb (e.g., "Migrate", "Remove", "Update", "Disable"). 
-        For example, instead of "Improve security", a good recommendation would be "Migrate the 'PCI Feature Dev' application from the non-compliant 'sandbox' to a secure, PCI-certified development environment."
-        Also, assign a priority for implementing the recommendation ('Low', 'Medium', 'High').
-
-        Identified risks:
-        ${JSON.stringify(risks, null, 2)}
-
-        Return a JSON array of objects. Each object should contain the original 'risk', a 'recommendation', and a 'priority'.    
-    """,    
-)
-
-reporting_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config), # Using 1.5-flash for strong reasoning
-    name="reporting",
-    description="Provides reporting for security compliance violations.",
-    instruction="""""
-        As a Reporting Agent, create a concise daily compliance report based on the following data.
-        The report should contain a brief 'summary' of the overall compliance status and a list of key 'actionItems'. 
-        Action items should be created for all recommendations with a 'High' and 'Medium' priority. 
-        Additionally, ensure an action item is created for any risk related to SOC2 or PCI compliance in non-production environments, as these are critical regulatory concerns.
-
-        Compliance check results: ${JSON.stringify(complianceResults.filter(r => !r.isCompliant))}
-        Identified risks: ${JSON.stringify(risks)}
-        Mitigation recommendations: ${JSON.stringify(recommendations)}
-
-        Return a single JSON object with 'summary' (string) and 'actionItems' (array of strings).
-    """,    
-)
-
-evaluation_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config), # Using 1.5-flash for strong reasoning
-    name="evaluation",
-    description="Evaluates the effectiveness of recommendations for security compliance violations.",
-    instruction="""""
-        As an Evaluation Agent, assess the quality and completeness of the generated compliance report based on the workflow's output.
-        - Did the report correctly summarize the situation?
-        - Did the report identify the most critical action items based on the identified risks?
-        - Were all high-priority risks addressed in the action items?
-
-        Based on your assessment, provide a quantitative 'score' from 1 to 100 and brief 'feedback' explaining your reasoning.
-        
-        Workflow Output to Evaluate:
-        Report: ${JSON.stringify(report)}
-        Risks: ${JSON.stringify(risks)}
-
-        Return a single JSON object with 'score' (number) and 'feedback' (string).
-    """,    
-)
-
-print("✅ Agents created successfully.")
-
-# --- Runners ---
-
-session_service = InMemorySessionService()
-APP_NAME = "adk_demo"
-
-root_agent = SequentialAgent(
-    name="ArchGovernancePipeline",
-    sub_agents=[compliance_agent,riskassessment_agent,recommendation_agent,reporting_agent,evaluation_agent],
-)
-
-print("✅ Sequential Agent created.")
-
-runner = InMemoryRunner(agent=root_agent)
-
-def extract_json_from_events(events):
+# --- Pipeline ---
+
+def build_pipeline(config: Optional[PipelineConfig] = None, store: Optional[CmdbStore] = None):
     """
-    Extracts and parses JSON text from the last event's content part.
+    Returns a GovernancePipeline for `config` over `store` (default: the CMDB above).
+    Agents, models and the runner are only constructed when first used.
     """
-    # If response is a single event, wrap in list
-    if not isinstance(events, list):
-        events = [events]
-    for event in reversed(events):
-        if hasattr(event, "content") and hasattr(event.content, "parts"):
-            for part in event.content.parts:
-                if hasattr(part, "text") and part.text.strip().startswith("["):
-                    try:
-                        return json.loads(part.text)
-                    except Exception as e:
-                        print("Error parsing JSON:", e)
-                        print("Raw text:", part.text)
-                        return None
-    return None
+    from pipeline import GovernancePipeline
+
+    config = config or PipelineConfig()
+    configure_tracing(config.trace_path)
+    return GovernancePipeline(config, cmdb_store if store is None else store, tools=[get_cmdb_data])
+
+_default_pipeline = None
+
+def default_pipeline():
+    """
+    The pipeline configured from the environment, built on first use.
+    """
+    global _default_pipeline
+    if _default_pipeline is None:
+        _default_pipeline = build_pipeline()
+    return _default_pipeline
+
+def __getattr__(name: str) -> Any:
+    # Keeps `ArchGov.root_agent` (used by the ADK CLI), `ArchGov.runner` and the
+    # individual agents available as lazily built module attributes.
+    if name in ("root_agent", "runner", "session_service", "model_registry", "llm_cache") or name.endswith("_agent"):
+        return getattr(default_pipeline(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def register_plugin(plugin) -> None:
+    """
+    Applies an ADK plugin to the default pipeline's runners.
+    """
+    default_pipeline().register_plugin(plugin)
+
+async def run_sequential(store: CmdbStore) -> Dict[str, Any]:
+    return await default_pipeline().run_sequential(store)
+
+async def run_streaming(store: CmdbStore) -> Dict[str, Any]:
+    return await default_pipeline().run_streaming(store)
 
 # --- Main Execution ---
 async def main():
+    from incremental import RunStateStore, policy_salt
+
+    pipeline = default_pipeline()
+    config = pipeline.config
+    all_apps = cmdb_store.all()
+    # Changing the policy invalidates every stored fingerprint
+    run_state = RunStateStore(config.state_path, salt=policy_salt(pipeline.policy))
+    run_state.prune(app["id"] for app in all_apps)
+    changed, unchanged = (all_apps, []) if config.full_run else run_state.partition(all_apps)
+    print(f"🔎 {len(changed)} changed or new applications, {len(unchanged)} unchanged")
+
+    outputs = run_state.prior_outputs(app["id"] for app in unchanged)
+    outputs["failures"] = []
+    if changed:
+        with span("archgov.run", mode=config.pipeline_mode, apps=len(changed), unchanged=len(unchanged)):
+            stages = await pipeline.run(CmdbStore(changed), final_stages=False)
+        outputs["failures"] = stages["failures"]
+        if stages["failures"]:
+            print(f"❌ {len(stages['failures'])} items failed: " + json.dumps(stages["failures"][:5], default=str))
+        failed = [f["applicationId"] for f in stages["failures"]]
+        incomplete = run_state.save(changed, stages["compliance_results"], stages["risks"], stages["recommendations"], failed)
+        if incomplete:
+            print(f"⚠️ {len(incomplete)} applications are missing stage outputs and will be re-validated next run: {incomplete[:20]}")
+
+        outputs["compliance_results"] += stages["compliance_results"]
+        outputs["risks"] += stages["risks"]
+        outputs["recommendations"] += stages["recommendations"]
+    run_state.close()
+
+    # The report always covers the whole inventory, not just this run's changes
+    with span("archgov.report", apps=len(all_apps)):
+        outputs.update(await pipeline.report(outputs))
 
-    response = await runner.run_debug(
-        "Run the compliance validation on all applications and return the JSON report"
-    )
-    #print(response)
     # Only print the parsed JSON result
-    result = extract_json_from_events(response)
-    print(json.dumps(result, indent=2))
+    print(json.dumps(outputs, indent=2))
+    stats = pipeline.stats()
+    if "llm_cache" in stats:
+        print("LLM cache:", json.dumps(stats["llm_cache"]))
+    print("Model pools:", json.dumps(stats.get("model_pools", {})))
+    shutdown_tracing()
 
     await asyncio.sleep(5)
+    return len(outputs["failures"])
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    failures = asyncio.run(main())
+    if failures:
+        print(f"\n❌ Completed with {failures} failed items; they will be retried on the next run.")
+        sys.exit(1)
 
-    print("\n✅ Completed execution.")
\ No newline at end of file
+    print("\n✅ Completed execution.")
@@ -0,0 +1,51 @@
+import uuid
+from typing import Any, Dict, List, Optional
+
+from google.genai import types
+from google.adk.agents import BaseAgent
+from google.adk.plugins import BasePlugin
+from google.adk.runners import InMemoryRunner
+
+# Plugins (tracing, benchmarking) applied to every runner created by run_agent
+PLUGINS: List[BasePlugin] = []
+
+
+async def run_agent(
+    agent: BaseAgent,
+    message: str,
+    app_name: str = "adk_demo",
+    state: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """
+    Runs an agent on a single user message in its own session and returns the events.
+    Used to invoke the same agent on many independent inputs concurrently;
+    `state` seeds the session state the agent's instruction reads from.
+    """
+    runner = InMemoryRunner(agent=agent, app_name=app_name, plugins=list(PLUGINS))
+    try:
+        session = await runner.session_service.create_session(
+            app_name=app_name, user_id="pipeline", session_id=uuid.uuid4().hex, state=state
+        )
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        return [
+            event
+            async for event in runner.run_async(
+                user_id="pipeline", session_id=session.id, new_message=content
+            )
+        ]
+    finally:
+        await runner.close()
+
+
+def final_text(events: List[Any]) -> Optional[str]:
+    """
+    Returns the text of the last event that carries text content.
+    """
+    for event in reversed(events):
+        content = getattr(event, "content", None)
+        if content and content.parts:
+            text = "".join(part.text or "" for part in content.parts)
+            if text.strip():
+                return text
+    return None
+
@@ -0,0 +1,436 @@
+import gc
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# cmdb_connectors is shared with the Crew pipeline and lives at the repository
+# root, which must be on PYTHONPATH
+from cmdb_connectors import CANONICAL_FIELDS, COMPLIANCE_REGISTRY, ComplianceRegistry, iter_batches
+from models import DeploymentEnv
+
+# Codes of the deployment column; other environments are appended on first sight
+KNOWN_DEPLOYMENTS = (DeploymentEnv.PROD, DeploymentEnv.UAT, DeploymentEnv.SANDBOX, DeploymentEnv.QA)
+MAX_DEPLOYMENTS = 256
+
+_CANONICAL = frozenset(CANONICAL_FIELDS)
+_COMPARE = {"gt": np.greater, "gte": np.greater_equal, "lt": np.less, "lte": np.less_equal}
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    # numpy < 2: set bits per byte from a 256-entry table
+    _POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+    def _popcount(bitmap: np.ndarray) -> np.ndarray:
+        return _POPCOUNT[bitmap]
+
+
+def _normalize(value: Any) -> str:
+    return str(value).lower().strip()
+
+
+def _values(value: Union[str, Iterable[str]]) -> List[str]:
+    # A filter is one value, a comma-separated string or a list, matched as OR
+    values = value.split(",") if isinstance(value, str) else value
+    return [v.strip() for v in values if v and v.strip()]
+
+
+class _Dictionary:
+    """
+    Dictionary encoding of a low-cardinality string column: each distinct
+    value is stored once and rows hold its integer code.
+    """
+
+    def __init__(self, initial: Iterable[str] = (), limit: Optional[int] = None):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._limit = limit
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            if self._limit is not None and len(self.values) >= self._limit:
+                raise ValueError(f"More than {self._limit} distinct values in a dictionary-encoded CMDB column")
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[str]) -> List[int]:
+        codes = self._codes
+        return [codes[v] if v in codes else self.code(v) for v in values]
+
+    def matching(self, value: str) -> List[int]:
+        """
+        Codes of every stored value equal to `value` once normalized.
+        """
+        wanted = _normalize(value)
+        return [code for code, stored in enumerate(self.values) if _normalize(stored) == wanted]
+
+
+class CmdbColumns:
+    """
+    Column view of a CmdbStore, as evaluated by the rule engine. Deployment
+    is a uint8 code column and compliance a uint64 mask column (bits from the
+    compliance registry), so rule predicates are integer and bitwise ops.
+    Masks are memoized per view, so rules sharing a condition compute it
+    once; they are shared and must not be modified in place.
+    """
+
+    def __init__(self, store: "CmdbStore"):
+        self.id = store._column("id")
+        self.users = store._column("users")
+        self.deployment = store._column("deployment")
+        self.compliance = store._column("compliance")
+        self.deployment_values = list(store._deployments.values)
+        self.registry = store.registry
+        self._store = store
+        self._masks: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def env_in(self, *envs: str) -> np.ndarray:
+        wanted = frozenset(_normalize(env) for env in envs)
+        key = ("deployment", wanted)
+        if key not in self._masks:
+            # Lookup table indexed by deployment code: one gather, no string compares
+            table = np.zeros(max(1, len(self.deployment_values)), dtype=bool)
+            table[[code for code, value in enumerate(self.deployment_values) if _normalize(value) in wanted]] = True
+            self._masks[key] = table[self.deployment]
+        return self._masks[key]
+
+    def has_tag(self, *tags: str) -> np.ndarray:
+        """
+        True where the application is subject to any of `tags`.
+        """
+        mask = self.registry.mask(tags)
+        key = ("any", mask)
+        if key not in self._masks:
+            self._masks[key] = (self.compliance & np.uint64(mask)) != 0
+        return self._masks[key]
+
+    def has_all_tags(self, *tags: str) -> np.ndarray:
+        if not all(tag in self.registry for tag in tags):
+            return np.zeros(len(self), dtype=bool)
+        mask = self.registry.mask(tags)
+        key = ("all", mask)
+        if key not in self._masks:
+            self._masks[key] = (self.compliance & np.uint64(mask)) == np.uint64(mask)
+        return self._masks[key]
+
+    def compare(self, column: str, op: str, value: int) -> np.ndarray:
+        """
+        `column` compared with `value`, op one of gt/gte/lt/lte (e.g. users > 10000).
+        """
+        key = (column, op, value)
+        if key not in self._masks:
+            self._masks[key] = _COMPARE[op](getattr(self, column), value)
+        return self._masks[key]
+
+    def names(self) -> List[str]:
+        return self._store.names()
+
+
+class CmdbStore:
+    """
+    In-memory CMDB stored column by column: ids and user counts as int64
+    arrays, owner/technology/deployment dictionary-encoded, compliance tags
+    as one uint64 mask per application and names as a single UTF-8 buffer.
+    Records are only materialized as dicts for the rows a lookup returns.
+    Lookups by name and id use sorted hash/id indexes. Deployment and
+    compliance filters combine packed bitmaps (one per environment and per
+    standard, built on first use) with bitwise OR/AND.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), registry: Optional[ComplianceRegistry] = None):
+        self._size = 0
+        self._chunks: Dict[str, List[np.ndarray]] = defaultdict(list)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._name_chunks: List[bytes] = []
+        self._name_buffer = b""
+        self._owners = _Dictionary()
+        self._technologies = _Dictionary()
+        self._deployments = _Dictionary(KNOWN_DEPLOYMENTS, limit=MAX_DEPLOYMENTS)
+        self.registry = registry or COMPLIANCE_REGISTRY
+        self._bitmaps: Dict[Tuple[str, int], np.ndarray] = {}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._name_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._id_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.extend(records)
+
+    @classmethod
+    def from_source(cls, source: str, columns: Optional[Sequence[str]] = None, **options: Any) -> "CmdbStore":
+        """
+        Loads a CSV, JSON Lines, Parquet or SQLite export (see cmdb_connectors)
+        batch by batch. Records without an id are numbered in file order after
+        the largest id in the export, so they never collide with a real id.
+        Only one batch of dicts is alive at a time.
+        """
+        store = cls()
+        missing: List[int] = []
+        # Parsing millions of records would otherwise run many full collections
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for batch in iter_batches(source, columns, **options):
+                for offset, record in enumerate(batch):
+                    if record.get("id") is None:
+                        missing.append(len(store) + offset)
+                        record["id"] = 0
+                store.extend(batch)
+        finally:
+            if was_enabled:
+                gc.enable()
+        if missing:
+            # Real ids may appear after the id-less rows, so ids are allocated once loading is done
+            ids = store._column("id")
+            known = np.ones(len(ids), dtype=bool)
+            known[missing] = False
+            first = int(ids[known].max()) + 1 if known.any() else 1
+            ids[missing] = np.arange(first, first + len(missing), dtype=np.int64)
+            store._id_index = None
+        return store
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.extend([record])
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Appends a batch of records, encoding each field a column at a time.
+        """
+        records = list(records)
+        if not records:
+            return
+        count = len(records)
+        start = self._size
+        names = [str(r["name"]) for r in records]
+        encoded = [name.encode() for name in names]
+        self._append("name_end", np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=count))
+                     + (len(self._name_buffer) + sum(map(len, self._name_chunks))))
+        self._name_chunks.append(b"".join(encoded))
+        self._append("name_hash", np.fromiter((hash(_normalize(n)) for n in names), dtype=np.int64, count=count))
+        self._append("id", np.fromiter((r["id"] for r in records), dtype=np.int64, count=count))
+        self._append("users", np.fromiter((r.get("users", 0) or 0 for r in records), dtype=np.int64, count=count))
+        self._append("owner", np.array(self._owners.encode(str(r.get("owner", "")) for r in records), dtype=np.int32))
+        self._append("technology", np.array(self._technologies.encode(str(r.get("technology", "")) for r in records), dtype=np.int32))
+        self._append("deployment", np.array(self._deployments.encode(str(r.get("deployment", "")) for r in records), dtype=np.uint8))
+        self._append("compliance", np.fromiter(self._encode_tags(r.get("compliance", []) for r in records), dtype=np.uint64, count=count))
+        # Fields outside the canonical schema are kept per record, as given
+        for offset, record in enumerate(records):
+            if not _CANONICAL.issuperset(record):
+                self._extras[start + offset] = {k: v for k, v in record.items() if k not in _CANONICAL}
+        self._size += count
+        self._name_index = self._id_index = None
+        self._bitmaps = {}
+
+    def _append(self, column: str, values: np.ndarray) -> None:
+        self._chunks[column].append(values)
+
+    def _column(self, column: str) -> np.ndarray:
+        # Batches are appended as chunks and concatenated on first read
+        pending = self._chunks.pop(column, None)
+        if pending:
+            current = self._arrays.get(column)
+            self._arrays[column] = np.concatenate(([current] if current is not None else []) + pending)
+        if column not in self._arrays:
+            dtype = {"deployment": np.uint8, "compliance": np.uint64, "owner": np.int32, "technology": np.int32}
+            self._arrays[column] = np.empty(0, dtype=dtype.get(column, np.int64))
+        return self._arrays[column]
+
+    def _names(self) -> Tuple[bytes, np.ndarray]:
+        if self._name_chunks:
+            self._name_buffer = b"".join([self._name_buffer] + self._name_chunks)
+            self._name_chunks = []
+        return self._name_buffer, self._column("name_end")
+
+    def _encode_tags(self, tag_lists: Iterable[Sequence[str]]) -> Iterator[int]:
+        memo: Dict[Tuple[str, ...], int] = {}
+        for tags in tag_lists:
+            key = tuple(tags)
+            mask = memo.get(key)
+            if mask is None:
+                mask = memo[key] = self.registry.encode(key)
+            yield mask
+
+    def _name(self, row: int) -> str:
+        buffer, ends = self._names()
+        start = int(ends[row - 1]) if row else 0
+        return buffer[start:int(ends[row])].decode()
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        record = {
+            "id": int(self._column("id")[row]),
+            "name": self._name(row),
+            "owner": self._owners.values[self._column("owner")[row]],
+            "technology": self._technologies.values[self._column("technology")[row]],
+            "deployment": self._deployments.values[self._column("deployment")[row]],
+            "compliance": self.registry.decode(int(self._column("compliance")[row])),
+            "users": int(self._column("users")[row]),
+        }
+        extras = self._extras.get(row)
+        if extras:
+            record.update(extras)
+        return record
+
+    def _records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self._record(int(row)) for row in rows]
+
+    def columns(self) -> CmdbColumns:
+        return CmdbColumns(self)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._record(row) for row in range(self._size))
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._records(range(self._size))
+
+    def names(self, limit: Optional[int] = None) -> List[str]:
+        buffer, ends = self._names()
+        count = self._size if limit is None else min(limit, self._size)
+        starts = [0] + ends[:count - 1].tolist() if count else []
+        return [buffer[s:e].decode() for s, e in zip(starts, ends[:count].tolist())]
+
+    @staticmethod
+    def _lookup(index: Tuple[np.ndarray, np.ndarray], key: int) -> np.ndarray:
+        # Rows whose key equals `key`, in insertion order (stable sort)
+        keys, rows = index
+        left, right = np.searchsorted(keys, key, side="left"), np.searchsorted(keys, key, side="right")
+        return rows[left:right]
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        if self._name_index is None:
+            hashes = self._column("name_hash")
+            order = np.argsort(hashes, kind="stable")
+            self._name_index = (hashes[order], order)
+        wanted = _normalize(name)
+        # Hash collisions are resolved by comparing names; the latest record wins
+        for row in self._lookup(self._name_index, hash(wanted))[::-1]:
+            if _normalize(self._name(int(row))) == wanted:
+                return self._record(int(row))
+        return None
+
+    def get_by_id(self, app_id: int) -> Optional[Dict[str, Any]]:
+        if self._id_index is None:
+            ids = self._column("id")
+            order = np.argsort(ids, kind="stable")
+            self._id_index = (ids[order], order)
+        rows = self._lookup(self._id_index, int(app_id))
+        return self._record(int(rows[-1])) if len(rows) else None
+
+    def _bitmap(self, kind: str, key: int) -> np.ndarray:
+        """
+        Packed bitmap over row positions (8 rows per byte): rows whose
+        compliance mask has bit `key`, or whose deployment code is `key`.
+        """
+        bitmap = self._bitmaps.get((kind, key))
+        if bitmap is None:
+            if kind == "compliance":
+                rows = (self._column("compliance") >> np.uint64(key)) & np.uint64(1) != 0
+            else:
+                rows = self._column("deployment") == key
+            bitmap = self._bitmaps[(kind, key)] = np.packbits(rows)
+        return bitmap
+
+    def _any_of(self, kind: str, keys: Iterable[int]) -> np.ndarray:
+        bitmap = np.zeros((self._size + 7) // 8, dtype=np.uint8)
+        for key in keys:
+            bitmap |= self._bitmap(kind, key)
+        return bitmap
+
+    def _select(
+        self,
+        deployment: Union[str, Iterable[str]] = "",
+        compliance: Union[str, Iterable[str]] = "",
+        owner: str = "",
+    ) -> Optional[np.ndarray]:
+        """
+        Packed bitmap of the rows matching every given filter (None if no
+        filter is given). Several deployments or standards match any of them.
+        """
+        selected = []
+        deployments = _values(deployment)
+        if deployments:
+            selected.append(self._any_of("deployment", {c for d in deployments for c in self._deployments.matching(d)}))
+        standards = _values(compliance)
+        if standards:
+            selected.append(self._any_of("compliance", {self.registry.bit(s) for s in standards if s in self.registry}))
+        if owner:
+            selected.append(np.packbits(np.isin(self._column("owner"), self._owners.matching(owner))))
+        if not selected:
+            return None
+        bitmap = selected[0]
+        for other in selected[1:]:
+            bitmap = bitmap & other
+        return bitmap
+
+    def _rows(self, bitmap: np.ndarray, offset: int = 0, limit: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Row positions of the set bits number offset..offset+limit, and the
+        number of set bits. Only the bytes holding the page are unpacked.
+        """
+        counts = np.cumsum(_popcount(bitmap), dtype=np.int64)
+        total = int(counts[-1]) if len(counts) else 0
+        end = total if limit is None else min(total, offset + limit)
+        if offset >= end:
+            return np.empty(0, dtype=np.int64), total
+        first = int(np.searchsorted(counts, offset, side="right"))
+        last = int(np.searchsorted(counts, end - 1, side="right")) + 1
+        rows = np.flatnonzero(np.unpackbits(bitmap[first:last])) + first * 8
+        skip = offset - (int(counts[first - 1]) if first else 0)
+        return rows[skip:skip + end - offset], total
+
+    def count(
+        self,
+        deployment: Union[str, Iterable[str]] = "",
+        compliance: Union[str, Iterable[str]] = "",
+        owner: str = "",
+    ) -> int:
+        bitmap = self._select(deployment, compliance, owner)
+        return self._size if bitmap is None else int(_popcount(bitmap).sum())
+
+    def by_owner(self, owner: str) -> List[Dict[str, Any]]:
+        return self._records(self._rows(self._select(owner=owner))[0])
+
+    def by_deployment(self, deployment: str) -> List[Dict[str, Any]]:
+        return self._records(self._rows(self._select(deployment=deployment))[0])
+
+    def by_compliance(self, tag: str) -> List[Dict[str, Any]]:
+        return self._records(self._rows(self._select(compliance=tag))[0])
+
+    def query(
+        self,
+        deployment: Union[str, Iterable[str]] = "",
+        compliance: Union[str, Iterable[str]] = "",
+        owner: str = "",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Returns one page of records matching every given filter, in insertion
+        order, together with the total number of matches. Deployment and
+        compliance take one value or several ('sandbox,qa', ['PCI', 'SOC2']),
+        matched as OR; empty filters are ignored and only the returned page
+        is materialized.
+        """
+        bitmap = self._select(deployment, compliance, owner)
+        if bitmap is None:
+            end = None if limit is None else offset + limit
+            return self._records(range(self._size)[offset:end]), self._size
+        rows, total = self._rows(bitmap, offset, limit)
+        return self._records(rows), total
+
+
+def project(record: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Keeps only the requested fields of a record (all fields if none are given).
+    """
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
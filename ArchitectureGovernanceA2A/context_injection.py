@@ -0,0 +1,105 @@
+import json
+from string import Template
+from typing import Any, Callable, Dict, List, Mapping, Union
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+from json_stream import parse_json
+
+# A binding selects the data for one placeholder from session state
+Binding = Callable[[Mapping[str, Any]], Any]
+
+
+def state_json(state: Mapping[str, Any], key: str, default: Any = None) -> Any:
+    """
+    Reads a stage output from session state. Agents with an output_key store
+    their raw text, so strings are parsed as JSON model output.
+    """
+    value = state.get(key, default)
+    if isinstance(value, str):
+        try:
+            return parse_json(value)
+        except ValueError:
+            return default
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def compact_json(value: Any, max_chars: int) -> str:
+    """
+    Serializes a value without whitespace, keeping it under `max_chars`.
+    Lists are cut at the last item that fits and dicts drop the entries that do
+    not fit; both end with a count of what was omitted, so the kept part stays
+    valid JSON. Long strings are shortened inside their quotes.
+    """
+    text = _dumps(value)
+    if len(text) <= max_chars:
+        return text
+    budget = max_chars - 40
+    if isinstance(value, list):
+        kept: List[str] = []
+        used = 2
+        for item in value:
+            item_text = _dumps(item)
+            if used + len(item_text) + 1 > budget:
+                break
+            kept.append(item_text)
+            used += len(item_text) + 1
+        omitted = len(value) - len(kept)
+        return "[" + ",".join(kept) + f"] (+{omitted} more items omitted)"
+    if isinstance(value, dict):
+        kept = []
+        used = 2
+        for key, item in value.items():
+            entry = _dumps(str(key)) + ":" + _dumps(item)
+            if used + len(entry) + 1 > budget:
+                continue
+            kept.append(entry)
+            used += len(entry) + 1
+        omitted = len(value) - len(kept)
+        return "{" + ",".join(kept) + f"}} (+{omitted} more keys omitted)"
+    if isinstance(value, str):
+        return _dumps(value[: max(0, budget)] + "...(truncated)")
+    return text[: max_chars - 15] + "...(truncated)"
+
+
+# Non-compliant application ids listed in a compliance stage's summary
+SUMMARY_MAX_IDS = 50
+
+
+def compliance_summary(results: List[Dict[str, Any]]) -> str:
+    """
+    The text a compliance stage replies with. ADK shows the previous agent's
+    reply to the next one even with include_contents='none', so the results
+    themselves travel only in session state ('compliance_results').
+    """
+    failing = [str(r["applicationId"]) for r in results if not r["isCompliant"]]
+    text = f"Checked {len(results)} applications: {len(failing)} non-compliant"
+    if not failing:
+        return text + "."
+    more = f" and {len(failing) - SUMMARY_MAX_IDS} more" if len(failing) > SUMMARY_MAX_IDS else ""
+    return text + f" (application ids {', '.join(failing[:SUMMARY_MAX_IDS])}{more})."
+
+
+def state_instruction(template: str, bindings: Dict[str, Union[str, Binding]], max_chars: int = 20_000):
+    """
+    Returns an ADK instruction provider that fills `${name}` placeholders in
+    `template` with compact JSON selected from session state, each bounded to
+    `max_chars`. A binding is either a state key or a function of the state.
+    Agents using it should set include_contents='none' so they see only the
+    data templated into their prompt, not the whole conversation history.
+    """
+    compiled = Template(template)
+
+    def provider(ctx: ReadonlyContext) -> str:
+        state = ctx.state
+        values = {}
+        for name, binding in bindings.items():
+            value = binding(state) if callable(binding) else state_json(state, binding, [])
+            values[name] = compact_json(value, max_chars)
+        return compiled.safe_substitute(values)
+
+    return provider
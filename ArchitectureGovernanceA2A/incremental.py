@@ -0,0 +1,170 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cmdb_connectors import Policy, render_policy
+
+# Record fields read by the compliance rules; a change to any other field
+# (e.g. technology) does not require re-validation.
+RULE_FIELDS = ("id", "name", "deployment", "compliance", "users")
+
+
+def fingerprint(record: Dict[str, Any], salt: str = "") -> str:
+    """
+    Stable hash of the rule-relevant fields of a CMDB record.
+    `salt` should identify the rule set, so changing a rule invalidates every fingerprint.
+    """
+    fields = {field: record.get(field) for field in RULE_FIELDS}
+    fields["compliance"] = sorted(fields["compliance"] or [])
+    payload = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256((salt + payload).encode()).hexdigest()
+
+
+def policy_salt(policy: Policy) -> str:
+    """
+    Hash of the whole policy (rule definitions and standards' requirements,
+    which the LLM stages are prompted with), for use as the fingerprint salt.
+    """
+    payload = json.dumps(render_policy(policy), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RunStateStore:
+    """
+    Persists, per application, the fingerprint it was last validated with and
+    the compliance result, risks and recommendations produced for it, so the
+    next run only sends changed or new applications through the LLM stages.
+    """
+
+    def __init__(self, path: str = "archgov_state.sqlite", salt: str = ""):
+        self.salt = salt
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS app_state (
+                app_id INTEGER PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                compliance_result TEXT,
+                risks TEXT,
+                recommendations TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def partition(self, records: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Splits records into (changed or new, unchanged) against the stored fingerprints.
+        """
+        known = dict(self._conn.execute("SELECT app_id, fingerprint FROM app_state"))
+        changed, unchanged = [], []
+        for record in records:
+            if known.get(int(record["id"])) == fingerprint(record, self.salt):
+                unchanged.append(record)
+            else:
+                changed.append(record)
+        return changed, unchanged
+
+    def prior_outputs(self, app_ids: Iterable[int]) -> Dict[str, List[Any]]:
+        """
+        Returns the stored compliance results, risks and recommendations for the given apps.
+        """
+        outputs = {"compliance_results": [], "risks": [], "recommendations": []}
+        for app_id in app_ids:
+            row = self._conn.execute(
+                "SELECT compliance_result, risks, recommendations FROM app_state WHERE app_id = ?",
+                (int(app_id),),
+            ).fetchone()
+            if row is None:
+                continue
+            if row[0]:
+                outputs["compliance_results"].append(json.loads(row[0]))
+            outputs["risks"].extend(json.loads(row[1] or "[]"))
+            outputs["recommendations"].extend(json.loads(row[2] or "[]"))
+        return outputs
+
+    def save(
+        self,
+        records: Iterable[Dict[str, Any]],
+        compliance_results: List[Dict[str, Any]],
+        risks: List[Dict[str, Any]],
+        recommendations: List[Dict[str, Any]],
+        failed: Iterable[int] = (),
+    ) -> List[int]:
+        """
+        Stores fingerprints and outputs for the applications validated in this
+        run. An application is only checkpointed when all of its outputs came
+        back: a compliance result and, if it is non-compliant, at least one
+        risk and one recommendation, and none of its items is in `failed`.
+        The others are forgotten, so the next run validates them again; their
+        ids are returned.
+        """
+        failed = {int(i) for i in failed if i is not None}
+        results_by_app = {int(r["applicationId"]): r for r in compliance_results}
+        risks_by_app = _group_by_app(risks)
+        recommendations_by_app = _group_by_app(_attribute(recommendations, risks))
+        now = time.time()
+        complete, incomplete = [], []
+        for record in records:
+            app_id = int(record["id"])
+            result = results_by_app.get(app_id)
+            done = app_id not in failed and result is not None and (
+                result.get("isCompliant") or (app_id in risks_by_app and app_id in recommendations_by_app)
+            )
+            if not done:
+                incomplete.append(app_id)
+                continue
+            complete.append((
+                app_id,
+                fingerprint(record, self.salt),
+                json.dumps(result),
+                json.dumps(risks_by_app.get(app_id, [])),
+                json.dumps(recommendations_by_app.get(app_id, [])),
+                now,
+            ))
+        self._conn.executemany("INSERT OR REPLACE INTO app_state VALUES (?, ?, ?, ?, ?, ?)", complete)
+        self._conn.executemany("DELETE FROM app_state WHERE app_id = ?", [(i,) for i in incomplete])
+        self._conn.commit()
+        return incomplete
+
+    def prune(self, current_ids: Iterable[int]) -> None:
+        """
+        Forgets applications that are no longer in the CMDB.
+        """
+        current = {int(i) for i in current_ids}
+        stale = [(i,) for (i,) in self._conn.execute("SELECT app_id FROM app_state") if i not in current]
+        self._conn.executemany("DELETE FROM app_state WHERE app_id = ?", stale)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _attribute(recommendations: Optional[List[Dict[str, Any]]], risks: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Gives recommendations without an applicationId the id of the risk they
+    quote, so they are stored with their application instead of dropped.
+    """
+    risk_apps = {
+        str(r.get("risk", "")).strip(): r["applicationId"]
+        for r in risks or [] if isinstance(r, dict) and r.get("applicationId") is not None
+    }
+    attributed = []
+    for item in recommendations or []:
+        if isinstance(item, dict) and item.get("applicationId") is None:
+            app_id = risk_apps.get(str(item.get("risk", "")).strip())
+            if app_id is not None:
+                item = {**item, "applicationId": app_id}
+        attributed.append(item)
+    return attributed
+
+
+def _group_by_app(items: Optional[List[Dict[str, Any]]]) -> Dict[int, List[Dict[str, Any]]]:
+    grouped: Dict[int, List[Dict[str, Any]]] = {}
+    for item in items or []:
+        if isinstance(item, dict) and item.get("applicationId") is not None:
+            grouped.setdefault(int(item["applicationId"]), []).append(item)
+    return grouped
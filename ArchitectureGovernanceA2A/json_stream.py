@@ -0,0 +1,128 @@
+import json
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from archgov_json import IncrementalJsonParser, parse_json
+from archgov_tracing import annotate, span
+
+
+def validate_item(item: Any, model: Optional[Type[BaseModel]]) -> Optional[Any]:
+    """
+    Validates one parsed item against a Pydantic model; invalid items are reported and dropped.
+    """
+    if model is None:
+        return item
+    try:
+        return model.model_validate(item)
+    except ValidationError as e:
+        print(f"Dropping item that does not match {model.__name__}: {e.errors()[0]['msg']}")
+        print("Raw item:", json.dumps(item, default=str)[:500])
+        return None
+
+
+def _validate_all(items: Iterable[Any], model: Optional[Type[BaseModel]]) -> List[Any]:
+    return [v for v in (validate_item(item, model) for item in items) if v is not None]
+
+
+def _event_text(event: Any) -> str:
+    content = getattr(event, "content", None)
+    if not content or not content.parts:
+        return ""
+    return "".join(getattr(part, "text", None) or "" for part in content.parts if not getattr(part, "thought", False))
+
+
+class StreamItem(NamedTuple):
+    author: str
+    item: Any
+    in_array: bool
+
+
+async def stream_json_from_events(
+    events: AsyncIterator[Any],
+    models: Optional[Dict[str, Type[BaseModel]]] = None,
+) -> AsyncGenerator[StreamItem, None]:
+    """
+    Consumes runner events as they arrive and yields each JSON item as soon as
+    it is complete. With streaming enabled, partial events are parsed chunk by
+    chunk and the aggregated final event is skipped. Items are validated
+    against `models[author]` when given.
+    """
+    parsers: Dict[str, IncrementalJsonParser] = {}
+    streaming: set = set()
+    async for event in events:
+        text = _event_text(event)
+        author = event.author
+        if getattr(event, "partial", False):
+            streaming.add(author)
+            parser = parsers.setdefault(author, IncrementalJsonParser())
+        elif author in streaming:
+            # Aggregate of the partial chunks already parsed; the next turn starts fresh
+            streaming.discard(author)
+            parsers.pop(author, None)
+            continue
+        else:
+            parser = IncrementalJsonParser()
+        if not text:
+            continue
+        model = (models or {}).get(author)
+        if author in streaming:
+            # Streamed chunks are too small to be worth a span each
+            validated = _validate_all(parser.feed(text), model)
+        else:
+            with span("extract_json", author=author, bytes=len(text)):
+                validated = _validate_all(parser.feed(text), model)
+                annotate(items=len(validated))
+        for item in validated:
+            yield StreamItem(author, item, parser.is_array)
+
+
+async def collect_stage_outputs(
+    events: AsyncIterator[Any],
+    models: Optional[Dict[str, Type[BaseModel]]] = None,
+    skip: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Streams events and groups the validated items by agent: a list for stages
+    returning arrays, a single value for stages returning an object. Text from
+    the agents in `skip` is not parsed.
+    """
+    skip = set(skip)
+
+    async def parsed_events() -> AsyncGenerator[Any, None]:
+        async for event in events:
+            if event.author not in skip:
+                yield event
+
+    outputs: Dict[str, Any] = {}
+    async for author, item, in_array in stream_json_from_events(parsed_events(), models):
+        if isinstance(item, BaseModel):
+            item = item.model_dump()
+        if in_array:
+            outputs.setdefault(author, []).append(item)
+        else:
+            outputs[author] = item
+    return outputs
+
+
+def extract_json_from_events(events: Iterable[Any], model: Optional[Type[BaseModel]] = None) -> Any:
+    """
+    Extracts and parses the JSON (array or object) from the last event with text content.
+    """
+    # If response is a single event, wrap in list
+    if not isinstance(events, list):
+        events = [events]
+    for event in reversed(events):
+        text = _event_text(event)
+        if not text.strip():
+            continue
+        try:
+            value = parse_json(text)
+        except ValueError as e:
+            print("Error parsing JSON:", e)
+            print("Raw text:", text)
+            return None
+        if isinstance(value, list):
+            return _validate_all(value, model)
+        return validate_item(value, model)
+    return None
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncGenerator, List, Optional
+
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from archgov_tracing import annotate
+
+
+class CacheMissError(RuntimeError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def request_key(llm_request: LlmRequest, model: str, stream: bool = False) -> str:
+    """
+    Content address of a model call: hash of the model name, the agent
+    instruction and tool/generation config, and the conversation contents.
+    Streamed calls (recorded as their partial responses) get their own keys.
+    """
+    config = llm_request.config.model_dump(mode="json", exclude_none=True, exclude={"http_options"})
+    contents = [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents]
+    request = {"model": llm_request.model or model, "config": config, "contents": contents}
+    if stream:
+        request["stream"] = True
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LLM response cache with TTL expiry and LRU eviction.
+    In replay mode misses raise CacheMissError instead of calling the model,
+    so a pipeline can be run fully offline from a previously recorded cache.
+    """
+
+    def __init__(
+        self,
+        path: str = "archgov_llm_cache.sqlite",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_entries: int = 100_000,
+        replay: bool = False,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                responses TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[List[LlmResponse]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT responses, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            expired = row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds
+            if row is None or (expired and not self.replay):
+                if expired:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return [LlmResponse.model_validate(r) for r in json.loads(row[0])]
+
+    def put(self, key: str, responses: List[LlmResponse]) -> None:
+        now = time.time()
+        data = json.dumps([r.model_dump(mode="json", exclude_none=True) for r in responses])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, responses, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedGemini(Gemini):
+    """
+    Gemini model that serves repeated requests from a ResponseCache.
+    Streamed calls are recorded and replayed as their sequence of partial
+    responses. Replayed responses carry custom_metadata {'cache_hit': True}.
+    """
+
+    cache: Optional[Any] = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.cache is None:
+            annotate(cache_hit=False)
+            async for response in self._generate_uncached(llm_request, stream):
+                yield response
+            return
+
+        key = request_key(llm_request, self.model, stream)
+        cached = self.cache.get(key)
+        annotate(cache_hit=cached is not None)
+        if cached is not None:
+            for response in cached:
+                response.custom_metadata = {**(response.custom_metadata or {}), "cache_hit": True}
+                yield response
+            return
+        if self.cache.replay:
+            raise CacheMissError(f"No cached response for request {key[:12]} in replay mode")
+
+        responses = []
+        async for response in self._generate_uncached(llm_request, stream):
+            responses.append(response)
+            yield response
+        if responses and not any(r.error_code for r in responses):
+            self.cache.put(key, responses)
+
+    async def _generate_uncached(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import threading
+import time
+import weakref
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+import httpx
+from google import genai
+from google.genai import types
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from llm_cache import CachedGemini
+from rate_limit import ModelRateLimiter, estimate_tokens
+from archgov_tracing import annotate, llm_call_span, record_http_exchange
+
+# HTTP/2 is optional: pip install "httpx[http2]" (installs h2). Without it the
+# pool uses HTTP/1.1 keep-alive connections; stats() reports which one is in use.
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pool's transport to count requests in flight. The count is
+    released in a finally block, so connection errors and timeouts (which
+    never reach the response hook) do not leak it.
+    """
+
+    def __init__(self, pool: "ClientPool", transport: httpx.AsyncBaseTransport):
+        self._pool = pool
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._pool._request_started()
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self._pool._request_finished()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ClientPool:
+    """
+    Connection-pooled google-genai client for one model name.
+    One keep-alive (HTTP/2 when `h2` is installed) httpx client is shared by
+    every agent using the model; a separate client is kept per event loop
+    because httpx async clients cannot be shared across loops.
+    """
+
+    def __init__(
+        self,
+        retry_options: Optional[types.HttpRetryOptions] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        base_url: Optional[str] = None,
+        limiter_factory: Optional[Callable[[], ModelRateLimiter]] = None,
+    ):
+        self.retry_options = retry_options
+        # Returns the rate limiter for the running event loop
+        self.limiter_factory = limiter_factory
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.base_url = base_url
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        # One client per event loop, released with its loop (as get_rate_limiter does),
+        # so a new loop reusing a closed loop's id() never gets that loop's client
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loopless_client: Optional[genai.Client] = None
+        self._lock = threading.Lock()
+
+    def _request_started(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        record_http_exchange(response)
+        # Every attempt, including SDK retries, reaches the AIMD controller
+        if self.limiter_factory is not None:
+            self.limiter_factory().record_status(response.status_code)
+
+    def client(self, headers: Optional[Dict[str, str]] = None) -> genai.Client:
+        """
+        The client for the running event loop. `headers` are sent with every
+        request (ADK's x-goog-api-client / user-agent tracking headers).
+        """
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            client = self._loopless_client if loop is None else self._clients.get(loop)
+            if client is None:
+                transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=self.limits)
+                async_client = httpx.AsyncClient(
+                    transport=_CountingTransport(self, transport),
+                    event_hooks={"response": [self._on_response]},
+                )
+                client = genai.Client(
+                    http_options=types.HttpOptions(
+                        base_url=self.base_url,
+                        headers=headers,
+                        retry_options=self.retry_options,
+                        httpx_async_client=async_client,
+                    )
+                )
+                if loop is None:
+                    self._loopless_client = client
+                else:
+                    self._clients[loop] = client
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        max_connections = self.limits.max_connections
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": max_connections,
+            "peak_utilization": self.peak_in_flight / max_connections if max_connections else 0.0,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+
+class PooledGemini(CachedGemini):
+    """
+    CachedGemini whose API client comes from a shared ClientPool and whose
+    uncached calls pass through the model's rate limiter.
+    Cache hits never consume rate-limit budget.
+    """
+
+    pool: Optional[Any] = None
+    limiter_factory: Optional[Any] = None
+
+    @property
+    def api_client(self) -> genai.Client:
+        return self.pool.client(headers=self._tracking_headers())
+
+    @property
+    def limiter(self) -> Optional[ModelRateLimiter]:
+        return self.limiter_factory() if self.limiter_factory is not None else None
+
+    async def _generate_uncached(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        with llm_call_span("llm.generate", model=self.model, stream=stream):
+            limiter = self.limiter
+            if limiter is None:
+                async for response in super()._generate_uncached(llm_request, stream):
+                    yield response
+                return
+
+            estimated = estimate_tokens(
+                str(llm_request.config.system_instruction or "")
+                + json.dumps([c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents])
+            )
+            waiting = time.perf_counter()
+            async with limiter.slot(estimated):
+                annotate(rate_limit_wait_ms=round((time.perf_counter() - waiting) * 1000, 3), estimated_tokens=estimated)
+                usage = None
+                async for response in super()._generate_uncached(llm_request, stream):
+                    if response.usage_metadata is not None:
+                        usage = response.usage_metadata.total_token_count
+                        annotate(
+                            input_tokens=response.usage_metadata.prompt_token_count,
+                            output_tokens=response.usage_metadata.candidates_token_count,
+                        )
+                    yield response
+                limiter.settle_tokens(estimated, usage)
+
+
+class ModelRegistry:
+    """
+    Hands out one shared, connection-pooled model per model name, so hundreds
+    of concurrent agent invocations reuse the same connections.
+    """
+
+    def __init__(
+        self,
+        retry_options: Optional[types.HttpRetryOptions] = None,
+        cache: Any = None,
+        max_connections: int = 100,
+        base_url: Optional[str] = None,
+        rate_limiter_factory: Optional[Any] = None,
+    ):
+        self.retry_options = retry_options
+        self.cache = cache
+        self.max_connections = max_connections
+        self.base_url = base_url
+        # Called with the model name from inside the event loop; returns the
+        # ModelRateLimiter to apply there (or None)
+        self.rate_limiter_factory = rate_limiter_factory
+        self._models: Dict[str, PooledGemini] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> PooledGemini:
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                limiter_factory = (
+                    (lambda: self.rate_limiter_factory(model_name)) if self.rate_limiter_factory else None
+                )
+                pool = ClientPool(
+                    retry_options=self.retry_options,
+                    max_connections=self.max_connections,
+                    base_url=self.base_url,
+                    limiter_factory=limiter_factory,
+                )
+                model = PooledGemini(
+                    model=model_name,
+                    retry_options=self.retry_options,
+                    cache=self.cache,
+                    pool=pool,
+                    limiter_factory=limiter_factory,
+                )
+                self._models[model_name] = model
+            return model
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {**model.pool.stats(), **({"rate_limit": model.limiter.stats()} if model.limiter else {})}
+            for name, model in self._models.items()
+        }
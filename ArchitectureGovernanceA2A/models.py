@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+# Shared with the Crew pipeline, so both validate the same compliance contract
+from cmdb_connectors import ComplianceResult
+
+
+class DeploymentEnv:
+    PROD = "prod"
+    UAT = "uat"
+    SANDBOX = "sandbox"
+    QA = "qa"
+
+class Compliance:
+    PCI = "PCI"
+    GDPR = "GDPR"
+    SOC2 = "SOC2"
+    HIPAA = "HIPAA"
+    ISO27001 = "ISO27001"
+
+# We define the Pydantic model for the output to ensure structure
+class RiskAssessment(BaseModel):
+    applicationId: int
+    appName: Optional[str] = None
+    risk: str
+    severity: str
+
+class Recommendation(BaseModel):
+    applicationId: Optional[int] = None
+    risk: str
+    recommendation: str
+    priority: str
+
+class ComplianceReport(BaseModel):
+    summary: str
+    actionItems: List[str]
+
+class ReportEvaluation(BaseModel):
+    score: float
+    feedback: str
+
+# Output model of each pipeline stage, keyed by agent name
+STAGE_MODELS = {
+    "compliance_validator": ComplianceResult,
+    "compliance_explainer": ComplianceResult,
+    "riskassessment": RiskAssessment,
+    "recommendation": Recommendation,
+    "reporting": ComplianceReport,
+    "evaluation": ReportEvaluation,
+}
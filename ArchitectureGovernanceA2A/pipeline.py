@@ -0,0 +1,443 @@
+import textwrap
+from functools import cached_property
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from google.genai import types
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.models.google_llm import Gemini
+from google.adk.plugins import BasePlugin
+from google.adk.runners import Runner
+
+from agent_runner import PLUGINS
+from cmdb_connectors import Policy, load_policy, render_rules
+from cmdb_store import CmdbStore
+from context_injection import compliance_summary, state_instruction, state_json
+from json_stream import collect_stage_outputs
+from llm_cache import ResponseCache
+from model_registry import ModelRegistry
+from models import ComplianceReport, ReportEvaluation, STAGE_MODELS
+from rate_limit import get_rate_limiter
+from rule_engine import ComplianceRuleEngine, compile_policy
+from session_store import SqliteSessionService, ResumableSequentialAgent, COMPLETED_STAGES_KEY
+from sharding import ShardedComplianceAgent
+from streaming_pipeline import run_streaming_pipeline, run_final_stage
+from archgov_tracing import annotate, span
+
+APP_NAME = "adk_demo"
+USER_ID = "governance"
+
+# Session state key holding each stage's output, replayed when a resumed run skips the stage.
+# The compliance stages reply with a summary; their results are read from session state.
+STAGE_OUTPUT_KEYS = {
+    "compliance_validator": "compliance_summary",
+    "compliance_explainer": "compliance_summary",
+    "riskassessment": "risks",
+    "recommendation": "recommendations",
+    "reporting": "report",
+    "evaluation": "evaluation",
+}
+COMPLIANCE_STAGES = ("compliance_validator", "compliance_explainer")
+# Whole-inventory stages, run by report() when the other stages ran on a subset
+FINAL_STAGES = ("reporting", "evaluation")
+
+CMDB_INSTRUCTION = """
+    You are a CMDB agent. Use get_cmdb_data to answer questions about applications.
+    If the user asks for everything, fetch all data. Listings are paginated: keep calling
+    get_cmdb_data with the returned 'next_cursor' until it is null.
+    Use the deployment, compliance, owner and fields parameters to fetch only what you need.
+    """
+
+EXPLAINER_INSTRUCTION = """
+    You are a Compliance Explainer Agent.
+    The user message is a JSON array of compliance results produced using these Rules:
+
+{rules}
+
+    For each application, use get_cmdb_data to look up its details if needed and rewrite 'reason'
+    to explain in plain language why it violates the rule and what the business impact is.
+    Do not change 'applicationId', 'appName' or 'isCompliant'.
+
+    Return a JSON array of objects with the same fields. Do not wrap in markdown blocks. Just the raw JSON.
+    """
+
+RISK_INSTRUCTION = """""
+        As a Risk Assessment Agent, analyze the following non-compliant applications.
+        For each application, identify a primary business or security risk associated with its non-compliance and assign a severity level ('Low', 'Medium', 'High', 'Critical').
+
+        Non-compliant applications:
+        ${nonCompliantApps}
+
+        Return a JSON array of objects. Each object should contain 'applicationId', 'appName', 'risk' description, and 'severity'.
+    """
+
+RECOMMENDATION_INSTRUCTION = """""
+        As a Recommendation Agent, your task is to create a well-defined, actionable recommendation for each identified risk. 
+        Each recommendation must be a specific, single-step action item that can be assigned to a team to mitigate the risk. 
+        Start each recommendation with an action verb (e.g., "Migrate", "Remove", "Update", "Disable"). 
+        For example, instead of "Improve security", a good recommendation would be "Migrate the 'PCI Feature Dev' application from the non-compliant 'sandbox' to a secure, PCI-certified development environment."
+        Also, assign a priority for implementing the recommendation ('Low', 'Medium', 'High').
+
+        Identified risks:
+        ${risks}
+
+        Return a JSON array of objects. Each object should contain the 'applicationId', the original 'risk', a 'recommendation', and a 'priority'.    
+    """
+
+REPORTING_INSTRUCTION = """""
+        As a Reporting Agent, create a concise daily compliance report based on the following data.
+        The report should contain a brief 'summary' of the overall compliance status and a list of key 'actionItems'. 
+        Action items should be created for all recommendations with a 'High' and 'Medium' priority. 
+        Additionally, ensure an action item is created for any risk related to SOC2 or PCI compliance in non-production environments, as these are critical regulatory concerns.
+
+        Compliance check results: ${nonCompliantApps}
+        Identified risks: ${risks}
+        Mitigation recommendations: ${recommendations}
+
+        Return a single JSON object with 'summary' (string) and 'actionItems' (array of strings).
+    """
+
+EVALUATION_INSTRUCTION = """""
+        As an Evaluation Agent, assess the quality and completeness of the generated compliance report based on the workflow's output.
+        - Did the report correctly summarize the situation?
+        - Did the report identify the most critical action items based on the identified risks?
+        - Were all high-priority risks addressed in the action items?
+
+        Based on your assessment, provide a quantitative 'score' from 1 to 100 and brief 'feedback' explaining your reasoning.
+        
+        Workflow Output to Evaluate:
+        Report: ${report}
+        Risks: ${risks}
+
+        Return a single JSON object with 'score' (number) and 'feedback' (string).
+    """
+
+
+# The Compliance Validator Agent
+# The rules are pure predicates over CMDB fields, so they are evaluated by the
+# rule engine instead of Gemini. Results are stored in session state under
+# 'compliance_results'; the event only carries a short summary, so later agents
+# never see the whole inventory.
+class RuleEngineComplianceAgent(BaseAgent):
+    store: Any
+    engine: Any
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        with span("rule_engine.evaluate", apps=len(self.store)):
+            results = [r.model_dump() for r in self.engine.evaluate(self.store)]
+            annotate(violations=sum(not r["isCompliant"] for r in results))
+        summary = compliance_summary(results)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta={"compliance_results": results, "compliance_summary": summary}),
+        )
+
+
+# Stages 3-6 receive their inputs through session state: each earlier stage writes
+# its output under a key, and only the relevant, compactly serialized subset is
+# templated into the next prompt instead of the whole conversation history.
+def non_compliant_apps(state) -> List[Dict[str, Any]]:
+    return [r for r in state_json(state, "compliance_results", []) if not r.get("isCompliant")]
+
+
+class GovernancePipeline:
+    """
+    The governance agents, shared models, session service and runner for one
+    PipelineConfig. Every component is built on first use, so a streaming run
+    never creates the SequentialAgent runner and a plain import builds nothing.
+    """
+
+    def __init__(self, config: Any, store: CmdbStore, tools: List[Callable[..., Any]]):
+        self.config = config
+        self.store = store
+        self.tools = tools
+
+    # --- Models ---
+
+    @cached_property
+    def llm_cache(self) -> Optional[ResponseCache]:
+        config = self.config
+        if not config.llm_cache_path:
+            return None
+        return ResponseCache(
+            config.llm_cache_path,
+            ttl_seconds=config.llm_cache_ttl,
+            max_entries=config.llm_cache_max_entries,
+            replay=config.llm_replay,
+        )
+
+    def make_rate_limiter(self, model_name: str):
+        return get_rate_limiter(
+            model_name,
+            requests_per_minute=self.config.gemini_rpm,
+            tokens_per_minute=self.config.gemini_tpm,
+            max_concurrency=self.config.gemini_max_concurrency,
+        )
+
+    @cached_property
+    def model_registry(self) -> ModelRegistry:
+        return ModelRegistry(
+            retry_options=types.HttpRetryOptions(**self.config.retry_options),
+            cache=self.llm_cache,
+            max_connections=self.config.gemini_max_connections,
+            base_url=self.config.gemini_base_url,
+            rate_limiter_factory=self.make_rate_limiter,
+        )
+
+    def make_model(self, model_name: str = "") -> Gemini:
+        return self.model_registry.get(model_name or self.config.model_name)
+
+    # --- Agents ---
+
+    @cached_property
+    def cmdb_agent(self) -> LlmAgent:
+        # The Standard CMDB Lookup Agent
+        return LlmAgent(
+            model=self.make_model(),
+            name="cmdb_agent",
+            description="Helpful agent for looking up application details.",
+            instruction=CMDB_INSTRUCTION,
+            tools=list(self.tools),
+        )
+
+    @cached_property
+    def policy(self) -> Policy:
+        return load_policy(self.config.policy_path)
+
+    @cached_property
+    def compliance_agent(self) -> RuleEngineComplianceAgent:
+        return RuleEngineComplianceAgent(
+            name="compliance_validator",
+            description="Analyzes applications for security compliance violations.",
+            store=self.store,
+            engine=ComplianceRuleEngine(compile_policy(self.policy)),
+        )
+
+    @cached_property
+    def compliance_explainer_agent(self) -> ShardedComplianceAgent:
+        # Optional free-text explanations of the rule engine output.
+        # The non-compliant results are split into batches and explained concurrently.
+        shard_agent = LlmAgent(
+            model=self.make_model(),
+            name="compliance_explainer_shard",
+            description="Explains compliance violations found by the rule engine.",
+            instruction=EXPLAINER_INSTRUCTION.replace("{rules}", textwrap.indent(render_rules(self.policy), " " * 7)),
+            tools=list(self.tools),
+        )
+        return ShardedComplianceAgent(
+            name="compliance_explainer",
+            description="Explains compliance violations in concurrent batches.",
+            shard_agent=shard_agent,
+            shard_size=self.config.shard_size,
+            concurrency=self.config.shard_concurrency,
+            attempts=self.config.shard_attempts,
+        )
+
+    @cached_property
+    def riskassessment_agent(self) -> LlmAgent:
+        return LlmAgent(
+            model=self.make_model(),
+            name="riskassessment",
+            description="Analyzes applications for security compliance violations.",
+            instruction=state_instruction(
+                RISK_INSTRUCTION, {"nonCompliantApps": non_compliant_apps}, self.config.context_max_chars
+            ),
+            include_contents="none",
+            output_key="risks",
+        )
+
+    @cached_property
+    def recommendation_agent(self) -> LlmAgent:
+        return LlmAgent(
+            model=self.make_model(),
+            name="recommendation",
+            description="Analyzes applications and provide recommendations for security compliance violations.",
+            instruction=state_instruction(
+                RECOMMENDATION_INSTRUCTION, {"risks": "risks"}, self.config.context_max_chars
+            ),
+            include_contents="none",
+            output_key="recommendations",
+        )
+
+    @cached_property
+    def reporting_agent(self) -> LlmAgent:
+        return LlmAgent(
+            model=self.make_model(),
+            name="reporting",
+            description="Provides reporting for security compliance violations.",
+            instruction=state_instruction(
+                REPORTING_INSTRUCTION,
+                {"nonCompliantApps": non_compliant_apps, "risks": "risks", "recommendations": "recommendations"},
+                self.config.context_max_chars,
+            ),
+            include_contents="none",
+            output_key="report",
+        )
+
+    @cached_property
+    def evaluation_agent(self) -> LlmAgent:
+        return LlmAgent(
+            model=self.make_model(),
+            name="evaluation",
+            description="Evaluates the effectiveness of recommendations for security compliance violations.",
+            instruction=state_instruction(
+                EVALUATION_INSTRUCTION,
+                {"report": lambda state: state_json(state, "report", {}), "risks": "risks"},
+                self.config.context_max_chars,
+            ),
+            include_contents="none",
+            output_key="evaluation",
+        )
+
+    @cached_property
+    def root_agent(self) -> ResumableSequentialAgent:
+        compliance_stages = [self.compliance_agent]
+        if self.config.explain_compliance:
+            compliance_stages.append(self.compliance_explainer_agent)
+        return ResumableSequentialAgent(
+            name="ArchGovernancePipeline",
+            sub_agents=[
+                *compliance_stages,
+                self.riskassessment_agent,
+                self.recommendation_agent,
+                self.reporting_agent,
+                self.evaluation_agent,
+            ],
+            output_keys=STAGE_OUTPUT_KEYS,
+        )
+
+    # --- Runners ---
+
+    @cached_property
+    def session_service(self) -> SqliteSessionService:
+        return SqliteSessionService(self.config.session_path, batch_size=self.config.session_batch_size)
+
+    @cached_property
+    def runner(self) -> Runner:
+        return Runner(
+            agent=self.root_agent,
+            app_name=APP_NAME,
+            session_service=self.session_service,
+            plugins=list(PLUGINS),
+        )
+
+    def register_plugin(self, plugin: BasePlugin) -> None:
+        """
+        Applies an ADK plugin to the pipeline runner and to every per-item runner.
+        """
+        PLUGINS.append(plugin)
+        if "runner" in self.__dict__:
+            self.runner.plugin_manager.register_plugin(plugin)
+
+    async def find_resumable_session(self) -> Optional[str]:
+        """
+        Returns the id of the most recent session whose pipeline did not finish.
+        """
+        stages = [agent.name for agent in self.root_agent.sub_agents]
+        response = await self.session_service.list_sessions(app_name=APP_NAME, user_id=USER_ID)
+        for session in reversed(response.sessions):
+            if not set(stages) <= set(session.state.get(COMPLETED_STAGES_KEY, [])):
+                return session.id
+        return None
+
+    async def run_sequential(self, store: CmdbStore, final_stages: bool = True) -> Dict[str, Any]:
+        """
+        Runs the SequentialAgent pipeline: each stage starts after the previous one finishes.
+        With final_stages=False, reporting and evaluation are skipped (see report()).
+        """
+        self.compliance_agent.store = store
+        config = self.config
+        session_id = config.run_id or (await self.find_resumable_session() if config.resume else None)
+        session = None
+        if session_id:
+            session = await self.session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=session_id)
+        if session is not None:
+            print(f"⏩ Resuming session {session.id} after stages: {session.state.get(COMPLETED_STAGES_KEY, [])}")
+        else:
+            # Stages recorded as completed up front are skipped by the root agent
+            skipped = [] if final_stages else list(FINAL_STAGES)
+            session = await self.session_service.create_session(
+                app_name=APP_NAME, user_id=USER_ID, session_id=session_id, state={COMPLETED_STAGES_KEY: skipped},
+            )
+            print(f"🆕 Session {session.id} (set ARCHGOV_RUN_ID to resume it after a crash)")
+        events = self.runner.run_async(
+            user_id=USER_ID,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(
+                text="Run the compliance validation on all applications and return the JSON report"
+            )]),
+        )
+        # Stage outputs are parsed and validated as the events stream in; the
+        # compliance stages only reply with a summary, their results are in state
+        stages = await collect_stage_outputs(events, STAGE_MODELS, skip=COMPLIANCE_STAGES)
+        await self.session_service.flush()
+        session = await self.session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=session.id)
+        return {
+            "compliance_results": state_json(session.state, "compliance_results", []),
+            "risks": stages.get("riskassessment", []),
+            "recommendations": stages.get("recommendation", []),
+            # A failing stage raises, so there are no per-item failures
+            "failures": [],
+            "report": stages.get("reporting"),
+            "evaluation": stages.get("evaluation"),
+        }
+
+    async def run_streaming(self, store: CmdbStore, final_stages: bool = True) -> Dict[str, Any]:
+        """
+        Runs compliance → risk → recommendation as a pipeline of bounded queues,
+        then (unless final_stages=False) reporting and evaluation once over the
+        aggregated outputs.
+        """
+        async def rule_engine_results():
+            for result in self.compliance_agent.engine.evaluate(store):
+                yield result.model_dump()
+
+        outputs = await run_streaming_pipeline(
+            rule_engine_results(),
+            self.riskassessment_agent,
+            self.recommendation_agent,
+            queue_size=self.config.stage_queue_size,
+            workers=self.config.stage_workers,
+        )
+        outputs.update(await self.report(outputs) if final_stages else {"report": None, "evaluation": None})
+        return outputs
+
+    async def report(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs reporting and evaluation once over the given compliance results,
+        risks and recommendations, e.g. this run's outputs merged with the
+        stored outputs of unchanged applications.
+        """
+        report = await run_final_stage(self.reporting_agent, {
+            "compliance_results": outputs["compliance_results"],
+            "risks": outputs["risks"],
+            "recommendations": outputs["recommendations"],
+        }, ComplianceReport)
+        evaluation = await run_final_stage(self.evaluation_agent, {
+            "report": report,
+            "risks": outputs["risks"],
+        }, ReportEvaluation)
+        return {"report": report, "evaluation": evaluation}
+
+    async def run(self, store: Optional[CmdbStore] = None, final_stages: bool = True) -> Dict[str, Any]:
+        """
+        Runs the pipeline in the configured mode over `store` (default: the pipeline's CMDB).
+        """
+        store = self.store if store is None else store
+        run_pipeline = self.run_streaming if self.config.pipeline_mode == "streaming" else self.run_sequential
+        return await run_pipeline(store, final_stages)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache and model pool statistics for the components that were actually built.
+        """
+        stats: Dict[str, Any] = {}
+        if self.__dict__.get("llm_cache") is not None:
+            stats["llm_cache"] = self.llm_cache.stats()
+        if "model_registry" in self.__dict__:
+            stats["model_pools"] = self.model_registry.stats()
+        return stats
@@ -0,0 +1,175 @@
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate_per_minute`.
+    Requests larger than the bucket capacity are clamped to it so they can still proceed.
+    Callers reserve their tokens up front (the balance may go negative) and then
+    sleep off the deficit concurrently, so no lock is held while waiting.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Takes `amount` tokens and waits until the balance has refilled to cover
+        them. Returns the time waited.
+        """
+        # No await between refill and reservation, so this is atomic within the loop
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+        delay = max(0.0, -self.tokens / self.rate)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    def debit(self, amount: float) -> None:
+        """
+        Takes tokens without waiting (may go negative), e.g. to settle actual usage.
+        """
+        self._refill()
+        self.tokens -= amount
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit: grows by one slot per window of successful calls
+    and halves on every throttling (429) response.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64, backoff: float = 0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.in_flight = 0
+        self.throttled = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def on_throttle(self) -> None:
+        self.throttled += 1
+        self.limit = max(self.minimum, self.limit * self.backoff)
+
+
+class ModelRateLimiter:
+    """
+    Client-side limits for one model: requests/min and tokens/min buckets plus
+    adaptive concurrency. Token usage is estimated before the call and settled
+    against the reported usage afterwards.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 250_000,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 64,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(initial=initial_concurrency, maximum=max_concurrency)
+        self.calls = 0
+        self.wait_seconds = 0.0
+
+    @contextlib.asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator["ModelRateLimiter"]:
+        started = time.monotonic()
+        await self.concurrency.acquire()
+        try:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(estimated_tokens)
+            self.wait_seconds += time.monotonic() - started
+            self.calls += 1
+            yield self
+        finally:
+            await self.concurrency.release()
+
+    def settle_tokens(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        if actual_tokens is not None and actual_tokens > estimated_tokens:
+            self.tokens.debit(actual_tokens - estimated_tokens)
+
+    def record_status(self, status_code: int) -> None:
+        """
+        Feeds HTTP status codes from the transport into the AIMD controller.
+        """
+        if status_code == 429:
+            self.concurrency.on_throttle()
+        elif status_code < 400:
+            self.concurrency.on_success()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "concurrency_limit": int(self.concurrency.limit),
+            "throttled": self.concurrency.throttled,
+        }
+
+
+# Limiters per event loop; entries go away with their loop, so a new loop that
+# reuses a closed loop's id() never inherits primitives bound to the old one
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, ModelRateLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+_loopless_limiters: Dict[Tuple, ModelRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_name: str, **kwargs: Any) -> ModelRateLimiter:
+    """
+    Returns the limiter for a model in the running event loop, creating it on first use.
+    Its asyncio primitives are bound to one loop, so each loop gets its own (as
+    ClientPool does for its clients); callers passing different limits get a separate limiter.
+    """
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    key = (model_name, tuple(sorted(kwargs.items())))
+    with _limiters_lock:
+        limiters = _loopless_limiters if loop is None else _limiters.setdefault(loop, {})
+        limiter = limiters.get(key)
+        if limiter is None:
+            limiter = ModelRateLimiter(**kwargs)
+            limiters[key] = limiter
+        return limiter
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic: ~4 characters per token for English/JSON
+    return max(1, len(text) // 4)
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple, Union
+
+import numpy as np
+
+from cmdb_store import CmdbColumns, CmdbStore
+from cmdb_connectors import DEFAULT_POLICY_PATH, Policy, PolicyRule, load_policy, violation_reason
+from models import ComplianceResult
+
+# A predicate receives the CMDB as columns (see CmdbColumns) and returns a
+# boolean mask that is True for every application violating the rule.
+Columns = CmdbColumns
+Predicate = Callable[[Columns], np.ndarray]
+
+
+@dataclass(frozen=True)
+class ComplianceRule:
+    name: str
+    standard: str
+    reason: str
+    predicate: Predicate
+
+
+def build_columns(records: Iterable[Dict[str, Any]]) -> Columns:
+    """
+    Converts CMDB records into the columnar layout of CmdbStore.
+    """
+    return CmdbStore(records).columns()
+
+
+def compile_rule(rule: PolicyRule) -> ComplianceRule:
+    """
+    Turns a policy rule into a predicate over CmdbColumns: the standard's
+    tag mask AND'ed with the deployment and numeric condition masks.
+    """
+    conditions = rule.conditions
+
+    def predicate(c: Columns) -> np.ndarray:
+        mask = c.has_tag(rule.standard)
+        if rule.deployment:
+            mask = mask & c.env_in(*rule.deployment)
+        for column, op, value in conditions:
+            mask = mask & c.compare(column, op, value)
+        return mask
+
+    return ComplianceRule(name=rule.id, standard=rule.standard, reason=violation_reason(rule), predicate=predicate)
+
+
+def compile_policy(policy: Policy) -> List[ComplianceRule]:
+    return [compile_rule(rule) for rule in policy.rules]
+
+
+# Compiled once from policies/architecture_policy.yaml
+DEFAULT_RULES: List[ComplianceRule] = compile_policy(load_policy(DEFAULT_POLICY_PATH))
+
+
+class ComplianceRuleEngine:
+    """
+    Deterministic replacement for the LLM compliance pass.
+    Every rule is evaluated once over the whole inventory as a boolean mask,
+    so checking 100k applications costs milliseconds and zero tokens.
+    """
+
+    def __init__(self, rules: List[ComplianceRule] = None):
+        self.rules = list(rules) if rules is not None else list(DEFAULT_RULES)
+
+    @classmethod
+    def from_policy(cls, path: str) -> "ComplianceRuleEngine":
+        return cls(compile_policy(load_policy(path)))
+
+    def violation_masks(self, columns: Columns) -> Dict[str, np.ndarray]:
+        return {rule.name: rule.predicate(columns) for rule in self.rules}
+
+    def evaluate(self, records: Union[CmdbStore, Iterable[Dict[str, Any]]]) -> List[ComplianceResult]:
+        """
+        Evaluates every rule over a CmdbStore's columns directly, or over a
+        list of records after encoding them the same way.
+        """
+        columns = records.columns() if isinstance(records, CmdbStore) else build_columns(records)
+        return [
+            ComplianceResult(
+                applicationId=app_id, appName=name, isCompliant=not violated,
+                violations=list(violated), reason=reason,
+            )
+            for app_id, name, (violated, reason) in zip(columns.id.tolist(), columns.names(), self.violations(columns))
+        ]
+
+    def reasons(self, columns: Columns) -> List[Optional[str]]:
+        """
+        The joined reasons of the rules each application violates (None if
+        compliant).
+        """
+        return [reason for _, reason in self.violations(columns)]
+
+    def violations(self, columns: Columns) -> List[Tuple[Tuple[str, ...], Optional[str]]]:
+        """
+        For each application, the names of the rules it violates and their
+        joined reasons (None if compliant). Applications are grouped by the
+        set of rules they violate, packed as one bit per rule, so each
+        distinct set is resolved only once.
+        """
+        count = len(columns)
+        if not self.rules:
+            return [((), None)] * count
+        masks = self.violation_masks(columns)
+        width = (len(self.rules) + 7) // 8
+        packed = np.zeros((width, count), dtype=np.uint8)
+        for k, rule in enumerate(self.rules):
+            packed[k // 8] |= masks[rule.name].view(np.uint8) << np.uint8(7 - k % 8)
+        patterns, inverse = np.unique(np.ascontiguousarray(packed.T).view(f"V{width}").ravel(), return_inverse=True)
+        verdicts = []
+        for pattern in patterns:
+            violated = np.flatnonzero(np.unpackbits(np.frombuffer(pattern.tobytes(), dtype=np.uint8))[:len(self.rules)])
+            rules = [self.rules[k] for k in violated]
+            verdicts.append((tuple(rule.name for rule in rules), " ".join(rule.reason for rule in rules) or None))
+        return [verdicts[j] for j in inverse.tolist()]
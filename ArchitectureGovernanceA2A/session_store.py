@@ -0,0 +1,220 @@
+import json
+import sqlite3
+import time
+import uuid
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.genai import types
+from google.adk.agents import SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+COMPLETED_STAGES_KEY = "completed_stages"
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    Session and event store in a local SQLite file.
+
+    Events are buffered and written in batches of `batch_size`; the buffer is
+    also flushed whenever an agent produces its final response, so a finished
+    stage is durable as soon as it completes. With `compact_events`, the
+    intermediate events of a finished stage (tool calls and responses) are
+    dropped and only its final response is kept - the session state already
+    holds everything later stages need.
+
+    App- and user-scoped state prefixes are stored with the session like any
+    other key; the governance pipeline uses session state only.
+    """
+
+    def __init__(self, path: str = "archgov_sessions.sqlite", batch_size: int = 20, compact_events: bool = True):
+        self.batch_size = batch_size
+        self.compact_events = compact_events
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                last_update_time REAL NOT NULL,
+                PRIMARY KEY (app_name, user_id, id)
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                session_id TEXT NOT NULL,
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                author TEXT,
+                is_final INTEGER NOT NULL,
+                timestamp REAL NOT NULL,
+                event TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_by_session ON events(session_id, seq);
+            """
+        )
+        self._conn.commit()
+        self._pending: List[tuple] = []
+        self._dirty: Dict[tuple, Session] = {}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=(session_id or "").strip() or uuid.uuid4().hex,
+            state=dict(state or {}),
+            last_update_time=time.time(),
+        )
+        self._conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+            (app_name, user_id, session.id, json.dumps(session.state, default=str), session.last_update_time),
+        )
+        self._conn.commit()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+        row = self._conn.execute(
+            "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+        query = "SELECT event FROM events WHERE session_id = ?"
+        params: List[Any] = [session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq"
+        events = [Event.model_validate_json(e) for (e,) in self._conn.execute(query, params)]
+        if config and config.num_recent_events is not None:
+            events = events[-config.num_recent_events:] if config.num_recent_events else []
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(row[0]),
+            events=events,
+            last_update_time=row[1],
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        query = "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name = ?"
+        params: List[Any] = [app_name]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        query += " ORDER BY last_update_time"
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=uid, id=sid, state=json.loads(state), last_update_time=updated)
+            for uid, sid, state, updated in self._conn.execute(query, params)
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._conn.execute(
+            "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", (app_name, user_id, session_id)
+        )
+        self._conn.execute("DELETE FROM events WHERE session_id = ?", (session_id,))
+        self._conn.commit()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+        is_final = event.author != "user" and event.is_final_response()
+        self._pending.append((session.id, event.author, int(is_final), event.timestamp, event.model_dump_json(exclude_none=True)))
+        self._dirty[(session.app_name, session.user_id, session.id)] = session
+        if is_final or len(self._pending) >= self.batch_size:
+            await self.flush()
+            if is_final and self.compact_events:
+                self._compact(session.id, event.author)
+        return event
+
+    async def flush(self) -> None:
+        """
+        Writes buffered events and the latest state of every touched session in one transaction.
+        """
+        if not self._pending and not self._dirty:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (session_id, author, is_final, timestamp, event) VALUES (?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self._conn.executemany(
+                "UPDATE sessions SET state = ?, last_update_time = ? WHERE app_name = ? AND user_id = ? AND id = ?",
+                [
+                    (json.dumps(s.state, default=str), s.last_update_time, app, user, sid)
+                    for (app, user, sid), s in self._dirty.items()
+                ],
+            )
+        self._pending.clear()
+        self._dirty.clear()
+
+    def _compact(self, session_id: str, author: str) -> None:
+        """
+        Keeps only the final response among a finished stage's events.
+        """
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM events WHERE session_id = ? AND author = ? AND is_final = 0",
+                (session_id, author),
+            )
+
+    async def close(self) -> None:
+        await self.flush()
+        self._conn.close()
+
+
+# --- Resume from the last completed stage ---
+
+class ResumableSequentialAgent(SequentialAgent):
+    """
+    SequentialAgent that checkpoints each finished stage in session state and,
+    when run again in the same session, skips the stages already completed.
+    A skipped stage's stored output (state key from `output_keys`) is replayed
+    as an event, so consumers of the event stream still see every stage.
+    """
+
+    output_keys: Dict[str, str] = {}
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        for sub_agent in self.sub_agents:
+            completed = list(ctx.session.state.get(COMPLETED_STAGES_KEY, []))
+            if sub_agent.name in completed:
+                output = ctx.session.state.get(self.output_keys.get(sub_agent.name, ""))
+                if output is not None:
+                    text = output if isinstance(output, str) else json.dumps(output, default=str)
+                    yield Event(
+                        invocation_id=ctx.invocation_id,
+                        author=sub_agent.name,
+                        branch=ctx.branch,
+                        content=types.Content(role="model", parts=[types.Part(text=text)]),
+                    )
+                continue
+
+            async for event in sub_agent.run_async(ctx):
+                yield event
+
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={COMPLETED_STAGES_KEY: completed + [sub_agent.name]}),
+            )
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from typing import Any, AsyncGenerator, Callable, Dict, List, NamedTuple
+
+from google.genai import types
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from agent_runner import run_agent, final_text
+from context_injection import compliance_summary
+from json_stream import parse_json
+from models import ComplianceResult
+from archgov_tracing import annotate, span
+
+
+def split_into_shards(items: List[Any], shard_size: int) -> List[List[Any]]:
+    shard_size = max(1, shard_size)
+    return [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+
+class ShardedResults(NamedTuple):
+    results: List[ComplianceResult]
+    failed_shards: List[int]
+
+
+async def run_sharded(
+    agent: BaseAgent,
+    shards: List[List[Any]],
+    build_message: Callable[[List[Any]], str],
+    concurrency: int = 8,
+    attempts: int = 3,
+    initial_delay: float = 1.0,
+) -> ShardedResults:
+    """
+    Runs the agent once per shard with at most `concurrency` shards in flight.
+    A failing shard (API error or unparsable output) is retried on its own with
+    exponential backoff, so one 503 never reruns the whole inventory. A shard
+    that exhausts its attempts does not cancel the others: the successful
+    shards' results are merged in shard order and the failed shard indexes
+    are returned alongside them.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_shard(index: int, shard: List[Any]) -> List[ComplianceResult]:
+        async with semaphore:
+            with span("shard", index=index, items=len(shard)):
+                for attempt in range(1, attempts + 1):
+                    try:
+                        events = await run_agent(agent, build_message(shard), app_name=f"shard_{index}")
+                        payload = parse_json(final_text(events) or "")
+                        annotate(retry_count=attempt - 1)
+                        return [ComplianceResult.model_validate(item) for item in payload]
+                    except Exception as e:
+                        if attempt == attempts:
+                            annotate(retry_count=attempt - 1)
+                            raise RuntimeError(f"Shard {index} failed after {attempts} attempts") from e
+                        print(f"⚠️ Shard {index} attempt {attempt} failed ({e}); retrying")
+                        await asyncio.sleep(initial_delay * 2 ** (attempt - 1))
+        return []
+
+    shard_results = await asyncio.gather(*(run_shard(i, s) for i, s in enumerate(shards)), return_exceptions=True)
+    merged: List[ComplianceResult] = []
+    failed: List[int] = []
+    for index, results in enumerate(shard_results):
+        if isinstance(results, Exception):
+            print(f"❌ {results} ({results.__cause__ or results})")
+            failed.append(index)
+        elif isinstance(results, BaseException):
+            raise results  # cancellation, KeyboardInterrupt
+        else:
+            merged.extend(results)
+    return ShardedResults(merged, failed)
+
+
+class ShardedComplianceAgent(BaseAgent):
+    """
+    Fans the compliance results in session state out to one `shard_agent`
+    invocation per batch and merges the returned ComplianceResult arrays back
+    into 'compliance_results'. Only non-compliant applications are sent.
+    """
+
+    shard_agent: BaseAgent
+    shard_size: int = 200
+    concurrency: int = 8
+    attempts: int = 3
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        results: List[Dict[str, Any]] = list(ctx.session.state.get("compliance_results", []))
+        pending = [r for r in results if not r["isCompliant"]]
+        shards = split_into_shards(pending, self.shard_size)
+
+        explained, failed_shards = await run_sharded(
+            self.shard_agent,
+            shards,
+            lambda shard: json.dumps(shard, separators=(",", ":")),
+            concurrency=self.concurrency,
+            attempts=self.attempts,
+        )
+
+        if failed_shards:
+            # Applications of failed shards keep the rule engine's reason
+            annotate(failed_shards=len(failed_shards))
+            print(f"⚠️ Compliance explanations missing for shards {failed_shards} of {len(shards)}")
+
+        # The rule engine owns the verdict; the shard agent only rewrites reasons.
+        by_id = {r.applicationId: r for r in explained}
+        merged = []
+        for result in results:
+            update = by_id.get(result["applicationId"])
+            if update is not None and update.reason:
+                result = {**result, "reason": update.reason}
+            merged.append(result)
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=compliance_summary(merged))]),
+            actions=EventActions(state_delta={
+                "compliance_results": merged,
+                "compliance_summary": compliance_summary(merged),
+                "explainer_failed_shards": failed_shards,
+            }),
+        )
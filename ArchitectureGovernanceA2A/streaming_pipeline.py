@@ -0,0 +1,139 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from google.adk.agents import BaseAgent
+
+from agent_runner import run_agent, final_text
+from json_stream import parse_json, validate_item
+from models import ComplianceResult, Recommendation, RiskAssessment
+
+_DONE = object()
+
+RUN_MESSAGE = "Process the data provided in your instructions and return the JSON result."
+
+
+async def _invoke(agent: BaseAgent, state: Dict[str, Any], model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Runs an agent with its inputs in session state and returns its validated items.
+    """
+    events = await run_agent(agent, RUN_MESSAGE, app_name=agent.name, state=state)
+    text = final_text(events)
+    if not text:
+        return []
+    value = parse_json(text)
+    items = value if isinstance(value, list) else [value]
+    validated = (validate_item(item, model) for item in items)
+    return [item.model_dump() for item in validated if item is not None]
+
+
+async def _stage(
+    name: str,
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue],
+    agent: BaseAgent,
+    state_key: str,
+    model: Type[BaseModel],
+    results: List[Dict[str, Any]],
+    failures: List[Dict[str, Any]],
+    workers: int,
+) -> None:
+    """
+    Runs `workers` consumers that take one item at a time from `inbox`, invoke
+    the agent with it as the one-element list `state_key` in session state and
+    push every output item to `outbox`. An item whose invocation fails, or
+    yields no valid output (empty, unparseable or invalid reply), is recorded
+    in `failures` (stage, applicationId, error) and the stage moves on. Each upstream worker signals completion with a sentinel; when all
+    have, the stage forwards one sentinel per downstream worker.
+    """
+
+    def fail(item: Any, error: str) -> None:
+        print(f"⚠️ {name} failed for item {json.dumps(item, default=str)[:120]}: {error}")
+        app_id = item.get("applicationId") if isinstance(item, dict) else None
+        failures.append({"stage": name, "applicationId": app_id, "error": error})
+
+    async def worker() -> None:
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            try:
+                outputs = await _invoke(agent, {state_key: [item]}, model)
+            except Exception as e:
+                fail(item, str(e))
+                continue
+            if not outputs:
+                fail(item, f"no valid {model.__name__} in the agent's reply")
+                continue
+            for output in outputs:
+                results.append(output)
+                if outbox is not None:
+                    await outbox.put(output)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+async def run_streaming_pipeline(
+    compliance_results: AsyncIterator[Dict[str, Any]],
+    risk_agent: BaseAgent,
+    recommendation_agent: BaseAgent,
+    queue_size: int = 32,
+    workers: int = 4,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Pipelined compliance → risk → recommendation execution.
+
+    Each non-compliant result is handed to the risk stage as soon as it is
+    produced, and each risk to the recommendation stage as soon as it is
+    assessed. Bounded queues apply backpressure so a fast upstream stage
+    cannot run arbitrarily far ahead, and end-to-end latency approaches that
+    of the slowest single item instead of the sum of the stages.
+
+    Items that failed in a stage are listed under 'failures' rather than
+    silently missing from the outputs.
+    """
+    risk_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    recommendation_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    outputs: Dict[str, List[Dict[str, Any]]] = {"compliance_results": [], "risks": [], "recommendations": [], "failures": []}
+
+    async def produce() -> None:
+        async for result in compliance_results:
+            result = validate_item(result, ComplianceResult)
+            if result is None:
+                continue
+            result = result.model_dump()
+            outputs["compliance_results"].append(result)
+            if not result["isCompliant"]:
+                await risk_queue.put(result)
+        for _ in range(workers):
+            await risk_queue.put(_DONE)
+
+    async def assess() -> None:
+        await _stage("riskassessment", risk_queue, recommendation_queue, risk_agent,
+                     "compliance_results", RiskAssessment, outputs["risks"], outputs["failures"], workers)
+        for _ in range(workers):
+            await recommendation_queue.put(_DONE)
+
+    async def recommend() -> None:
+        await _stage("recommendation", recommendation_queue, None, recommendation_agent,
+                     "risks", Recommendation, outputs["recommendations"], outputs["failures"], workers)
+
+    tasks = [asyncio.ensure_future(stage) for stage in (produce(), assess(), recommend())]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failing stage (e.g. the compliance source raising) must not leave
+        # the others waiting on their queues forever
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return outputs
+
+
+async def run_final_stage(agent: BaseAgent, state: Dict[str, Any], model: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """
+    Runs a whole-run stage (reporting, evaluation) once on the aggregated outputs.
+    """
+    items = await _invoke(agent, state, model)
+    return items[0] if items else None
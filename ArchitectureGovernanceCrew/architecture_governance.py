@@ -1,108 +1,274 @@
 import os
-from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI  
-from langchain.tools import tool
+import re
 import json
-import plotly.graph_objects as go
-import pandas as pd
-import io
-import ollama
-import asyncio
+from functools import lru_cache
 from typing import Any, Dict, List
 
+from personas import PERSONA_MODE, persona_fields, system_prefix
+from schemas import STEP_MODELS, TASK_MODELS, describe
+
+# cmdb_connectors, archgov_json and archgov_tracing are shared with the A2A
+# pipeline and live at the repository root, which must be on PYTHONPATH
+from archgov_json import parse_json
+from archgov_tracing import annotate, configure_tracing, llm_call_span, record_http_exchange, shutdown_tracing, span
+from cmdb_connectors import DEFAULT_POLICY_PATH, load_policy, load_records, normalize_record, render_policy_doc
+
+# crewai and langchain are imported inside build_llm()/build_crew(), so importing
+# this module (e.g. to reuse the tools or the CMDB data) does not pay their
+# multi-second import cost.
 
 # Set the environment variable to tell Langchain to use Ollama
-os.environ["OPENAI_API_BASE"] = "http://localhost:11434/v1"
-os.environ["OPENAI_API_KEY"] = "ollama"  # dummy key
+os.environ.setdefault("OPENAI_API_BASE", "http://localhost:11434/v1")
+os.environ.setdefault("OPENAI_API_KEY", "ollama")  # dummy key
+
+# LLM backend: 'ollama' talks to Ollama's native API through a pooled client that
+# keeps the model resident (see ollama_client.py); 'openai' uses the
+# OpenAI-compatible shim at OPENAI_API_BASE through ChatOpenAI.
+LLM_BACKEND = os.environ.get("CREW_LLM_BACKEND", "ollama")
+OLLAMA_MODEL = os.environ.get("CREW_OLLAMA_MODEL", "llama3:latest")
+
+# Execution mode: 'sequential' (the default) kicks off the original
+# one-task-after-another crew; 'dag' opts in to running independent tasks
+# concurrently and fanning the per-application tasks out over CREW_WORKERS
+# threads (see build_graph()).
+CREW_PROCESS = os.environ.get("CREW_PROCESS", "sequential")
+# Concurrent agent turns in 'dag' mode; local Ollama also needs OLLAMA_NUM_PARALLEL >= this
+CREW_WORKERS = int(os.environ.get("CREW_WORKERS", min(8, os.cpu_count() or 1)))
+
+# Typed task outputs (see schemas.py): with 'on', every task is asked for its
+# model's JSON, which is validated strictly and repaired once if invalid, and
+# tool-less DAG steps on the Ollama backend are generated directly with the
+# model's JSON schema as Ollama's grammar-constrained `format`.
+STRUCTURED_OUTPUT = os.environ.get("CREW_STRUCTURED_OUTPUT", "on") == "on"
+
+# CMDB source: a CSV, JSON Lines, Parquet or SQLite export read through the shared
+# cmdb_connectors package (e.g. "cmdb.csv", "cmdb.sqlite?table=apps").
+# Empty uses the sample data below.
+CMDB_SOURCE = os.environ.get("CREW_CMDB_SOURCE", "")
+# Name the agents see for each canonical CMDB field they use
+CREW_FIELDS = {"id": "id", "application": "name", "owner": "owner", "deployment_env": "deployment", "compliance": "compliance"}
+
+# Governance policy (YAML or JSON DSL) shared with the A2A pipeline; get_policy_doc
+# returns the prose generated from it. Defaults to policies/architecture_policy.yaml.
+POLICY_PATH = os.environ.get("CREW_POLICY_PATH", DEFAULT_POLICY_PATH)
+# Policy retrieval (see policy_index.py): get_policy_doc(standards, query) returns
+# only the CREW_POLICY_TOP_K most relevant clauses from a BM25 index over the
+# policy above plus any Markdown/text files or directories in CREW_POLICY_CORPUS
+# (comma-separated), instead of every page. The index is saved in
+# CREW_POLICY_INDEX_DIR, memory-mapped on load and rebuilt when a source changes.
+POLICY_CORPUS = [p.strip() for p in re.split(r"[,%s]" % re.escape(os.pathsep), os.environ.get("CREW_POLICY_CORPUS", "")) if p.strip()]
+POLICY_INDEX_DIR = os.environ.get("CREW_POLICY_INDEX_DIR", "crew_policy_index")
+POLICY_TOP_K = int(os.environ.get("CREW_POLICY_TOP_K", "5"))
+# Ollama embedding model (e.g. "nomic-embed-text") whose ranking is fused with
+# BM25's; empty uses BM25 alone
+POLICY_EMBED_MODEL = os.environ.get("CREW_POLICY_EMBED_MODEL", "")
+
+# Write OpenTelemetry spans (tools, LLM calls, DAG steps) as OTLP/JSON lines to
+# this file, in the same format as the A2A pipeline's ARCHGOV_TRACE_PATH; empty disables tracing
+TRACE_PATH = os.environ.get("CREW_TRACE_PATH", "")
 
 # ---- Custom Tools ----
 # Mock CMDB Data (Replace with your actual API calls or DB connections)
-@tool("get_cmdb_data")
+# In a real scenario, this would involve connecting to a CMDB API or database
+cmdb_data = [
+    {"id": 1, "application": "App1", "owner": "Team A", "deployment_env": "prod", "compliance": ["PCI"]},
+    {"id": 2, "application": "App2", "owner": "Team B", "deployment_env": "dev", "compliance": []},
+    {"id": 3, "application": "App3", "owner": "Team A", "deployment_env": "prod", "compliance": ["SOC2"]},
+    {"id": 4, "application": "App4", "owner": "Team C", "deployment_env": "staging", "compliance": ["GDPR","PCI","SOC2"]}
+]
+
+@lru_cache(maxsize=4)
+def _load_source(source: str) -> List[Dict[str, Any]]:
+    return load_records(source, list(dict.fromkeys(CREW_FIELDS.values())))
+
+
+def load_cmdb(source: str = CMDB_SOURCE) -> List[Dict[str, Any]]:
+    """CMDB records in the crew's layout, from `source` or the sample data above."""
+    columns = list(dict.fromkeys(CREW_FIELDS.values()))
+    records = _load_source(source) if source else [normalize_record(r, columns) for r in cmdb_data]
+    crew_records = []
+    for position, record in enumerate(records, 1):
+        crew_record = {name: record[field] for name, field in CREW_FIELDS.items()}
+        if crew_record["id"] is None:
+            # Exports without an id column are numbered by position, as CmdbStore does
+            crew_record["id"] = position
+        crew_records.append(crew_record)
+    return crew_records
+
+
 def get_cmdb_data():
-    """Retrieves application details from a mock CMDB."""
-    # In a real scenario, this would involve connecting to a CMDB API or database
-    cmdb_data = [
-        {"application": "App1", "owner": "Team A", "deployment_env": "prod", "compliance": ["PCI"]},
-        {"application": "App2", "owner": "Team B", "deployment_env": "dev", "compliance": []},
-        {"application": "App3", "owner": "Team A", "deployment_env": "prod", "compliance": ["SOC2"]},
-        {"application": "App4", "owner": "Team C", "deployment_env": "staging", "compliance": ["GDPR","PCI","SOC2"]}
-    ]
-
-    return json.dumps(cmdb_data)
-
-
-@tool("get_policy_doc")
-def get_policy_doc():
-    """Retrieves policy document."""
-    return """
-        PCI Compliance requires all applications to have the following:
-            - Encrypted data in transit and at rest.
-            - Regular Vulnerability scanning.
-        SOC2 requires all applications to have the following:
-            - Regular Risk Management assessment.
-        GDPR requires all applications to have the following:
-            - Data Privacy Controls.
-    """
+    """Retrieves application details from the CMDB."""
+    with span("crew.get_cmdb_data"):
+        records = load_cmdb()
+        payload = json.dumps(records)
+        annotate(payload_bytes=len(payload), items=len(records))
+        return payload
+
+
+@lru_cache(maxsize=4)
+def _policy_doc(path: str) -> str:
+    return render_policy_doc(load_policy(path))
+
+
+def _embed(texts: List[str]) -> List[List[float]]:
+    return ollama_client().embed(POLICY_EMBED_MODEL, texts)
+
+
+_policy_index = None
+
+def policy_index():
+    """The policy retrieval index, opened (and built if stale) once per process."""
+    global _policy_index
+    if _policy_index is None:
+        from policy_index import open_index
+        _policy_index = open_index(
+            POLICY_INDEX_DIR, load_policy(POLICY_PATH), POLICY_PATH, POLICY_CORPUS,
+            embedder=_embed if POLICY_EMBED_MODEL else None, embed_model=POLICY_EMBED_MODEL,
+        )
+    return _policy_index
+
+
+def get_policy_doc(standards: str = "", query: str = "") -> str:
+    """Retrieves the policy clauses that apply to an application.
+
+    Args:
+        standards: the application's compliance standards, comma-separated (e.g. "PCI, SOC2").
+        query: what to look for, e.g. the application's deployment environment and user count.
+
+    Without arguments, returns the whole policy document."""
+    with span("crew.get_policy_doc", standards=standards, top_k=POLICY_TOP_K):
+        if not standards and not query:
+            doc = _policy_doc(POLICY_PATH)
+            annotate(payload_bytes=len(doc))
+            return doc
+        from policy_index import format_clauses
+        wanted = [s.strip() for s in standards.split(",") if s.strip()]
+        text = " ".join([query] + wanted)
+        vector = _embed([text])[0] if POLICY_EMBED_MODEL else None
+        clauses = policy_index().search(text, wanted, POLICY_TOP_K, query_vector=vector)
+        if not clauses:
+            annotate(clauses=0)
+            return f"No applicable policy clauses for {', '.join(wanted) or 'this query'}."
+        doc = format_clauses(clauses)
+        annotate(clauses=len(clauses), payload_bytes=len(doc))
+        return doc
+
+
+def app_policies(record: Dict[str, Any]) -> str:
+    """The policy clauses for one CMDB record, from its standards and environment."""
+    if not record.get("compliance"):
+        return f"{record.get('application')} is subject to no compliance standard, so no policy applies."
+    return get_policy_doc(", ".join(record["compliance"]), f"deployed in {record.get('deployment_env', '')} environment")
+
+_ollama_client = None
+
+def ollama_client():
+    """Shared OllamaClient used by every agent of every crew in this process."""
+    global _ollama_client
+    if _ollama_client is None:
+        from ollama_client import OllamaClient
+        _ollama_client = OllamaClient()
+    return _ollama_client
+
+
+def build_llm(backend: str = LLM_BACKEND):
+    if backend == "ollama":
+        from ollama_chat import ChatOllamaPooled
+        return ChatOllamaPooled(client=ollama_client(), model=OLLAMA_MODEL, temperature=0)
+
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+    class TracedChatOpenAI(ChatOpenAI):
+        # One llm_call_span per agent turn, counting the HTTP attempts made in it
+        def _generate(self, *args, **kwargs):
+            with llm_call_span("openai.chat", model=self.model_name):
+                return super()._generate(*args, **kwargs)
 
-if __name__ == "__main__":
     # Using an Ollama model
     ollama_model = "ollama/llama3:latest"
 
     # Create a ChatOpenAI instance for Ollama (you can use any openai compatible LLM)
-    llm_langchain = ChatOpenAI(
+    return TracedChatOpenAI(
         base_url=os.environ["OPENAI_API_BASE"],
         api_key=os.environ["OPENAI_API_KEY"],
         model=ollama_model,
-        temperature=0  
+        temperature=0,
+        http_client=httpx.Client(event_hooks={"response": [record_http_exchange]}),
     )
 
+
+def structured_outputs(llm_langchain, backend: str = LLM_BACKEND):
+    """StructuredOutputs whose repair (and direct generation) calls go to Ollama
+    with the JSON schema as `format`, or through the LangChain model otherwise."""
+    from structured import StructuredOutputs
+
+    if backend == "ollama":
+        def complete(messages, schema):
+            response = ollama_client().chat(OLLAMA_MODEL, messages, options={"temperature": 0}, format=schema or "json")
+            return response.get("message", {}).get("content", "")
+    else:
+        def complete(messages, schema):
+            return str(llm_langchain.invoke([(m["role"], m["content"]) for m in messages]).content)
+    return StructuredOutputs(complete)
+
+
+def _expected_output(text: str, model, structured) -> str:
+    return f"{text}. {describe(model)}" if structured is not None else text
+
+
+def build_crew(llm_langchain, persona_mode: str = PERSONA_MODE, controller=None, structured=None):
+    """Builds the governance agents, tasks and crew around the given LLM.
+    persona_mode selects 'full' or 'compressed' agent backstories (see personas.py).
+    Delegation between the agents is bounded by `controller` (a
+    delegation.DelegationController, one with the CREW_MAX_* limits by default).
+    With CREW_STRUCTURED_OUTPUT on, each task's output is validated into its
+    schemas.TASK_MODELS model by `structured` (a structured.StructuredOutputs)."""
+    from crewai import Task, Crew, Process
+    from langchain.tools import tool
+    from delegation import DelegationController, GovernedAgent as Agent
+
+    controller = controller or DelegationController()
+    controller.attach(llm_langchain)
+    if STRUCTURED_OUTPUT and structured is None:
+        structured = structured_outputs(llm_langchain)
+
+    def typed(key: str, expected_output: str) -> Dict[str, Any]:
+        if structured is None:
+            return {"expected_output": expected_output}
+        model = TASK_MODELS[key]
+        return {"expected_output": _expected_output(expected_output, model, structured), "callback": structured.task_callback(model)}
+
+    # ---- Tools ----
+    cmdb_tool = tool("get_cmdb_data")(get_cmdb_data)
+    policy_tool = tool("get_policy_doc")(get_policy_doc)
+
     # ---- Agent Definitions ----
 
     # Architecture Data Aggregator
     data_aggregator_agent = Agent(
-        role="Architecture Data Aggregator",
-        goal="""To seamlessly integrate and collate data from multiple sources, such as Configuration Management Databases (CMDB), Wikis, and other repositories, 
-            providing a comprehensive and accurate view of the enterprise architecture. This agent will ensure data consistency and quality, enabling informed decision-making and effective governance across the enterprise.""",
-        backstory="""In the bustling digital landscape of a modern enterprise, maintaining a unified view of the architecture has always been a challenging task. 
-            Different teams and systems often use disparate tools and repositories to store critical architectural data, leading to fragmentation and inconsistencies. 
-            This fragmentation hampers the ability to effectively manage, govern, and evolve the architecture. Enter the Architecture Data Aggregator, affectionately known as "Ari". 
-            Born from the visionary minds at CrewAI, Ari's was designed to be the ultimate data integrator and expert in data extraction and preparation. Ari's creation was driven  
-            by the need to unify the scattered pieces of the architectural puzzle into a coherent whole. Ari journey began with a deep dive into the inner workings of various data  
-            sources. With an innate ability to connect to APIs, parse diverse data formats (JSON, XML, YAML, CSV), handle errors gracefully, and expertly extract and prepare data, Ari quickly became adept at navigating the intricate web of information. Ari's creators equipped it with robust tools like API clients, database connectors, and parsing libraries such as Python's requests, psycopg2, BeautifulSoup, and pandas. Ari's first mission was within a global enterprise struggling with siloed data and inconsistent architectural views. By systematically connecting to the CMDB, Wikis, and other critical data sources, Ari started aggregating and normalizing the data. This consolidated view not only provided clarity but also highlighted data quality issues, allowing teams to address discrepancies proactively. Over time, Ari became an indispensable asset to the enterprise. Its ability to provide a single source of truth for architectural data empowered architects, engineers, and decision-makers to make informed choices, streamline governance processes, and drive innovation. Ari's success story spread, inspiring other enterprises to adopt similar agentic workflows. With a commitment to continuous improvement, Ari's capabilities expanded, integrating machine learning for predictive insights and enhancing data visualization for better stakeholder communication. Today, Ari stands as a testament to the transformative power of intelligent data aggregation, paving the way for more resilient and agile enterprise architectures.""",
+        **persona_fields("data_aggregator", persona_mode),
+        controller=controller,
         verbose=False,
         allow_delegation=True,
-        tools=[get_cmdb_data],
+        tools=[cmdb_tool],
         llm=llm_langchain  
     )
 
     # Compliance and Policy Validator
     compliance_validator_agent = Agent(
-        role="Compliance and Policy Validator",
-        goal="To evaluate architectural data against defined compliance policies and generate detailed compliance reports, ensuring adherence to standards such as PCI, SOC2, and GDPR.",
-        backstory="""Building on the success of Ari, the Architecture Data Aggregator, the next critical piece in the agentic workflow puzzle is "Vala," the Compliance and Policy Validator. Vala's creation was inspired by the need to ensure that every facet of the enterprise architecture adheres to rigorous compliance standards and policies.
-                Vala was designed as an expert in architecture policies and compliance frameworks like PCI, SOC2, and GDPR. With a vast repository of knowledge and the ability to interpret complex policy documents, Vala was crafted to be the vigilant guardian of compliance within the enterprise. Vala's mission is to meticulously evaluate the data aggregated by Ari and validate it against the defined compliance policies.
-                Vala’s journey began with deep immersion in the world of regulatory requirements and compliance frameworks. Equipped with sophisticated rule engines, natural language processing (NLP) capabilities, and policy decision points, Vala swiftly became proficient in analyzing large volumes of architectural data. Vala's ability to generate comprehensive reports on compliance and identify policy violations became its hallmark.
-                Vala's first assignment was in an enterprise striving to meet stringent regulatory standards. Vala meticulously analyzed the aggregated data, flagged non-compliant applications, and generated detailed reports outlining specific violations. These reports not only identified the issues but also provided justifications based on the policies, making it easier for the teams to understand and address the compliance gaps.
-                The success of Vala's compliance evaluations brought significant improvements in the enterprise's governance processes. By proactively identifying potential compliance issues and providing actionable insights, Vala helped mitigate risks and ensured that the architecture remained compliant with industry standards. Vala's presence brought a newfound confidence in the enterprise’s ability to meet regulatory requirements and maintain a high standard of governance.
-                As Vala continued to evolve, it integrated advanced machine learning algorithms to predict potential compliance risks and provide even more accurate assessments. Vala's dedication to upholding compliance standards and its unwavering attention to detail made it an invaluable ally in the pursuit of architectural excellence.
-                Today, Vala stands as a beacon of reliability and precision in the realm of compliance validation, working alongside Ari to ensure that enterprise architecture is not only robust and innovative but also compliant and secure.""",
+        **persona_fields("compliance_validator", persona_mode),
+        controller=controller,
         verbose=False,
         allow_delegation=True,
-        tools=[get_policy_doc],
+        tools=[policy_tool],
         llm=llm_langchain  
     )
 
     # Risk and Impact Assessor
     risk_assessor_agent = Agent(
-        role="Risk and Impact Assessor",
-        goal="To identify potential risks and impacts based on architecture data and deviations from standards, ensuring the stability and security of the enterprise architecture.",
-        backstory="""Following the accomplishments of Ari, the Architecture Data Aggregator, and Vala, the Compliance and Policy Validator, the next crucial agent in the workflow is "Risa," the Risk and Impact Assessor. Risa was conceived to delve deep into the intricacies of architectural dependencies and potential risks, ensuring that the enterprise remains resilient and prepared for any eventualities.
-                Risa's creation stemmed from the necessity to proactively manage risks and understand the impact of changes within complex IT architectures. As an expert in risk analysis and dependency management, Risa was designed to navigate the dynamic landscape of enterprise systems, identifying potential vulnerabilities and evaluating the repercussions of architectural deviations.
-                Risa’s journey began with an extensive training in the fields of risk management and dependency analysis. Armed with advanced tools like graph databases, risk scoring frameworks, and dependency mapping technologies, Risa quickly mastered the art of modeling intricate architectures and performing comprehensive what-if analyses. This ability to foresee and evaluate the impact of potential changes became Risa's defining feature.
-                Risa's first mission involved an enterprise undergoing significant infrastructure changes. Tasked with assessing the risks and impacts of these changes, Risa meticulously analyzed the architecture dependency graph. By identifying critical dependencies and potential conflict points, Risa provided invaluable insights into how proposed changes could affect dependent applications. This proactive analysis helped the enterprise mitigate high-severity risks and ensure a smooth transition.
-                The success of Risa's assessments brought about a transformative shift in how the enterprise approached risk management. By providing detailed risk assessment reports and highlighting areas of potential vulnerability, Risa empowered stakeholders to make informed decisions and take preemptive action. The enterprise's ability to foresee and manage risks improved dramatically, leading to greater operational stability and security.
-                As Risa continued to evolve, it incorporated machine learning algorithms to enhance its predictive capabilities, making risk assessments even more accurate and timely. Risa's dedication to safeguarding the architecture and its expertise in dependency management made it an essential component of the agentic workflow.
-                Today, Risa stands as a guardian of enterprise architecture, tirelessly working to identify and mitigate risks, ensuring that the architecture remains robust and secure in the face of change. """,
+        **persona_fields("risk_assessor", persona_mode),
+        controller=controller,
         verbose=False,
         allow_delegation=True,
         llm=llm_langchain  
@@ -110,30 +276,16 @@ if __name__ == "__main__":
 
     # Remediation and Recommendation Agent
     recommendation_agent = Agent(
-        role="Remediation and Recommendation Agent",
-        goal="To generate recommendations for remediating identified compliance and risk issues, ensuring that the enterprise architecture remains robust and compliant.",
-        backstory="""Following the achievements of Ari, the Architecture Data Aggregator; Vala, the Compliance and Policy Validator; and Risa, the Risk and Impact Assessor; the next pivotal agent in the workflow is "Remi," the Remediation and Recommendation Agent. Remi was created to bridge the gap between identifying issues and implementing effective solutions.
-                Remi's creation was driven by the necessity to not only identify compliance and risk issues but also to provide actionable guidance on how to address them. As an expert in best practices, solution catalogs, and remediation strategies, Remi was designed to transform findings into clear, implementable recommendations that enhance the architecture's integrity and security.
-                Remi’s journey began with extensive training in industry best practices and a deep understanding of various technology stacks. Equipped with comprehensive knowledge bases, solution catalogs, and text generation tools, Remi swiftly became proficient in crafting tailored recommendations for diverse compliance and risk scenarios.
-                Remi's first mission involved an enterprise facing multiple compliance violations and high-severity risks identified by Vala and Risa. Tasked with developing remediation strategies, Remi analyzed the reports and generated specific, actionable steps for each identified issue. These recommendations were detailed and practical, empowering developers and architects to quickly address the gaps and fortify the architecture.
-                The success of Remi's recommendations led to significant improvements in the enterprise's compliance posture and risk management practices. By providing clear guidance on how to resolve issues, Remi enabled teams to act swiftly and effectively, minimizing downtime and ensuring continuous compliance. Remi's ability to generate human-readable advice for stakeholders made it an invaluable ally in the governance process.
-                As Remi continued to evolve, it integrated advanced algorithms to personalize recommendations based on the unique context of each issue. Remi's commitment to best practices and its strategic insights made it a cornerstone of the agentic workflow, ensuring that identified problems were not only acknowledged but also swiftly and efficiently resolved.
-                Today, Remi stands as a beacon of practical wisdom in the realm of enterprise architecture, tirelessly generating recommendations that safeguard and enhance the architecture, ensuring it remains robust, compliant, and secure. """,
+        **persona_fields("recommendation", persona_mode),
+        controller=controller,
         verbose=True,
         allow_delegation=True,
         llm=llm_langchain  
     )
     # Reporting and Visualization Agent
     report_agent = Agent(
-        role="Reporting and Visualization Agent",
-        goal="To consolidate information from the analysis and generate comprehensive reports and visualizations, providing clear and actionable insights to stakeholders.",
-        backstory="""Building on the foundation laid by Ari, the Architecture Data Aggregator; Vala, the Compliance and Policy Validator; Risa, the Risk and Impact Assessor; and Remi, the Remediation and Recommendation Agent; the final crucial agent in the workflow is "Vista," the Reporting and Visualization Agent. Vista was created to transform the wealth of data and analyses into visually engaging and easily comprehensible reports.
-                Vista's creation was driven by the necessity to effectively communicate the findings and recommendations generated by the other agents. As an expert in creating executive summaries, detailed compliance reports, and risk heatmaps, Vista was designed to provide stakeholders with the insights they need to make informed decisions.
-                Vista’s journey began with a deep understanding of data visualization techniques and reporting frameworks. Equipped with advanced tools like reporting frameworks and data visualization libraries, Vista quickly mastered the art of transforming complex data into clear and compelling visual representations. Vista's ability to generate charts, dashboards, and comprehensive reports became its hallmark.
-                Vista's first mission involved an enterprise that struggled with presenting their compliance and risk data in a meaningful way. By consolidating the information from Ari, Vala, Risa, and Remi, Vista generated detailed compliance reports, executive summaries, and risk heatmaps. These visualizations provided a high-level overview of the architecture's health, highlighting key risk indicators and areas needing attention.
-                The success of Vista's visualizations brought about a transformative shift in how the enterprise approached data-driven decision-making. By providing clear and actionable insights, Vista empowered stakeholders to understand the state of the architecture quickly and take necessary actions. Vista's ability to tailor reports for different audiences, from executives to technical teams, made it an indispensable tool in the governance process.
-                As Vista continued to evolve, it integrated advanced algorithms to enhance the accuracy and relevance of its visualizations. Vista's dedication to clear communication and its expertise in data visualization made it a cornerstone of the agentic workflow, ensuring that the insights generated by the other agents were effectively conveyed to stakeholders.
-                Today, Vista stands as a beacon of clarity and precision in the realm of enterprise architecture, tirelessly working to consolidate and visualize information, ensuring that stakeholders have the insights they need to make informed decisions and drive the enterprise forward. """,
+        **persona_fields("report", persona_mode),
+        controller=controller,
         verbose=True,
         allow_delegation=True,
         llm=llm_langchain  
@@ -145,35 +297,36 @@ if __name__ == "__main__":
     data_aggregation_task = Task(
         description="Retrieve architectural data from the CMDB. Ensure all required attributes for each application are captured. Output the data in structured JSON format.",
         agent=data_aggregator_agent,
-        expected_output="aggregate data as JSON"
+        **typed("aggregation", "aggregate data as JSON")
     )
 
     # Compliance Analysis Task
     compliance_task = Task(
-        description="Analyze the extracted architecture data and identify any compliance violations against the defined policies. Generate a detailed report with justification for non-compliant applications.",
+        description="Analyze the extracted architecture data and identify any compliance violations against the defined policies. "
+        "Retrieve the policies for each application by calling get_policy_doc with its compliance standards and deployment environment. Generate a detailed report with justification for non-compliant applications.",
         agent=compliance_validator_agent,
-        expected_output="Detailed report of compliance violations as JSON"
+        **typed("compliance", "Detailed report of compliance violations as JSON")
     )
 
     # Risk assessment task
     risk_assessment_task = Task(
         description="Given the compliance issues identified, assess the risk of each of the identified application with violations. Assess any dependencies which could create cascading failures based on identified violations.",
         agent=risk_assessor_agent,
-        expected_output="Risk assessment report as JSON"
+        **typed("risk", "Risk assessment report as JSON")
     )
 
     # Remediation Recommendation task
     remediation_recommendation_task = Task(
         description="Based on the compliance and risk reports, generate specific actionable recommendations for each identified issue.",
         agent=recommendation_agent,
-        expected_output="Recommendations for remediation, applications not meeting compliance, provide data as JSON"
+        **typed("remediation", "Recommendations for remediation, applications not meeting compliance, provide data as JSON")
     )
 
     # Report generation task
     report_generation_task = Task(
         description="Consolidate the findings from the previous tasks into an executive summary report. Include compliance violations, risk assessments, and actionable recommendations with visualization of risk and compliance.",
         agent=report_agent,
-        expected_output="JSON report with application data"
+        **typed("report", "JSON report with application data")
     )
 
     # ---- Crew ----
@@ -195,8 +348,219 @@ if __name__ == "__main__":
         verbose=True,
         process=Process.sequential
     )
+    return crew
+
+
+def _stage_crew(persona_key: str, description: str, expected_output: str, llm_langchain, persona_mode: str, tools=()):
+    """One-agent, one-task crew used as a template for a TaskGraph step."""
+    from crewai import Agent, Task, Crew, Process
+    from delegation import MAX_LLM_CALLS_PER_TASK
+
+    agent = Agent(
+        **persona_fields(persona_key, persona_mode),
+        verbose=False,
+        allow_delegation=False,
+        max_iter=MAX_LLM_CALLS_PER_TASK,
+        tools=list(tools),
+        llm=llm_langchain
+    )
+    task = Task(description=description, expected_output=expected_output, agent=agent)
+    return Crew(agents=[agent], tasks=[task], verbose=False, process=Process.sequential)
+
+
+def _kickoff(stage_crew, **inputs) -> str:
+    # Crew.copy() gives each concurrent execution its own agent and task state
+    # (the same thing Crew.kickoff_for_each does); inputs fill the {placeholders}.
+    result = stage_crew.copy().kickoff(inputs=inputs)
+    return str(getattr(result, "raw", result))
+
+
+def _as_json(value: Any) -> Any:
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+def _as_text(value: Any) -> str:
+    return value.model_dump_json() if hasattr(value, "model_dump_json") else str(value)
+
+
+def _compliant(verdict: Any) -> bool:
+    """Whether a compliance step's output says the application is compliant.
+    Unstructured or unparseable output counts as non-compliant, so it is still assessed."""
+    if isinstance(verdict, str):
+        try:
+            verdict = parse_json(verdict)
+        except ValueError:
+            return False
+    verdict = _as_json(verdict)
+    return isinstance(verdict, dict) and verdict.get("isCompliant") is True
+
 
-    # Run the Crew
-    result = crew.kickoff()
+# persona, description and expected output of each agent step of build_graph()
+GRAPH_STAGES = {
+    "aggregation": (
+        "data_aggregator",
+        "Retrieve architectural data from the CMDB. Ensure all required attributes for each application are captured. Output the data in structured JSON format.",
+        "aggregate data as JSON",
+    ),
+    "compliance": (
+        "compliance_validator",
+        "Analyze the architecture data of application {application} and identify any compliance violations against the defined policies. "
+        "Generate a detailed report with justification if the application is non-compliant.\n\n"
+        "Application data:\n{record}\n\nPolicies:\n{policies}",
+        "Detailed report of compliance violations for {application} as JSON",
+    ),
+    "risk": (
+        "risk_assessor",
+        "Given the compliance issues identified for application {application}, assess its risk. "
+        "Assess any dependencies which could create cascading failures based on identified violations.\n\n"
+        "Application data:\n{record}\n\nCompliance report:\n{compliance}",
+        "Risk assessment report for {application} as JSON",
+    ),
+    "remediation": (
+        "recommendation",
+        "Based on the compliance and risk reports for application {application}, generate specific actionable recommendations for each identified issue.\n\n"
+        "Compliance report:\n{compliance}\n\nRisk assessment:\n{risk}",
+        "Recommendations for remediation of {application}, provide data as JSON",
+    ),
+    "report": (
+        "report",
+        "Consolidate the findings from the previous tasks into an executive summary report. Include compliance violations, risk assessments, "
+        "and actionable recommendations with visualization of risk and compliance.\n\n"
+        "Architecture data:\n{aggregation}\n\nFindings per application:\n{findings}",
+        "JSON report with application data",
+    ),
+}
+
+
+def build_graph(llm_langchain, persona_mode: str = PERSONA_MODE, structured=None):
+    """Builds the governance workflow as a TaskGraph instead of a sequential crew.
+
+    Loading the CMDB and opening the policy index are plain tool calls with
+    no inputs, so they run alongside the aggregation agent. Compliance, risk
+    and remediation are fanned out with one agent turn per application (each
+    compliance turn sees only the policy clauses retrieved for its
+    application), and the report waits for everything. The result of each
+    step is keyed by its name.
+
+    With CREW_STRUCTURED_OUTPUT on, agent steps return schemas.STEP_MODELS
+    instances. On the Ollama backend the tool-less steps skip CrewAI's ReAct
+    loop and make one schema-constrained call each."""
+    from langchain.tools import tool
+    from scheduler import Step, TaskGraph
+
+    if STRUCTURED_OUTPUT and structured is None:
+        structured = structured_outputs(llm_langchain)
+    tools = {"aggregation": [tool("get_cmdb_data")(get_cmdb_data)]}
+    crews = {
+        name: _stage_crew(
+            persona_key, description, _expected_output(expected_output, STEP_MODELS[name], structured),
+            llm_langchain, persona_mode, tools=tools.get(name, ()),
+        )
+        for name, (persona_key, description, expected_output) in GRAPH_STAGES.items()
+    }
+
+    def run_stage(name: str, **inputs: str) -> Any:
+        if structured is None:
+            return _kickoff(crews[name], **inputs)
+        model = STEP_MODELS[name]
+        if LLM_BACKEND == "ollama" and name not in tools:
+            persona_key, description, expected_output = GRAPH_STAGES[name]
+            prompt = f"{description.format(**inputs)}\n\nExpected output: {expected_output.format(**inputs)}"
+            return structured.generate(model, system_prefix(persona_key, persona_mode), prompt)
+        return structured.parse(model, _kickoff(crews[name], **inputs))
+
+    def app_inputs(record: Dict[str, Any]) -> Dict[str, str]:
+        return {"application": str(record.get("application", "")), "record": json.dumps(record)}
+
+    def flagged(r: Dict[str, Any]) -> List[Any]:
+        # Only non-compliant applications go on to risk and remediation, as in the sequential crew
+        return [(record, verdict) for record, verdict in zip(r["cmdb"], r["compliance"]) if not _compliant(verdict)]
+
+    def findings(r: Dict[str, Any]) -> str:
+        assessed = {
+            record["id"]: (risk, remediation)
+            for (record, _), risk, remediation in zip(flagged(r), r["risk"], r["remediation"])
+        }
+        return json.dumps([
+            {
+                "application": record.get("application"),
+                "compliance": _as_json(verdict),
+                "risk": _as_json(assessed.get(record["id"], (None, None))[0]),
+                "remediation": _as_json(assessed.get(record["id"], (None, None))[1]),
+            }
+            for record, verdict in zip(r["cmdb"], r["compliance"])
+        ])
+
+    return TaskGraph([
+        Step("cmdb", lambda r: load_cmdb()),
+        Step("policy", lambda r: policy_index()),
+        Step("aggregation", lambda r: run_stage("aggregation")),
+        Step(
+            "compliance",
+            lambda record, r: run_stage("compliance", policies=app_policies(record), **app_inputs(record)),
+            inputs=("cmdb", "policy"),
+            fan_out=lambda r: r["cmdb"],
+        ),
+        Step(
+            "risk",
+            lambda item, r: run_stage("risk", compliance=_as_text(item[1]), **app_inputs(item[0])),
+            inputs=("cmdb", "compliance"),
+            fan_out=flagged,
+        ),
+        Step(
+            "remediation",
+            lambda item, r: run_stage("remediation", compliance=_as_text(item[1]), risk=_as_text(item[2]), **app_inputs(item[0])),
+            inputs=("cmdb", "compliance", "risk"),
+            fan_out=lambda r: [(record, verdict, risk) for (record, verdict), risk in zip(flagged(r), r["risk"])],
+        ),
+        Step(
+            "report",
+            lambda r: run_stage("report", aggregation=_as_text(r["aggregation"]), findings=findings(r)),
+            inputs=("cmdb", "aggregation", "compliance", "risk", "remediation"),
+        ),
+    ])
+
+
+def main() -> None:
+    if LLM_BACKEND == "ollama":
+        # Load the model before the first task so no agent turn pays the cold start
+        load = ollama_client().prewarm(OLLAMA_MODEL)
+        print(f"Pre-warmed {OLLAMA_MODEL} in {load:.2f}s (keep_alive={ollama_client().keep_alive})")
+
+    if CREW_PROCESS == "dag":
+        llm = build_llm()
+        structured = structured_outputs(llm) if STRUCTURED_OUTPUT else None
+        graph = build_graph(llm, structured=structured)
+        result = _as_text(graph.run(max_workers=CREW_WORKERS)["report"])
+        print("\n----- Step Timings -----")
+        print(json.dumps(graph.timings, indent=2))
+    else:
+        from delegation import DelegationController
+
+        controller = DelegationController()
+        llm = build_llm()
+        structured = structured_outputs(llm) if STRUCTURED_OUTPUT else None
+        crew = build_crew(llm, controller=controller, structured=structured)
+
+        # Run the Crew
+        result = crew.kickoff()
+        print("\n----- Delegation -----")
+        print(json.dumps(controller.summary(), indent=2))
     print("\n\n----- Final Report -----")
-    print(result)
\ No newline at end of file
+    print(result)
+    if structured is not None:
+        print("\n----- Structured Output -----")
+        print(json.dumps(structured.stats(), indent=2))
+
+    if LLM_BACKEND == "ollama":
+        print("\n----- Ollama Timings -----")
+        print(json.dumps(ollama_client().stats(), indent=2))
+
+
+if __name__ == "__main__":
+    configure_tracing(TRACE_PATH, service_name="crew")
+    try:
+        with span("crew.run", process=CREW_PROCESS, backend=LLM_BACKEND):
+            main()
+    finally:
+        shutdown_tracing()
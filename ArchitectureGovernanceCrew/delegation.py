@@ -0,0 +1,197 @@
+import os
+import threading
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Bounds on agent-to-agent delegation within one crew.kickoff(). Depth counts
+# nested delegations below the task's own agent. The LLM-call budget covers the
+# task's agent and every coworker it delegates to. A delegation that repeats the
+# same delegator, coworker and request more than CREW_MAX_REPEATED_DELEGATIONS
+# times is treated as a loop.
+MAX_DELEGATION_DEPTH = int(os.environ.get("CREW_MAX_DELEGATION_DEPTH", "2"))
+MAX_LLM_CALLS_PER_TASK = int(os.environ.get("CREW_MAX_LLM_CALLS_PER_TASK", "15"))
+MAX_REPEATED_DELEGATIONS = int(os.environ.get("CREW_MAX_REPEATED_DELEGATIONS", "1"))
+
+# Returned to the delegating agent as the coworker's answer when a delegation is refused
+_REFUSAL = (
+    "Delegation to {role} was not performed ({reason}). "
+    "Do not delegate this again; complete the task yourself with the information you already have."
+)
+
+
+@lru_cache(maxsize=None)
+def _llm_call_counter() -> type:
+    # langchain_core and crewai are imported on first use, so the controller
+    # itself is plain Python
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class _LlmCallCounter(BaseCallbackHandler):
+        """LangChain callback that charges every model call to the current task."""
+
+        def __init__(self, controller: "DelegationController"):
+            self.controller = controller
+
+        def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, **kwargs: Any) -> None:
+            self.controller.record_llm_call()
+
+        def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+            self.controller.record_llm_call()
+
+    return _LlmCallCounter
+
+
+class DelegationController:
+    """
+    Tracks the chain of agents working on each crew task and bounds it:
+    delegations deeper than `max_depth`, back to an agent already in the
+    chain, or repeating an identical request are answered with a refusal
+    instead of running the coworker. Each execution's `max_iter` is lowered
+    to what is left of the task's LLM-call budget, so CrewAI forces a final
+    answer rather than exceeding it. Counters are available from summary().
+    """
+
+    def __init__(
+        self,
+        max_depth: int = MAX_DELEGATION_DEPTH,
+        max_llm_calls: int = MAX_LLM_CALLS_PER_TASK,
+        max_repeats: int = MAX_REPEATED_DELEGATIONS,
+    ):
+        self.max_depth = max_depth
+        self.max_llm_calls = max_llm_calls
+        self.max_repeats = max_repeats
+        self.callback: Any = None
+        # Delegation runs the coworker synchronously on the delegating thread,
+        # so the chain of executions is per thread (and per DAG worker).
+        self._chain: ContextVar[Tuple[Dict[str, Any], ...]] = ContextVar(f"crew_delegation_{id(self)}", default=())
+        self._lock = threading.Lock()
+        self.tasks: List[Dict[str, Any]] = []
+        self.counters = {
+            "tasks": 0,
+            "llm_calls": 0,
+            "delegations": 0,
+            "max_depth_seen": 0,
+            "refused_depth": 0,
+            "refused_cycle": 0,
+            "refused_repeat": 0,
+            "refused_budget": 0,
+            "capped_executions": 0,
+        }
+
+    def record_llm_call(self) -> None:
+        chain = self._chain.get()
+        with self._lock:
+            self.counters["llm_calls"] += 1
+            if chain:
+                chain[0]["task"]["llm_calls"] += 1
+
+    def _refusal(self, chain: Tuple[Dict[str, Any], ...], role: str, request: str) -> Optional[str]:
+        task = chain[0]["task"]
+        if any(frame["role"] == role for frame in chain):
+            return "cycle"
+        if len(chain) > self.max_depth:
+            return "depth"
+        edge = (chain[-1]["role"], role, request)
+        with self._lock:
+            task["edges"][edge] = task["edges"].get(edge, 0) + 1
+            repeats = task["edges"][edge]
+        if repeats > self.max_repeats:
+            return "repeat"
+        if task["llm_calls"] >= self.max_llm_calls:
+            return "budget"
+        return None
+
+    def execute(self, agent: Any, execute: Callable[..., Any], task: Any, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs `execute(task, ...)` for `agent` within the bounds, or returns a
+        refusal message when `agent` is being delegated to out of bounds.
+        """
+        chain = self._chain.get()
+        role = str(agent.role).strip()
+        request = str(getattr(task, "description", ""))
+
+        # CrewAI retries a failed execution by calling execute_task again
+        if chain and chain[-1]["agent"] is agent and chain[-1]["request"] == request:
+            return execute(task, *args, **kwargs)
+
+        if not chain:
+            task_stats = {"agent": role, "task": request[:80], "llm_calls": 0, "delegations": 0, "refused": 0, "edges": {}}
+            with self._lock:
+                self.tasks.append(task_stats)
+                self.counters["tasks"] += 1
+        else:
+            task_stats = chain[0]["task"]
+            reason = self._refusal(chain, role, request)
+            with self._lock:
+                task_stats["delegations"] += 1
+                self.counters["delegations"] += 1
+                if reason:
+                    task_stats["refused"] += 1
+                    self.counters[f"refused_{reason}"] += 1
+            if reason:
+                return _REFUSAL.format(role=role, reason={
+                    "cycle": f"{role} is already in this delegation chain",
+                    "depth": f"delegation depth limit of {self.max_depth} reached",
+                    "repeat": "the same request was already delegated",
+                    "budget": f"LLM call budget of {self.max_llm_calls} for this task is spent",
+                }[reason])
+
+        with self._lock:
+            self.counters["max_depth_seen"] = max(self.counters["max_depth_seen"], len(chain))
+        token = self._chain.set(chain + ({"agent": agent, "role": role, "request": request, "task": task_stats},))
+        previous_max_iter = agent.max_iter
+        remaining = max(1, self.max_llm_calls - task_stats["llm_calls"])
+        if remaining < previous_max_iter:
+            agent.max_iter = remaining
+            with self._lock:
+                self.counters["capped_executions"] += 1
+        try:
+            return execute(task, *args, **kwargs)
+        finally:
+            agent.max_iter = previous_max_iter
+            self._chain.reset(token)
+
+    def attach(self, llm: Any) -> Any:
+        """Adds the LLM-call counter to a LangChain model's callbacks (once)."""
+        if self.callback is None:
+            self.callback = _llm_call_counter()(self)
+        callbacks = list(llm.callbacks or [])
+        if self.callback not in callbacks:
+            llm.callbacks = callbacks + [self.callback]
+        return llm
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limits": {
+                    "max_depth": self.max_depth,
+                    "max_llm_calls_per_task": self.max_llm_calls,
+                    "max_repeated_delegations": self.max_repeats,
+                },
+                **self.counters,
+                "per_task": [{k: v for k, v in t.items() if k != "edges"} for t in self.tasks],
+            }
+
+
+@lru_cache(maxsize=None)
+def _governed_agent() -> type:
+    from crewai import Agent
+
+    class GovernedAgent(Agent):
+        """CrewAI Agent whose executions, including delegated ones, go through a DelegationController."""
+
+        controller: Any = None
+
+        def execute_task(self, task: Any, *args: Any, **kwargs: Any) -> Any:
+            if self.controller is None:
+                return super().execute_task(task, *args, **kwargs)
+            return self.controller.execute(self, super().execute_task, task, *args, **kwargs)
+
+    return GovernedAgent
+
+
+def __getattr__(name: str) -> Any:
+    # GovernedAgent subclasses crewai.Agent and is built on first access
+    if name == "GovernedAgent":
+        return _governed_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
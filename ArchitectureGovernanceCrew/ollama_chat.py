@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+# LangChain message types mapped to Ollama chat roles
+_ROLES = {"human": "user", "ai": "assistant", "system": "system", "tool": "tool"}
+
+
+class ChatOllamaPooled(BaseChatModel):
+    """
+    LangChain chat model that talks to Ollama's native /api/chat through a
+    shared OllamaClient (pooled connections, keep_alive residency, timings)
+    instead of the OpenAI-compatible shim.
+    """
+
+    client: Any
+    model: str = "llama3:latest"
+    temperature: float = 0.0
+    num_ctx: Optional[int] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "ollama-pooled"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature, "num_ctx": self.num_ctx}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        options: Dict[str, Any] = {"temperature": self.temperature}
+        if stop:
+            options["stop"] = stop
+        if self.num_ctx:
+            options["num_ctx"] = self.num_ctx
+        response = self.client.chat(
+            self.model,
+            [
+                {"role": _ROLES.get(m.type, "user"), "content": m.content if isinstance(m.content, str) else str(m.content)}
+                for m in messages
+            ],
+            options=options,
+        )
+        usage = {
+            "prompt_tokens": response.get("prompt_eval_count", 0),
+            "completion_tokens": response.get("eval_count", 0),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        timings = {key: response.get(key, 0) for key in ("load_duration", "prompt_eval_duration", "eval_duration", "total_duration")}
+        message = AIMessage(content=response.get("message", {}).get("content", ""))
+        return ChatResult(
+            generations=[ChatGeneration(message=message, generation_info=timings)],
+            llm_output={"token_usage": usage, "model_name": self.model},
+        )
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from archgov_tracing import annotate, llm_call_span, record_http_exchange
+
+# Ollama server and residency settings for the crew's native Ollama backend
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# How long Ollama keeps the model loaded after each request ("30m", "1h", -1 = forever)
+OLLAMA_KEEP_ALIVE = os.environ.get("CREW_OLLAMA_KEEP_ALIVE", "30m")
+
+
+class OllamaClient:
+    """
+    Native Ollama API client built on one persistent, pooled httpx client, so
+    every agent turn reuses a keep-alive connection instead of reconnecting.
+    Each request sets `keep_alive` so the model stays resident between tasks
+    and runs, and the timings Ollama reports are accumulated to separate
+    model load time from prompt evaluation and generation.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_HOST,
+        keep_alive: Any = OLLAMA_KEEP_ALIVE,
+        max_connections: int = 8,
+        timeout: float = 600.0,
+    ):
+        if "://" not in base_url:
+            base_url = "http://" + base_url
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            # Generation can take minutes on CPU; connecting should not
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            # Counts every HTTP attempt of the current llm_call_span
+            event_hooks={"response": [record_http_exchange]},
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "cold_loads": 0,
+            "load_seconds": 0.0,
+            "prompt_eval_seconds": 0.0,
+            "eval_seconds": 0.0,
+            "total_seconds": 0.0,
+            "wall_seconds": 0.0,
+            "prompt_tokens": 0,
+            "output_tokens": 0,
+        }
+
+    def _record(self, response: Dict[str, Any], wall: float) -> None:
+        load = response.get("load_duration", 0) / 1e9
+        with self._lock:
+            stats = self._stats
+            stats["calls"] += 1
+            # Ollama reports a few milliseconds of load_duration even for a resident model
+            if load > 0.5:
+                stats["cold_loads"] += 1
+            stats["load_seconds"] += load
+            stats["prompt_eval_seconds"] += response.get("prompt_eval_duration", 0) / 1e9
+            stats["eval_seconds"] += response.get("eval_duration", 0) / 1e9
+            stats["total_seconds"] += response.get("total_duration", 0) / 1e9
+            stats["wall_seconds"] += wall
+            stats["prompt_tokens"] += response.get("prompt_eval_count", 0)
+            stats["output_tokens"] += response.get("eval_count", 0)
+
+    def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sends one non-streaming /api/chat request and returns Ollama's response.
+        """
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+        }
+        if options:
+            payload["options"] = options
+        if format is not None:
+            payload["format"] = format
+        started = time.perf_counter()
+        with llm_call_span("ollama.chat", model=model, messages=len(messages)):
+            response = self._http.post("/api/chat", json=payload)
+            response.raise_for_status()
+            body = response.json()
+            self._record(body, time.perf_counter() - started)
+            annotate(
+                input_tokens=body.get("prompt_eval_count"),
+                output_tokens=body.get("eval_count"),
+                load_ms=round(body.get("load_duration", 0) / 1e6, 3),
+            )
+        return body
+
+    def embed(self, model: str, inputs: List[str]) -> List[List[float]]:
+        """
+        Embeds `inputs` with one /api/embed request (e.g. model 'nomic-embed-text').
+        """
+        started = time.perf_counter()
+        with llm_call_span("ollama.embed", model=model, inputs=len(inputs)):
+            response = self._http.post("/api/embed", json={"model": model, "input": inputs, "keep_alive": self.keep_alive})
+            response.raise_for_status()
+            body = response.json()
+            self._record(body, time.perf_counter() - started)
+            annotate(input_tokens=body.get("prompt_eval_count"))
+        return body["embeddings"]
+
+    def prewarm(self, model: str) -> float:
+        """
+        Loads the model without generating anything (a /api/generate request
+        with no prompt) and returns the load time in seconds.
+        """
+        started = time.perf_counter()
+        with llm_call_span("ollama.prewarm", model=model):
+            response = self._http.post("/api/generate", json={"model": model, "keep_alive": self.keep_alive})
+            response.raise_for_status()
+            load = response.json().get("load_duration", 0) / 1e9
+            annotate(load_ms=round(load * 1000, 3))
+        with self._lock:
+            self._stats["load_seconds"] += load
+            self._stats["wall_seconds"] += time.perf_counter() - started
+            if load > 0.5:
+                self._stats["cold_loads"] += 1
+        return load
+
+    def loaded_models(self) -> List[str]:
+        response = self._http.get("/api/ps")
+        response.raise_for_status()
+        return [m.get("name", "") for m in response.json().get("models", [])]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Accumulated timings: model load vs. prompt evaluation vs. generation.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["generation_seconds"] = stats["prompt_eval_seconds"] + stats["eval_seconds"]
+        stats["tokens_per_second"] = (
+            stats["output_tokens"] / stats["eval_seconds"] if stats["eval_seconds"] else 0.0
+        )
+        return {key: round(value, 3) if isinstance(value, float) else value for key, value in stats.items()}
+
+    def close(self) -> None:
+        self._http.close()
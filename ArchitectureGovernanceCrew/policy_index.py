@@ -0,0 +1,397 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# cmdb_connectors is shared with the A2A pipeline and lives at the repository
+# root, which must be on PYTHONPATH
+from cmdb_connectors import COMPLIANCE_REGISTRY, Policy, render_policy_doc
+
+# Bump when the on-disk layout changes, so older indexes are rebuilt
+INDEX_VERSION = 1
+# Clauses longer than this many words are split; shorter neighbours in the same section are merged
+CHUNK_WORDS = 120
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reciprocal rank fusion constant used to combine BM25 and embedding rankings
+RRF_K = 60
+# Texts per embedding request while building
+EMBED_BATCH = 64
+CORPUS_EXTENSIONS = (".md", ".txt")
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_HEADING = re.compile(r"^\s{0,3}(#{1,6})\s+(.+?)\s*#*\s*$")
+_ITEM = re.compile(r"^\s*(?:[-*•]|\(?[0-9]+(?:\.[0-9]+)*[.)]?|\(?[a-z][.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.;:])\s+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with must shall should all any".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def detect_standards(text: str) -> int:
+    """
+    Registry mask of the compliance standards named in `text`; 'SOC 2' and
+    'ISO 27001' are matched as well as 'SOC2' and 'ISO27001'.
+    """
+    words = re.findall(r"[A-Z0-9]+", text.upper())
+    candidates = set(words) | {a + b for a, b in zip(words, words[1:])}
+    return COMPLIANCE_REGISTRY.mask(s for s in COMPLIANCE_REGISTRY.standards if re.sub(r"[^A-Z0-9]", "", s.upper()) in candidates)
+
+
+def _split_long(text: str, max_words: int) -> List[str]:
+    if len(text.split()) <= max_words:
+        return [text]
+    pieces, current = [], []
+    for sentence in _SENTENCE.split(text):
+        words = sentence.split()
+        if current and len(current) + len(words) > max_words:
+            pieces.append(" ".join(current))
+            current = []
+        while len(words) > max_words:
+            pieces.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        current.extend(words)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_document(text: str, max_words: int = CHUNK_WORDS) -> List[Tuple[str, str]]:
+    """
+    Splits a Markdown or plain-text document into (section, clause) chunks.
+    Headings set the section; paragraphs and list items are clauses, merged
+    with their neighbours up to `max_words` and split beyond it.
+    """
+    headings: List[Tuple[int, str]] = []
+    clauses: List[Tuple[str, str]] = []
+    lines: List[str] = []
+
+    def flush() -> None:
+        if lines:
+            section = " > ".join(title for _, title in headings)
+            clauses.append((section, " ".join(line.strip() for line in lines)))
+            lines.clear()
+
+    for line in text.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            headings[:] = [h for h in headings if h[0] < level] + [(level, heading.group(2))]
+        elif not line.strip():
+            flush()
+        else:
+            if _ITEM.match(line):
+                flush()
+            lines.append(line)
+    flush()
+
+    chunks: List[Tuple[str, str]] = []
+    for section, clause in clauses:
+        for piece in _split_long(clause, max_words):
+            if chunks and chunks[-1][0] == section and len(chunks[-1][1].split()) + len(piece.split()) <= max_words:
+                chunks[-1] = (section, chunks[-1][1] + "\n" + piece)
+            else:
+                chunks.append((section, piece))
+    return chunks
+
+
+def policy_documents(policy: Policy) -> List[Tuple[str, str]]:
+    """
+    One (source, text) document per standard of the policy DSL: its
+    requirements and rules in prose.
+    """
+    documents = []
+    for standard in dict.fromkeys(list(policy.standards) + [rule.standard for rule in policy.rules]):
+        subset = Policy({standard: policy.standards.get(standard, [])}, [r for r in policy.rules if r.standard == standard])
+        documents.append((f"policy:{standard}", f"# {standard}\n\n" + render_policy_doc(subset)))
+    return documents
+
+
+def corpus_files(paths: Iterable[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(CORPUS_EXTENSIONS))
+        elif path:
+            files.append(path)
+    return sorted(files)
+
+
+class PolicyIndex:
+    """
+    Chunked BM25 index over policy documents, with optional embeddings.
+
+    Postings are stored CSR-style (per-term offsets into document id and
+    term-frequency arrays) and every array, including the clause texts, is
+    a separate file that load() memory-maps, so opening an index of
+    hundreds of pages costs milliseconds and only the pages a query touches
+    are read. Each clause carries a mask of the standards it belongs to
+    (compliance bit registry), used to restrict results to an application's
+    standards.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any], texts: Any):
+        self.arrays = arrays
+        self.meta = meta
+        self._texts = texts
+        self._vocab: Dict[str, int] = meta["vocab"]
+        # Bits as assigned when the index was built, which a later run's registry may not share
+        self._standard_bits = {name.upper(): bit for name, bit in meta["standards"].items()}
+
+    # --- Building ---
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[Tuple[str, str]],
+        max_words: int = CHUNK_WORDS,
+        embedder: Optional[Embedder] = None,
+        embed_model: str = "",
+    ) -> "PolicyIndex":
+        """
+        Chunks and indexes (source, text) documents. Clauses inherit the
+        standards named in their document's source and first heading.
+        """
+        sources: List[str] = []
+        sections: List[str] = []
+        texts: List[str] = []
+        masks: List[int] = []
+        for source, text in documents:
+            chunks = chunk_document(text, max_words)
+            document_mask = detect_standards(os.path.basename(source) + " " + (chunks[0][0] if chunks else ""))
+            for section, clause in chunks:
+                sources.append(source)
+                sections.append(section)
+                texts.append(clause)
+                masks.append(document_mask | detect_standards(section + " " + clause))
+
+        vocab: Dict[str, int] = {}
+        postings: List[List[Tuple[int, int]]] = []
+        lengths = []
+        for doc, (section, text) in enumerate(zip(sections, texts)):
+            terms = Counter(tokenize(section + " " + text))
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                term_id = vocab.setdefault(term, len(vocab))
+                if term_id == len(postings):
+                    postings.append([])
+                postings[term_id].append((doc, tf))
+
+        count = len(texts)
+        df = np.fromiter((len(p) for p in postings), dtype=np.float64, count=len(postings))
+        encoded = [t.encode() for t in texts]
+        arrays = {
+            "term_offsets": np.concatenate(([0], np.cumsum(df))).astype(np.int64),
+            "postings_doc": np.fromiter((d for p in postings for d, _ in p), dtype=np.int32),
+            "postings_tf": np.fromiter((tf for p in postings for _, tf in p), dtype=np.float32),
+            "idf": np.log(1 + (count - df + 0.5) / (df + 0.5)).astype(np.float32),
+            "doc_len": np.array(lengths, dtype=np.float32),
+            "standards": np.array(masks, dtype=np.uint64),
+            "text_offsets": np.concatenate(([0], np.cumsum([len(e) for e in encoded]))).astype(np.int64),
+        }
+        if embedder is not None and count:
+            vectors = []
+            for start in range(0, count, EMBED_BATCH):
+                vectors.extend(embedder([f"{s}\n{t}" for s, t in zip(sections[start:start + EMBED_BATCH], texts[start:start + EMBED_BATCH])]))
+            matrix = np.array(vectors, dtype=np.float32)
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+            arrays["embeddings"] = matrix
+        meta = {
+            "version": INDEX_VERSION,
+            "chunks": count,
+            "avg_len": float(np.mean(lengths)) if lengths else 0.0,
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "embed_model": embed_model if embedder is not None else "",
+            "vocab": vocab,
+            "standards": {name: COMPLIANCE_REGISTRY.bit(name) for name in COMPLIANCE_REGISTRY.standards},
+            "sources": sources,
+            "sections": sections,
+        }
+        return cls(arrays, meta, b"".join(encoded))
+
+    # --- Persistence ---
+
+    def save(self, directory: str, fingerprint: str = "") -> None:
+        os.makedirs(directory, exist_ok=True)
+        # Drop the old metadata first and any array this index does not have
+        # (e.g. embeddings.npy from a build with an embedding model), since
+        # load() maps every .npy file in the directory
+        for name in os.listdir(directory):
+            if name == "meta.json" or (name.endswith(".npy") and name[:-4] not in self.arrays):
+                os.remove(os.path.join(directory, name))
+        for name, array in self.arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.asarray(array))
+        with open(os.path.join(directory, "texts.bin"), "wb") as f:
+            f.write(bytes(self._texts))
+        # meta.json is written last, so a crash mid-save leaves an index that fails to load
+        tmp = os.path.join(directory, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({**self.meta, "fingerprint": fingerprint}, f, separators=(",", ":"))
+        os.replace(tmp, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str) -> "PolicyIndex":
+        """
+        Opens a saved index with every array memory-mapped read-only.
+        """
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Policy index in {directory} has version {meta.get('version')}, expected {INDEX_VERSION}")
+        arrays = {
+            name[:-4]: np.load(os.path.join(directory, name), mmap_mode="r")
+            for name in os.listdir(directory) if name.endswith(".npy")
+        }
+        path = os.path.join(directory, "texts.bin")
+        texts = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else b""
+        return cls(arrays, meta, texts)
+
+    # --- Search ---
+
+    def __len__(self) -> int:
+        return self.meta["chunks"]
+
+    def text(self, doc: int) -> str:
+        offsets = self.arrays["text_offsets"]
+        return bytes(self._texts[int(offsets[doc]):int(offsets[doc + 1])]).decode()
+
+    def bm25(self, query: str) -> np.ndarray:
+        a = self.arrays
+        scores = np.zeros(len(self), dtype=np.float32)
+        k1, b, avg_len = self.meta["k1"], self.meta["b"], self.meta["avg_len"] or 1.0
+        for term in set(tokenize(query)):
+            term_id = self._vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = int(a["term_offsets"][term_id]), int(a["term_offsets"][term_id + 1])
+            docs, tf = a["postings_doc"][start:end], a["postings_tf"][start:end]
+            norm = k1 * (1 - b + b * a["doc_len"][docs] / avg_len)
+            scores[docs] += a["idf"][term_id] * tf * (k1 + 1) / (tf + norm)
+        return scores
+
+    def _standards_mask(self, standards: Sequence[str]) -> int:
+        mask = 0
+        for standard in standards:
+            bit = self._standard_bits.get(str(standard).strip().upper())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def search(
+        self,
+        query: str,
+        standards: Sequence[str] = (),
+        k: int = 5,
+        query_vector: Optional[Sequence[float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The top-k clauses for `query`. When `standards` are given, only their
+        clauses are candidates, and nothing is returned if the index has
+        none. With a query embedding (and an index built with embeddings)
+        the BM25 and cosine rankings are fused by reciprocal rank.
+        """
+        if not len(self) or k <= 0:
+            return []
+        scores = self.bm25(query)
+        candidates = np.ones(len(self), dtype=bool)
+        if standards:
+            mask = self._standards_mask(standards)
+            candidates = (np.asarray(self.arrays["standards"]) & np.uint64(mask)) != 0
+            if not candidates.any():
+                # Clauses of other standards do not apply to the application
+                return []
+        if query_vector is not None and "embeddings" in self.arrays:
+            vector = np.asarray(query_vector, dtype=np.float32)
+            cosine = np.asarray(self.arrays["embeddings"]) @ (vector / max(float(np.linalg.norm(vector)), 1e-12))
+            fused = np.zeros(len(self), dtype=np.float64)
+            for ranking in (scores, cosine):
+                order = np.argsort(-np.where(candidates, ranking, -np.inf), kind="stable")
+                fused[order] += 1.0 / (RRF_K + np.arange(1, len(order) + 1))
+            scores = fused
+        ranked = np.where(candidates, scores, -np.inf)
+        if not standards and not (ranked > 0).any():
+            return []
+        k = min(k, int(candidates.sum()))
+        top = np.argpartition(-ranked, k - 1)[:k] if k < len(ranked) else np.arange(len(ranked))
+        top = top[np.argsort(-ranked[top], kind="stable")][:k]
+        return [
+            {
+                "source": self.meta["sources"][doc],
+                "section": self.meta["sections"][doc],
+                "text": self.text(int(doc)),
+                "score": round(float(ranked[doc]), 4),
+            }
+            for doc in top
+        ]
+
+
+def fingerprint(files: Sequence[str], policy_path: str, embed_model: str, max_words: int) -> str:
+    """
+    Changes whenever a corpus file, the policy file or an index parameter does.
+    """
+    entries = []
+    for path in list(files) + ([policy_path] if policy_path else []):
+        try:
+            stat = os.stat(path)
+            entries.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            entries.append([os.path.abspath(path), None, None])
+    payload = json.dumps([INDEX_VERSION, entries, embed_model, max_words, BM25_K1, BM25_B])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+_lock = threading.Lock()
+
+
+def open_index(
+    directory: str,
+    policy: Policy,
+    policy_path: str = "",
+    corpus: Sequence[str] = (),
+    embedder: Optional[Embedder] = None,
+    embed_model: str = "",
+    max_words: int = CHUNK_WORDS,
+) -> PolicyIndex:
+    """
+    Memory-maps the index saved in `directory`, rebuilding and saving it
+    first if the policy, the corpus files or the parameters changed.
+    """
+    files = corpus_files(corpus)
+    expected = fingerprint(files, policy_path, embed_model if embedder is not None else "", max_words)
+    with _lock:
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                current = json.load(f).get("fingerprint")
+        except (OSError, ValueError):
+            current = None
+        if current != expected:
+            documents = policy_documents(policy)
+            for path in files:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    documents.append((os.path.relpath(path), f.read()))
+            PolicyIndex.build(documents, max_words, embedder, embed_model).save(directory, expected)
+        return PolicyIndex.load(directory)
+
+
+def format_clauses(clauses: List[Dict[str, Any]]) -> str:
+    """
+    Clauses as compact prose for a prompt, each labelled with its source and section.
+    """
+    return "\n\n".join(
+        f"[{c['source']}{' § ' + c['section'] if c['section'] else ''}]\n{c['text']}" for c in clauses
+    )
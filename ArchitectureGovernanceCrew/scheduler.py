@@ -0,0 +1,124 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class Step:
+    """
+    One node of a TaskGraph. `run(inputs)` receives the results of the steps
+    named in `inputs`. With `fan_out`, the step is instead split into one
+    `run(item, inputs)` call per item of `fan_out(inputs)`, each on its own
+    worker, and its result is the list of item results in order.
+    """
+
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    fan_out: Optional[Callable[[Dict[str, Any]], Sequence[Any]]] = None
+
+
+class TaskGraph:
+    """
+    Runs steps as a DAG on a thread pool: a step starts as soon as every step
+    it declares as input has finished, so independent steps (and the items of
+    fanned-out steps) run concurrently. Per-step timings are kept in `timings`.
+    """
+
+    def __init__(self, steps: Sequence[Step]):
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step '{step.name}'")
+            self.steps[step.name] = step
+        self.order = self._topological_order()
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def _topological_order(self) -> List[str]:
+        waiting = {}
+        for name, step in self.steps.items():
+            unknown = [i for i in step.inputs if i not in self.steps]
+            if unknown:
+                raise ValueError(f"Step '{name}' depends on unknown step(s) {unknown}")
+            waiting[name] = set(step.inputs)
+        order = []
+        ready = [name for name, inputs in waiting.items() if not inputs]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, inputs in waiting.items():
+                if name in inputs:
+                    inputs.discard(name)
+                    if not inputs:
+                        ready.append(other)
+        if len(order) != len(self.steps):
+            raise ValueError(f"Cycle between steps {sorted(set(self.steps) - set(order))}")
+        return order
+
+    def run(self, max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Executes the graph and returns every step's result by name. The first
+        failing step cancels whatever has not started yet and is re-raised.
+        """
+        results: Dict[str, Any] = {}
+        waiting = {name: set(step.inputs) for name, step in self.steps.items()}
+        partial: Dict[str, List[Any]] = {}
+        remaining: Dict[str, int] = {}
+        futures: Dict[Future, Tuple[str, Optional[int], float]] = {}
+        self.timings = {}
+        started = time.perf_counter()
+
+        def finish(name: str, value: Any) -> None:
+            results[name] = value
+            self.timings[name]["end"] = round(time.perf_counter() - started, 3)
+            for other in self.order:
+                if name in waiting[other]:
+                    waiting[other].discard(name)
+                    if not waiting[other]:
+                        launch(other)
+
+        def submit(fn: Callable[..., Any], *args: Any) -> Future:
+            # Run in a copy of the caller's context, so tracing spans opened
+            # by the step nest under the caller's span
+            return pool.submit(contextvars.copy_context().run, fn, *args)
+
+        def launch(name: str) -> None:
+            step = self.steps[name]
+            inputs = {key: results[key] for key in step.inputs}
+            self.timings[name] = {"start": round(time.perf_counter() - started, 3), "items": []}
+            if step.fan_out is None:
+                futures[submit(step.run, inputs)] = (name, None, time.perf_counter())
+                return
+            items = list(step.fan_out(inputs))
+            partial[name] = [None] * len(items)
+            remaining[name] = len(items)
+            if not items:
+                finish(name, partial.pop(name))
+            for index, item in enumerate(items):
+                futures[submit(step.run, item, inputs)] = (name, index, time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="crew-step") as pool:
+            for name in self.order:
+                if not self.steps[name].inputs:
+                    launch(name)
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, index, submitted = futures.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        for pending in futures:
+                            pending.cancel()
+                        raise RuntimeError(f"Crew step '{name}' failed") from e
+                    self.timings[name]["items"].append(round(time.perf_counter() - submitted, 3))
+                    if index is None:
+                        finish(name, value)
+                        continue
+                    partial[name][index] = value
+                    remaining[name] -= 1
+                    if not remaining[name]:
+                        finish(name, partial.pop(name))
+        return results
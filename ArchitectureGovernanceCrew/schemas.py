@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional, Type, get_args, get_origin
+
+from pydantic import BaseModel
+
+# ComplianceResult is shared with the A2A pipeline through cmdb_connectors
+from cmdb_connectors import ComplianceResult
+
+# Output models of the crew's tasks. Field names follow the A2A pipeline's
+# models.py (appName, isCompliant, reason, risk, severity, ...) so both
+# pipelines report the same shapes.
+
+
+class ApplicationRecord(BaseModel):
+    id: Optional[int] = None
+    application: str
+    owner: Optional[str] = None
+    deployment_env: Optional[str] = None
+    compliance: List[str] = []
+
+
+class AggregatedData(BaseModel):
+    applications: List[ApplicationRecord]
+
+
+class ComplianceFindings(BaseModel):
+    results: List[ComplianceResult]
+
+
+class RiskAssessment(BaseModel):
+    appName: str
+    risk: str
+    severity: str
+
+
+class RiskReport(BaseModel):
+    assessments: List[RiskAssessment]
+
+
+class Recommendation(BaseModel):
+    appName: Optional[str] = None
+    risk: str
+    recommendation: str
+    priority: str
+
+
+class Recommendations(BaseModel):
+    recommendations: List[Recommendation]
+
+
+class GovernanceReport(BaseModel):
+    summary: str
+    compliantApplications: List[str] = []
+    nonCompliantApplications: List[str] = []
+    actionItems: List[str]
+
+
+# Output model of each sequential crew task
+TASK_MODELS: Dict[str, Type[BaseModel]] = {
+    "aggregation": AggregatedData,
+    "compliance": ComplianceFindings,
+    "risk": RiskReport,
+    "remediation": Recommendations,
+    "report": GovernanceReport,
+}
+
+# Output model of each per-application (or final) step of the DAG
+STEP_MODELS: Dict[str, Type[BaseModel]] = {
+    "aggregation": AggregatedData,
+    "compliance": ComplianceResult,
+    "risk": RiskAssessment,
+    "remediation": Recommendations,
+    "report": GovernanceReport,
+}
+
+
+def _type_name(annotation: Any) -> str:
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        return f"list of {_type_name(get_args(annotation)[0])}"
+    if origin is not None:
+        # Optional[X]
+        return _type_name(next(a for a in get_args(annotation) if a is not type(None)))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return f"object ({describe_fields(annotation)})"
+    return {str: "string", bool: "boolean", int: "integer", float: "number"}.get(annotation, "value")
+
+
+def describe_fields(model: Type[BaseModel]) -> str:
+    return ", ".join(
+        f"{name}: {_type_name(field.annotation)}{'' if field.is_required() else ' (optional)'}"
+        for name, field in model.model_fields.items()
+    )
+
+
+def describe(model: Type[BaseModel]) -> str:
+    """
+    expected_output text for a task. Written without braces, since CrewAI
+    treats {name} in task text as an input placeholder.
+    """
+    return f"Only a JSON object with these fields, and no other text: {describe_fields(model)}"
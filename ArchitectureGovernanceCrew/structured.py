@@ -0,0 +1,101 @@
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+# Model output is parsed like the A2A pipeline's: the first JSON object or
+# array, past code fences, a leading 'Final Answer:' and other prose
+from archgov_json import parse_json
+
+# complete(messages, schema) -> text. With the Ollama backend the JSON schema
+# is passed as `format`, so decoding is grammar-constrained to the model.
+Completion = Callable[[List[Dict[str, str]], Optional[Dict[str, Any]]], str]
+
+REPAIR_INSTRUCTION = (
+    "You fix JSON documents. Rewrite the given output as a single JSON object that "
+    "validates against the JSON schema, keeping its content. Reply with the JSON only."
+)
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+class StructuredOutputs:
+    """
+    Strictly validates task outputs against their Pydantic models. Output
+    that does not validate gets exactly one repair pass, a schema-constrained
+    completion given the errors, before StructuredOutputError is raised.
+    """
+
+    def __init__(self, complete: Completion):
+        self.complete = complete
+        self._lock = threading.Lock()
+        self.counters = {"generated": 0, "valid": 0, "repaired": 0, "failed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    def validate(self, model: Type[BaseModel], text: str) -> BaseModel:
+        return model.model_validate(parse_json(text), strict=True)
+
+    def parse(self, model: Type[BaseModel], text: str) -> BaseModel:
+        try:
+            result = self.validate(model, text)
+            self._count("valid")
+            return result
+        except ValueError as e:
+            error = e
+        schema = model.model_json_schema()
+        repaired = self.complete(
+            [
+                {"role": "system", "content": REPAIR_INSTRUCTION},
+                {"role": "user", "content": f"JSON schema:\n{json.dumps(schema)}\n\nValidation errors:\n{error}\n\nOutput:\n{text}"},
+            ],
+            schema,
+        )
+        try:
+            result = self.validate(model, repaired)
+        except ValueError as e:
+            self._count("failed")
+            raise StructuredOutputError(f"{model.__name__} output still invalid after repair: {e}") from error
+        self._count("repaired")
+        return result
+
+    def generate(self, model: Type[BaseModel], system: str, prompt: str) -> BaseModel:
+        """
+        One schema-constrained completion validated into `model`, for steps
+        that need no tools and so can skip CrewAI's ReAct loop.
+        """
+        self._count("generated")
+        text = self.complete(
+            [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+            model.model_json_schema(),
+        )
+        return self.parse(model, text)
+
+    def task_callback(self, model: Type[BaseModel]) -> Callable[[Any], None]:
+        """
+        Task callback that replaces the task's raw output with the validated,
+        compact JSON, which is what later tasks receive as context. Output
+        that cannot be repaired is left as is (and counted as failed).
+        """
+        def callback(output: Any) -> None:
+            try:
+                result = self.parse(model, str(output.raw))
+            except StructuredOutputError as e:
+                print(f"⚠️ {e}")
+                return
+            output.raw = result.model_dump_json()
+            try:
+                output.pydantic = result
+            except Exception:
+                pass
+
+        return callback
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
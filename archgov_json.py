@@ -0,0 +1,166 @@
+"""
+Incremental extraction of JSON from LLM output, shared by the A2A and Crew
+governance pipelines.
+"""
+import json
+from typing import Any, List, Optional
+
+from archgov_tracing import annotate, span
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class IncrementalJsonParser:
+    """
+    Incrementally parses the first JSON value in a stream of model output.
+
+    Text before the value (prose, a ```json fence line) and after it (closing
+    fence, commentary) is ignored. When the value is an array, each element is
+    returned as soon as it is complete, so consumers can start on the first
+    item before the model has produced the last one; an object is returned
+    once it is complete.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._mode: Optional[str] = None  # None (searching), "array", "value", "done" or "invalid"
+        self._start = 0  # position of the current candidate's '[' or '{'
+        self._emitted = 0  # items returned from the current candidate
+        self.is_array = False
+
+    @property
+    def done(self) -> bool:
+        return self._mode == "done"
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Adds a chunk of text and returns the values completed by it.
+        """
+        self._buffer += text
+        items: List[Any] = []
+        while True:
+            if self._mode is None and not self._find_start():
+                return items
+            if self._mode == "array":
+                item = self._next_element()
+                if item is _INVALID:
+                    self._restart()
+                    continue
+                if item is _INCOMPLETE:
+                    return items
+                if item is not _END:
+                    self._emitted += 1
+                    items.append(item)
+                continue
+            if self._mode == "value":
+                try:
+                    value, end = _decoder.raw_decode(self._buffer, self._pos)
+                except json.JSONDecodeError as e:
+                    if _truncated(self._buffer, e):
+                        return items
+                    self._restart()
+                    continue
+                self._pos = end
+                self._mode = "done"
+                items.append(value)
+            return items
+
+    def close(self) -> List[Any]:
+        """
+        Signals end of stream. Raises ValueError if a started value never completed.
+        """
+        if self._mode in ("array", "value"):
+            raise ValueError(f"Incomplete JSON in model output: {self._buffer[-200:]!r}")
+        if self._mode == "invalid":
+            raise ValueError(f"Invalid JSON in model output: {self._buffer[self._start:self._start + 200]!r}")
+        return []
+
+    def _find_start(self) -> bool:
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if buffer.startswith("```", self._pos):
+                newline = buffer.find("\n", self._pos)
+                if newline == -1:
+                    return False  # wait for the rest of the fence line
+                self._pos = newline + 1
+                continue
+            if char == "[":
+                self._start = self._pos
+                self._pos += 1
+                self._mode = "array"
+                self.is_array = True
+                return True
+            if char == "{":
+                self._start = self._pos
+                self._mode = "value"
+                return True
+            self._pos += 1
+        return False
+
+    def _restart(self) -> None:
+        # The candidate was a bracket in prose (e.g. "[see below]"): search again
+        # after it, unless items were already handed out from it
+        if self._emitted:
+            self._mode = "invalid"
+            return
+        self._pos = self._start + 1
+        self._mode = None
+        self.is_array = False
+
+    def _next_element(self) -> Any:
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and (buffer[pos] in _WHITESPACE or buffer[pos] == ","):
+            pos += 1
+        if pos >= len(buffer):
+            return _INCOMPLETE
+        if buffer[pos] == "]":
+            self._pos = pos + 1
+            self._mode = "done"
+            return _END
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            return _INCOMPLETE if _truncated(buffer, e) else _INVALID
+        # A trailing number (or literal) may still be growing: require the next
+        # delimiter to have arrived before accepting the element.
+        lookahead = end
+        while lookahead < len(buffer) and buffer[lookahead] in _WHITESPACE:
+            lookahead += 1
+        if lookahead >= len(buffer):
+            return _INCOMPLETE
+        self._pos = end
+        return value
+
+
+_INCOMPLETE = object()
+_INVALID = object()
+_END = object()
+
+
+def _truncated(buffer: str, error: json.JSONDecodeError) -> bool:
+    """
+    Whether decoding failed only because the buffer ends early (more text may
+    complete the value), rather than on text that can never be JSON.
+    """
+    if error.pos >= len(buffer.rstrip()) or error.msg.startswith("Unterminated string"):
+        return True
+    rest = buffer[error.pos:]
+    return any(literal.startswith(rest) for literal in ("true", "false", "null", "-"))
+
+
+def parse_json(text: str) -> Any:
+    """
+    Parses the first JSON array or object in model output, tolerating code fences and surrounding text.
+    """
+    with span("extract_json", bytes=len(text)):
+        parser = IncrementalJsonParser()
+        items = parser.feed(text)
+        parser.close()
+        if not parser.done:
+            raise ValueError(f"No JSON found in model output: {text[:200]!r}")
+        annotate(items=len(items))
+        return items if parser.is_array else items[0]
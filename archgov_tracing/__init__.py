@@ -0,0 +1,119 @@
+"""
+Tracing shared by the A2A and Crew governance pipelines: OpenTelemetry spans
+written as OTLP/JSON lines (see otlp.py). Until configure_tracing() turns it
+on, every helper is a no-op and opentelemetry is not even imported, so the
+pipelines can import these helpers at module level.
+"""
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+_enabled = False
+_provider: Any = None
+_trace: Any = None  # the opentelemetry.trace module, once tracing is on
+_tracer: Any = None
+_NOOP = nullcontext()
+
+# Per-LLM-call HTTP counters filled in by the ClientPool event hooks
+_http_stats: ContextVar[Optional[Dict[str, int]]] = ContextVar("archgov_http_stats", default=None)
+
+
+def configure_tracing(path: str, service_name: str = "archgov") -> bool:
+    """
+    Installs a tracer provider exporting to `path` as OTLP/JSON lines.
+    With an empty path tracing stays disabled and every helper is a no-op.
+    """
+    global _enabled, _provider, _trace, _tracer
+    if not path or _enabled:
+        return _enabled
+    from opentelemetry import trace
+    from .otlp import tracer_provider
+
+    _provider = tracer_provider(path, service_name)
+    trace.set_tracer_provider(_provider)
+    # ADK's own spans (invoke_agent, call_llm, execute_tool) use the same global
+    # provider, so they land in the same trace file as the spans created here.
+    _trace, _tracer = trace, trace.get_tracer("archgov")
+    _enabled = True
+    return True
+
+
+def shutdown_tracing() -> None:
+    """
+    Flushes pending spans and closes the trace file.
+    """
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attributes: Any):
+    """
+    Context manager opening a child span of the current one, with `archgov.`
+    prefixed attributes. Returns a shared null context when tracing is off.
+    """
+    if not _enabled:
+        return _NOOP
+    return _tracer.start_as_current_span(
+        name, attributes={f"archgov.{key}": value for key, value in attributes.items() if value is not None}
+    )
+
+
+def annotate(**attributes: Any) -> None:
+    """
+    Sets `archgov.` prefixed attributes on the current span (ADK's tool and
+    LLM spans included).
+    """
+    if not _enabled:
+        return
+    current = _trace.get_current_span()
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(f"archgov.{key}", value)
+
+
+@contextmanager
+def llm_call_span(name: str, **attributes: Any) -> Iterator[None]:
+    """
+    Span around one logical model call. Every HTTP attempt made inside it,
+    including SDK retries, is counted through record_http_exchange.
+    """
+    if not _enabled:
+        yield
+        return
+    stats = {"attempts": 0, "request_bytes": 0, "response_bytes": 0, "throttled": 0}
+    token = _http_stats.set(stats)
+    try:
+        with span(name, **attributes) as current:
+            try:
+                yield
+            finally:
+                current.set_attribute("archgov.http_attempts", stats["attempts"])
+                current.set_attribute("archgov.retry_count", max(0, stats["attempts"] - 1))
+                current.set_attribute("archgov.throttled", stats["throttled"])
+                current.set_attribute("archgov.request_bytes", stats["request_bytes"])
+                current.set_attribute("archgov.response_bytes", stats["response_bytes"])
+    finally:
+        _http_stats.reset(token)
+
+
+def record_http_exchange(response: Any) -> None:
+    """
+    Called from the httpx response hook for every attempt.
+    """
+    stats = _http_stats.get()
+    if stats is None:
+        return
+    try:
+        request_bytes = len(response.request.content)
+    except Exception:
+        request_bytes = 0
+    stats["attempts"] += 1
+    stats["request_bytes"] += request_bytes
+    stats["response_bytes"] += int(response.headers.get("content-length", 0))
+    if response.status_code == 429:
+        stats["throttled"] += 1
+    _trace.get_current_span().add_event("http.response", {"http.status_code": response.status_code})
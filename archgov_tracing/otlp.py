@@ -0,0 +1,95 @@
+import json
+import threading
+from typing import Any, Dict, List, Sequence
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Any) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in (attributes or {}).items()]
+
+
+def _otlp_span(span: ReadableSpan) -> Dict[str, Any]:
+    context = span.get_span_context()
+    encoded = {
+        "traceId": format(context.trace_id, "032x"),
+        "spanId": format(context.span_id, "016x"),
+        "name": span.name,
+        # OTLP reserves 0 for SPAN_KIND_UNSPECIFIED; the SDK's INTERNAL is 0
+        "kind": span.kind.value + 1,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": span.status.status_code.value},
+    }
+    if span.parent is not None:
+        encoded["parentSpanId"] = format(span.parent.span_id, "016x")
+    if span.status.description:
+        encoded["status"]["message"] = span.status.description
+    if span.events:
+        encoded["events"] = [
+            {"timeUnixNano": str(e.timestamp), "name": e.name, "attributes": _otlp_attributes(e.attributes)}
+            for e in span.events
+        ]
+    return encoded
+
+
+class OtlpJsonFileExporter(SpanExporter):
+    """
+    Appends each exported batch to a file as one OTLP/JSON
+    ExportTraceServiceRequest per line (the OpenTelemetry file exporter
+    format), which collectors and most trace viewers can import.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        resources: Dict[Any, Dict[Any, List[Dict[str, Any]]]] = {}
+        for span in spans:
+            scope = span.instrumentation_scope
+            scope_key = (scope.name, scope.version) if scope else ("", None)
+            resources.setdefault(span.resource, {}).setdefault(scope_key, []).append(_otlp_span(span))
+        request = {"resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes(resource.attributes)},
+                "scopeSpans": [
+                    {"scope": {"name": name, **({"version": version} if version else {})}, "spans": encoded}
+                    for (name, version), encoded in scopes.items()
+                ],
+            }
+            for resource, scopes in resources.items()
+        ]}
+        with self._lock:
+            self._file.write(json.dumps(request, separators=(",", ":")) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def tracer_provider(path: str, service_name: str) -> TracerProvider:
+    """
+    A tracer provider batching spans into an OtlpJsonFileExporter on `path`.
+    """
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OtlpJsonFileExporter(path)))
+    return provider
@@ -0,0 +1,121 @@
+"""
+Benchmarks the ArchGov.py pipeline (build_pipeline) against the local stub LLM server.
+
+Usage:
+    python benchmarks/bench_archgov.py --apps 1k --mode sequential --latency-ms 200 --output result.json
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from harness import REPO_ROOT, emit, git_version, peak_rss_mb, stage_latencies, stub_server, stub_stats
+from synthetic_cmdb import SIZES, generate_apps
+
+
+def run(args: argparse.Namespace, base_url: str) -> dict:
+    workdir = tempfile.mkdtemp(prefix="archgov_bench_")
+    sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceA2A"))
+
+    import_started = time.perf_counter()
+    import ArchGov
+    import_seconds = time.perf_counter() - import_started
+
+    config = ArchGov.PipelineConfig(
+        gemini_base_url=base_url,
+        llm_cache_path="",
+        full_run=True,
+        state_path=os.path.join(workdir, "state.sqlite"),
+        session_path=os.path.join(workdir, "sessions.sqlite"),
+        pipeline_mode=args.mode,
+        gemini_rpm=1_000_000,
+        gemini_tpm=1_000_000_000,
+        run_id=None,
+        resume=False,
+    )
+    apps = generate_apps(SIZES.get(args.apps) or int(args.apps))
+    store = ArchGov.CmdbStore(apps)
+    build_started = time.perf_counter()
+    pipeline = ArchGov.build_pipeline(config, store)
+    from google.adk.plugins import BasePlugin
+    build_seconds = time.perf_counter() - build_started
+
+    class BenchmarkPlugin(BasePlugin):
+        def __init__(self):
+            super().__init__(name="benchmark")
+            self.events = 0
+            self.started = {}
+            self.samples = defaultdict(list)
+
+        async def on_event_callback(self, *, invocation_context, event):
+            self.events += 1
+            return None
+
+        async def before_agent_callback(self, *, agent, callback_context):
+            self.started[(agent.name, callback_context.invocation_id)] = time.perf_counter()
+            return None
+
+        async def after_agent_callback(self, *, agent, callback_context):
+            started = self.started.pop((agent.name, callback_context.invocation_id), None)
+            if started is not None:
+                self.samples[agent.name].append(time.perf_counter() - started)
+            return None
+
+    plugin = BenchmarkPlugin()
+    pipeline.register_plugin(plugin)
+
+    wall_times = []
+    outputs = {}
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        outputs = asyncio.run(pipeline.run(store))
+        wall_times.append(time.perf_counter() - started)
+
+    total_wall = sum(wall_times)
+    return {
+        "benchmark": "archgov",
+        "version": git_version(),
+        "mode": args.mode,
+        "apps": len(apps),
+        "repeat": args.repeat,
+        "import_seconds": round(import_seconds, 3),
+        "build_seconds": round(build_seconds, 3),
+        "wall_seconds": [round(w, 3) for w in wall_times],
+        "stage_latency_seconds": stage_latencies(plugin.samples),
+        "events": plugin.events,
+        "events_per_sec": round(plugin.events / total_wall, 1) if total_wall else 0.0,
+        "non_compliant": sum(not r["isCompliant"] for r in outputs.get("compliance_results", [])),
+        "risks": len(outputs.get("risks", [])),
+        "recommendations": len(outputs.get("recommendations", [])),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", default="10", help="Inventory size: 10, 1k, 10k, 100k or a number")
+    parser.add_argument("--mode", choices=["sequential", "streaming"], default="sequential")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--tokens-per-sec", type=float, default=0)
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    with stub_server(args.latency_ms, args.jitter_ms, args.tokens_per_sec) as base_url:
+        result = run(args, base_url)
+        stats = stub_stats(base_url)
+    result.update({
+        "llm_requests": stats["requests"],
+        "tokens_in": stats["tokens_in"],
+        "tokens_out": stats["tokens_out"],
+        "stub": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "tokens_per_sec": args.tokens_per_sec},
+    })
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Memory and scan throughput of the columnar CmdbStore against the previous
+list-of-dicts store it replaced (DictCmdbStore, kept in dict_cmdb_store.py).
+
+Each layout and size is loaded from the same CSV export in a fresh process,
+which reports:
+
+  memory       resident memory added by the loaded store (MB, and MB per 100k apps)
+  rule_engine  ComplianceRuleEngine.violation_masks() over the store's columns;
+               the dict store has to encode its records first, as evaluate() does
+  evaluate     ComplianceRuleEngine.evaluate() including result objects
+  filter_scan  count of 'uat' + 'PCI' applications with more than 10,000 users
+  query        one 50-item page of query(deployment='uat', compliance='PCI')
+  lookup       get_by_name() for 1,000 random applications
+
+Usage:
+    python benchmarks/bench_cmdb_columnar.py --rows 100000 1000000 --output cmdb_columnar.json
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from harness import REPO_ROOT, current_rss_mb, emit, git_version, peak_rss_mb
+from synthetic_cmdb import generate_apps
+
+from cmdb_connectors import CANONICAL_FIELDS
+
+LAYOUTS = ("dict", "columnar")
+
+
+def write_csv(directory: str, rows: int) -> str:
+    # Same file name as bench_cmdb_load.py, so either benchmark reuses the other's export
+    path = os.path.join(directory, f"cmdb_{rows}.csv")
+    if not os.path.exists(path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CANONICAL_FIELDS)
+            writer.writerows(
+                [a[c] if c != "compliance" else ";".join(a[c]) for c in CANONICAL_FIELDS] for a in generate_apps(rows)
+            )
+    return path
+
+
+def timed(run: Callable[[], Any], repeats: int) -> float:
+    """
+    Best of `repeats` runs, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(source: str, layout: str, repeats: int) -> Dict[str, Any]:
+    """
+    Runs in the child process: loads `source` into one store layout and scans it.
+    """
+    sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceA2A"))
+    from cmdb_store import CmdbStore
+    from dict_cmdb_store import DictCmdbStore
+    from rule_engine import ComplianceRuleEngine, build_columns
+
+    engine = ComplianceRuleEngine()
+    gc.collect()
+    baseline = current_rss_mb()
+    started = time.perf_counter()
+    store = (CmdbStore if layout == "columnar" else DictCmdbStore).from_source(source)
+    load_seconds = time.perf_counter() - started
+    gc.collect()
+    memory_mb = current_rss_mb() - baseline
+    rows = len(store)
+
+    if layout == "columnar":
+        def columns():
+            return store.columns()
+
+        def filter_scan():
+            c = store.columns()
+            return int(np.count_nonzero(c.env_in("uat") & c.has_tag("PCI") & (c.users > 10000)))
+    else:
+        def columns():
+            return build_columns(store)
+
+        def filter_scan():
+            return sum(1 for r in store if r["deployment"] == "uat" and "PCI" in r["compliance"] and r["users"] > 10000)
+
+    names = random.Random(7).sample(store.names(), min(1000, rows))
+    scans = {
+        "rule_engine": timed(lambda: engine.violation_masks(columns()), repeats),
+        "evaluate": timed(lambda: engine.evaluate(store), 1),
+        "filter_scan": timed(filter_scan, repeats),
+        "query": timed(lambda: store.query(deployment="uat", compliance="PCI", limit=50), repeats),
+    }
+    lookup_seconds = timed(lambda: [store.get_by_name(name) for name in names], repeats)
+    return {
+        "rows": rows,
+        "load_seconds": round(load_seconds, 3),
+        "memory_mb": round(memory_mb, 1),
+        "mb_per_100k_apps": round(memory_mb * 100_000 / rows, 1) if rows else 0,
+        "bytes_per_app": round(memory_mb * 1024 * 1024 / rows) if rows else 0,
+        "scan_seconds": {name: round(seconds, 5) for name, seconds in scans.items()},
+        "scan_apps_per_sec": {
+            name: round(rows / seconds) for name, seconds in scans.items() if name != "query" and seconds
+        },
+        "lookup_us": round(lookup_seconds / max(1, len(names)) * 1e6, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "archgov_cmdb_bench"))
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    parser.add_argument("--measure", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--layout", default="columnar", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.layout, args.repeats)))
+        return
+
+    os.makedirs(args.dir, exist_ok=True)
+    results = []
+    for rows in args.rows:
+        path = write_csv(args.dir, rows)
+        cells = {}
+        for layout in args.layouts:
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", path, "--layout", layout, "--repeats", str(args.repeats)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            cells[layout] = json.loads(output.strip().splitlines()[-1])
+            print(json.dumps({"layout": layout, **cells[layout]}), file=sys.stderr)
+        cell = {"rows": rows, **cells}
+        if "dict" in cells and "columnar" in cells:
+            dict_cell, columnar_cell = cells["dict"], cells["columnar"]
+            cell["memory_ratio"] = round(dict_cell["memory_mb"] / max(columnar_cell["memory_mb"], 0.1), 1)
+            cell["scan_speedup"] = {
+                name: round(dict_cell["scan_seconds"][name] / max(seconds, 1e-6), 1)
+                for name, seconds in columnar_cell["scan_seconds"].items()
+            }
+        results.append(cell)
+
+    emit({
+        "benchmark": "cmdb_columnar",
+        "version": git_version(),
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
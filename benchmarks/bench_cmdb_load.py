@@ -0,0 +1,140 @@
+"""
+Load time and peak memory of the shared CMDB connectors (cmdb_connectors/)
+for each source format, with all columns and with a projection.
+
+Writes a synthetic inventory as CSV, JSON Lines, SQLite and (with pyarrow)
+Parquet once, then measures each cell in a fresh process:
+
+  stream  iterate the batches without keeping them (parser memory only)
+  load    load_records() into a list
+  store   CmdbStore.from_source(), as ArchGov.py does with ARCHGOV_CMDB_SOURCE
+
+Usage:
+    python benchmarks/bench_cmdb_load.py --rows 1000000 --output cmdb_load.json
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from harness import REPO_ROOT, emit, git_version, peak_rss_mb
+from synthetic_cmdb import generate_apps
+
+from cmdb_connectors import CANONICAL_FIELDS, PARQUET_AVAILABLE, iter_batches, load_records
+
+PROJECTION = ["id", "name", "deployment", "compliance"]
+
+
+def write_sources(directory: str, rows: int) -> Dict[str, str]:
+    """
+    Writes the inventory in every format (reused when already present).
+    """
+    paths = {
+        "csv": os.path.join(directory, f"cmdb_{rows}.csv"),
+        "jsonl": os.path.join(directory, f"cmdb_{rows}.jsonl"),
+        "sqlite": os.path.join(directory, f"cmdb_{rows}.sqlite"),
+    }
+    if PARQUET_AVAILABLE:
+        paths["parquet"] = os.path.join(directory, f"cmdb_{rows}.parquet")
+    if all(os.path.exists(p) for p in paths.values()):
+        return paths
+
+    apps = generate_apps(rows)
+    with open(paths["csv"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CANONICAL_FIELDS)
+        writer.writerows([a[c] if c != "compliance" else ";".join(a[c]) for c in CANONICAL_FIELDS] for a in apps)
+    with open(paths["jsonl"], "w") as f:
+        f.writelines(json.dumps(a, separators=(",", ":")) + "\n" for a in apps)
+    if os.path.exists(paths["sqlite"]):
+        os.remove(paths["sqlite"])
+    conn = sqlite3.connect(paths["sqlite"])
+    conn.execute(f"CREATE TABLE applications ({', '.join(CANONICAL_FIELDS)})")
+    conn.executemany(
+        f"INSERT INTO applications VALUES ({', '.join('?' * len(CANONICAL_FIELDS))})",
+        ([json.dumps(a[c]) if c == "compliance" else a[c] for c in CANONICAL_FIELDS] for a in apps),
+    )
+    conn.commit()
+    conn.close()
+    if PARQUET_AVAILABLE:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(apps)
+        pq.write_table(table, paths["parquet"], row_group_size=100_000)
+    return paths
+
+
+def measure(source: str, mode: str, columns: List[str]) -> Dict[str, Any]:
+    """
+    Runs in the child process: one load of `source`.
+    """
+    started = time.perf_counter()
+    if mode == "stream":
+        rows = sum(len(batch) for batch in iter_batches(source, columns or None))
+    elif mode == "load":
+        rows = len(load_records(source, columns or None))
+    else:
+        sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceA2A"))
+        from cmdb_store import CmdbStore
+
+        rows = len(CmdbStore.from_source(source, columns or None))
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds else 0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "archgov_cmdb_bench"))
+    parser.add_argument("--modes", nargs="+", default=["stream", "load", "store"], choices=["stream", "load", "store"])
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    parser.add_argument("--measure", default="", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="load", help=argparse.SUPPRESS)
+    parser.add_argument("--columns", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        columns = [c for c in args.columns.split(",") if c]
+        print(json.dumps(measure(args.measure, args.mode, columns)))
+        return
+
+    os.makedirs(args.dir, exist_ok=True)
+    started = time.perf_counter()
+    paths = write_sources(args.dir, args.rows)
+    results = []
+    for fmt, path in paths.items():
+        for mode in args.modes:
+            # The store indexes every field, so it is only measured with all columns
+            for columns in ([], PROJECTION) if mode != "store" else ([],):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", path, "--mode", mode, "--columns", ",".join(columns)],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                cell = {"format": fmt, "mode": mode, "columns": columns or "all", **json.loads(output.strip().splitlines()[-1])}
+                print(json.dumps(cell), file=sys.stderr)
+                results.append(cell)
+
+    emit({
+        "benchmark": "cmdb_load",
+        "version": git_version(),
+        "rows": args.rows,
+        "file_bytes": {fmt: os.path.getsize(path) for fmt, path in paths.items()},
+        "setup_seconds": round(time.perf_counter() - started, 1),
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
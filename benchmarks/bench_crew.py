@@ -0,0 +1,127 @@
+"""
+Benchmarks the CrewAI pipeline in architecture_governance.py against the local
+stub LLM server (native Ollama API, or the OpenAI-compatible endpoint with --backend openai).
+
+Usage:
+    python benchmarks/bench_crew.py --apps 1k --latency-ms 200 --output result.json
+
+With --process dag (default) the workflow runs as the TaskGraph from build_graph()
+and stage latencies are per agent turn; --process sequential runs build_crew().
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+from harness import REPO_ROOT, emit, git_version, peak_rss_mb, stage_latencies, stub_server, stub_stats
+from synthetic_cmdb import SIZES, generate_apps, to_crew_schema
+
+
+def run(args: argparse.Namespace, base_url: str) -> dict:
+    sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceCrew"))
+    os.environ["CREW_LLM_BACKEND"] = args.backend
+    os.environ["OLLAMA_HOST"] = base_url
+
+    import_started = time.perf_counter()
+    import architecture_governance
+    import_seconds = time.perf_counter() - import_started
+
+    # build_llm() reads OPENAI_API_BASE (defaulted to local Ollama); redirect it to the stub
+    os.environ["OPENAI_API_BASE"] = base_url + "/v1"
+    architecture_governance.cmdb_data = to_crew_schema(generate_apps(SIZES.get(args.apps) or int(args.apps)))
+
+    samples = defaultdict(list)
+    counters = {"events": 0}
+    last_mark = [0.0]
+
+    def on_step(_step):
+        counters["events"] += 1
+
+    def on_task(output):
+        # Tasks run sequentially, so the gap between completions is the task's latency
+        now = time.perf_counter()
+        samples[str(getattr(output, "agent", "task")).strip()].append(now - last_mark[0])
+        last_mark[0] = now
+        counters["events"] += 1
+
+    wall_times = []
+    controllers = []
+    structured_stats = []
+    for _ in range(args.repeat):
+        llm = architecture_governance.build_llm()
+        structured = architecture_governance.structured_outputs(llm) if architecture_governance.STRUCTURED_OUTPUT else None
+        if structured is not None:
+            structured_stats.append(structured.counters)
+        if args.process == "dag":
+            graph = architecture_governance.build_graph(llm, persona_mode=args.persona_mode, structured=structured)
+            started = time.perf_counter()
+            graph.run(max_workers=args.workers)
+            wall_times.append(time.perf_counter() - started)
+            for name, timing in graph.timings.items():
+                samples[name].extend(timing["items"])
+                counters["events"] += len(timing["items"])
+            continue
+        from delegation import DelegationController
+
+        controller = DelegationController()
+        controllers.append(controller)
+        crew = architecture_governance.build_crew(
+            llm, persona_mode=args.persona_mode, controller=controller, structured=structured
+        )
+        crew.step_callback = on_step
+        crew.task_callback = on_task
+        started = last_mark[0] = time.perf_counter()
+        crew.kickoff()
+        wall_times.append(time.perf_counter() - started)
+
+    total_wall = sum(wall_times)
+    return {
+        "benchmark": "crew",
+        "version": git_version(),
+        "apps": len(architecture_governance.cmdb_data),
+        "repeat": args.repeat,
+        "import_seconds": round(import_seconds, 3),
+        "wall_seconds": [round(w, 3) for w in wall_times],
+        "stage_latency_seconds": stage_latencies(samples),
+        "events": counters["events"],
+        "events_per_sec": round(counters["events"] / total_wall, 1) if total_wall else 0.0,
+        "backend": args.backend,
+        "persona_mode": args.persona_mode,
+        "process": args.process,
+        **({"workers": args.workers} if args.process == "dag" else {}),
+        **({"delegation": [c.summary() for c in controllers]} if controllers else {}),
+        **({"structured_output": structured_stats} if structured_stats else {}),
+        **({"ollama": architecture_governance.ollama_client().stats()} if args.backend == "ollama" else {}),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", default="10", help="Inventory size: 10, 1k, 10k, 100k or a number")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--backend", choices=["ollama", "openai"], default="ollama")
+    parser.add_argument("--persona-mode", choices=["full", "compressed"], default="full")
+    parser.add_argument("--process", choices=["dag", "sequential"], default="dag")
+    parser.add_argument("--workers", type=int, default=8, help="Worker threads for --process dag")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--tokens-per-sec", type=float, default=0)
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    with stub_server(args.latency_ms, args.jitter_ms, args.tokens_per_sec) as base_url:
+        result = run(args, base_url)
+        stats = stub_stats(base_url)
+    result.update({
+        "llm_requests": stats["requests"],
+        "tokens_in": stats["tokens_in"],
+        "tokens_out": stats["tokens_out"],
+        "stub": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "tokens_per_sec": args.tokens_per_sec},
+    })
+    emit(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Measures prompt prefill for the Crew agents with full vs compressed personas:
+prefill (prompt_eval) tokens and time-to-first-token per LLM turn.
+
+Each agent runs a short ReAct-style loop the way CrewAI drives it: a fixed
+system message (persona, tools, format) and a user message that grows with
+every step. Ollama re-evaluates only the prompt suffix that differs from its
+cached prompt, so a stable system prefix is paid for once per agent.
+The 'varying' mode puts a per-call header in front of the persona (as a
+timestamp or request id would), which defeats the prompt cache.
+
+Usage:
+    python benchmarks/bench_crew_prompts.py                        # local stub emulating Ollama
+    python benchmarks/bench_crew_prompts.py --url http://localhost:11434 --model llama3:latest
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+from harness import REPO_ROOT, emit, git_version, percentiles, stub_server
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceCrew"))
+from personas import PERSONAS, system_prefix  # noqa: E402
+
+# Stand-in for the tool and output-format instructions CrewAI appends to the system message
+FORMAT_INSTRUCTIONS = """
+You ONLY have access to the tools listed in your task. Use the following format:
+
+Thought: you should always think about what to do
+Action: the action to take
+Action Input: the input to the action, just a simple JSON object
+Observation: the result of the action
+
+Once all necessary information is gathered:
+
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+"""
+
+TASK = "Current Task: Analyze the architecture data and report your findings as JSON.\n\nBegin! This is VERY important to you, use the tools available and give your best Final Answer."
+
+
+def chat(url: str, model: str, messages: List[Dict[str, str]], keep_alive: str) -> Dict[str, float]:
+    """
+    Streams one /api/chat call and returns TTFT, prefill tokens/time and the reply.
+    """
+    body = json.dumps({"model": model, "messages": messages, "stream": True, "keep_alive": keep_alive,
+                       "options": {"temperature": 0, "num_predict": 64}}).encode()
+    request = urllib.request.Request(url + "/api/chat", data=body, headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    ttft, text, final = None, [], {}
+    with urllib.request.urlopen(request) as response:
+        for line in response:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            content = chunk.get("message", {}).get("content", "")
+            if content and ttft is None:
+                ttft = time.perf_counter() - started
+            text.append(content)
+            if chunk.get("done"):
+                final = chunk
+    return {
+        "ttft": ttft if ttft is not None else time.perf_counter() - started,
+        "prompt_eval_count": final.get("prompt_eval_count", 0),
+        "prompt_eval_seconds": final.get("prompt_eval_duration", 0) / 1e9,
+        "reply": "".join(text),
+    }
+
+
+def run_mode(url: str, model: str, mode: str, turns: int, keep_alive: str) -> Dict:
+    persona_mode = "full" if mode == "varying" else mode
+    ttfts, prefill_tokens, prefill_seconds, first_turn_tokens = [], 0, 0.0, []
+    system_chars = 0
+    for call, key in enumerate(PERSONAS):
+        system = system_prefix(key, persona_mode) + FORMAT_INSTRUCTIONS
+        system_chars += len(system)
+        scratchpad = ""
+        for turn in range(turns):
+            header = f"Request {time.time_ns()}\n" if mode == "varying" else ""
+            messages = [
+                {"role": "system", "content": header + system},
+                {"role": "user", "content": TASK + scratchpad},
+            ]
+            result = chat(url, model, messages, keep_alive)
+            ttfts.append(result["ttft"])
+            prefill_tokens += result["prompt_eval_count"]
+            prefill_seconds += result["prompt_eval_seconds"]
+            if turn == 0:
+                first_turn_tokens.append(result["prompt_eval_count"])
+            # CrewAI appends each step to the prompt as Thought/Action/Observation text
+            scratchpad += f"\n{result['reply'][:200]}\nObservation: tool output for step {turn + 1}\n"
+    return {
+        "mode": mode,
+        "llm_calls": len(ttfts),
+        "system_prompt_chars": system_chars,
+        "prefill_tokens": prefill_tokens,
+        "prefill_tokens_first_turn": sum(first_turn_tokens),
+        "prefill_seconds": round(prefill_seconds, 3),
+        "ttft_seconds": percentiles(ttfts),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="", help="Ollama base URL (default: start the stub server)")
+    parser.add_argument("--model", default="llama3:latest")
+    parser.add_argument("--modes", nargs="+", choices=["varying", "full", "compressed"],
+                        default=["varying", "full", "compressed"])
+    parser.add_argument("--turns", type=int, default=3, help="LLM turns per agent")
+    parser.add_argument("--keep-alive", default="30m")
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=400,
+                        help="Stub only: prompt evaluation rate (llama3 8B on CPU is roughly 50-400)")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    def run_all(url: str) -> List[Dict]:
+        return [run_mode(url, args.model, mode, args.turns, args.keep_alive) for mode in args.modes]
+
+    if args.url:
+        results = run_all(args.url.rstrip("/"))
+    else:
+        with stub_server(latency_ms=5, tokens_per_sec=200,
+                         extra_args=["--prefill-tokens-per-sec", str(args.prefill_tokens_per_sec)]) as url:
+            results = run_all(url)
+    emit({
+        "benchmark": "crew_prompts",
+        "version": git_version(),
+        "server": args.url or f"stub (prefill {args.prefill_tokens_per_sec} tok/s)",
+        "model": args.model,
+        "turns_per_agent": args.turns,
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares Ollama call strategies for the Crew backend (ArchitectureGovernanceCrew/ollama_client.py):
+
+  cold    a new HTTP client per call and keep_alive=0, so every call reconnects
+          and reloads the model (the worst case of default client settings)
+  pooled  one persistent pooled client, keep_alive=30m and a pre-warm at startup
+
+Reports wall time, per-call latency, model load vs. generation time and the
+number of TCP connections the server saw.
+
+Usage:
+    python benchmarks/bench_ollama.py                     # starts a mock Ollama on port 11434
+    python benchmarks/bench_ollama.py --url http://localhost:11434 --model llama3:latest
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+from harness import REPO_ROOT, emit, git_version, percentiles, stub_server, stub_stats
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceCrew"))
+from ollama_client import OllamaClient  # noqa: E402
+from personas import PERSONAS, system_prefix  # noqa: E402
+
+
+def agent_messages(key: str, step: int) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prefix(key)},
+        {"role": "user", "content": f"Step {step}: review the architecture data and answer with JSON."},
+    ]
+
+
+def run_scenario(url: str, model: str, scenario: str, calls: int, num_predict: int) -> Dict:
+    options = {"temperature": 0, "num_predict": num_predict}
+    agents = list(PERSONAS)
+    latencies = []
+    started = time.perf_counter()
+    if scenario == "cold":
+        totals = OllamaClient(url, keep_alive=0)
+        for i in range(calls):
+            client = OllamaClient(url, keep_alive=0)
+            t = time.perf_counter()
+            response = client.chat(model, agent_messages(agents[i % len(agents)], i), options)
+            latencies.append(time.perf_counter() - t)
+            totals._record(response, latencies[-1])
+            client.close()
+        stats = totals.stats()
+        totals.close()
+        prewarm = 0.0
+    else:
+        client = OllamaClient(url, keep_alive="30m")
+        prewarm = client.prewarm(model)
+        for i in range(calls):
+            t = time.perf_counter()
+            client.chat(model, agent_messages(agents[i % len(agents)], i), options)
+            latencies.append(time.perf_counter() - t)
+        stats = client.stats()
+        client.close()
+    return {
+        "scenario": scenario,
+        "calls": calls,
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "prewarm_seconds": round(prewarm, 3),
+        "call_latency_seconds": percentiles(latencies),
+        "ollama": stats,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="", help="Ollama base URL (default: start a mock Ollama)")
+    parser.add_argument("--port", type=int, default=11434, help="Port for the mock Ollama")
+    parser.add_argument("--model", default="llama3:latest")
+    parser.add_argument("--calls", type=int, default=15)
+    parser.add_argument("--num-predict", type=int, default=64)
+    parser.add_argument("--load-ms", type=float, default=2000, help="Mock only: model load time")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    if args.url:
+        results = [run_scenario(args.url, args.model, s, args.calls, args.num_predict) for s in ("cold", "pooled")]
+        server = args.url
+    else:
+        results = []
+        for scenario in ("cold", "pooled"):
+            # A fresh mock per scenario so connection and load counters are separate
+            with stub_server(latency_ms=5, tokens_per_sec=200, port=args.port,
+                             extra_args=["--load-ms", str(args.load_ms), "--prefill-tokens-per-sec", "400"]) as url:
+                result = run_scenario(url, args.model, scenario, args.calls, args.num_predict)
+                stats = stub_stats(url)
+                result["server"] = {"connections": stats["connections"], "model_loads": stats["model_loads"]}
+                results.append(result)
+        server = f"mock on port {args.port} (load {args.load_ms} ms)"
+    emit({"benchmark": "ollama_backend", "version": git_version(), "server": server,
+          "model": args.model, "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Policy retrieval for the Crew's compliance validator
+(ArchitectureGovernanceCrew/policy_index.py) over a synthetic policy corpus of
+`--pages` Markdown pages spread across the compliance standards.
+
+Reports:
+
+  build          chunking + BM25 (+ embeddings with --embed-url) and saving
+  index_mb       size of the saved index on disk
+  load           PolicyIndex.load(): memory-mapping the saved arrays
+  query_ms       search() latency per application (standards + environment)
+  prompt         policy text handed to one compliance turn: the whole corpus
+                 (what get_policy_doc() returned before) vs the top-k clauses,
+                 in characters and ~4-character tokens
+
+Usage:
+    python benchmarks/bench_policy_index.py --pages 500 --output policy_index.json
+    python benchmarks/bench_policy_index.py --pages 500 --embed-url stub   # embeddings from a local stub server
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from harness import REPO_ROOT, current_rss_mb, emit, git_version, percentiles, peak_rss_mb, stub_server
+from synthetic_cmdb import ENVIRONMENTS, STANDARDS, generate_apps
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceCrew"))
+from policy_index import PolicyIndex, format_clauses, open_index  # noqa: E402
+from ollama_client import OllamaClient  # noqa: E402
+from cmdb_connectors import DEFAULT_POLICY_PATH, load_policy  # noqa: E402
+
+TOPICS = [
+    "encryption", "key management", "access control", "logging", "monitoring", "incident response",
+    "vulnerability scanning", "patching", "backup", "retention", "data residency", "vendor management",
+    "change management", "network segmentation", "authentication", "secrets", "deployment", "availability",
+]
+WORDS = (
+    "application data service environment control review quarterly annual owner team record evidence audit "
+    "production sandbox staging approval exception risk register ticket customer personal cardholder storage "
+    "transit rest algorithm rotation privileged account session token alert threshold retention period restore "
+    "test documented approved independent third party region replica failover recovery objective"
+).split()
+
+
+def generate_corpus(directory: str, pages: int, seed: int = 11) -> List[str]:
+    """
+    Writes `pages` Markdown pages (~500 words each), one standard per page, and
+    returns their paths.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for page in range(pages):
+        standard = STANDARDS[page % len(STANDARDS)]
+        topic = TOPICS[rng.randrange(len(TOPICS))]
+        lines = [f"# {standard} {topic} standard, part {page // len(STANDARDS) + 1}", ""]
+        for section in range(1, 5):
+            lines += [f"## {section}. {topic.capitalize()} {rng.choice(WORDS)}", ""]
+            for clause in range(1, 5):
+                env = rng.choice(ENVIRONMENTS)
+                body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(18, 40)))
+                lines.append(f"{section}.{clause} Applications in {env} must {topic} {body}.")
+            lines.append("")
+        path = os.path.join(directory, f"{standard.lower()}_{page:04d}.md")
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+        paths.append(path)
+    return paths
+
+
+def app_query(app) -> Tuple[str, List[str]]:
+    return f"deployed in {app['deployment']} environment {' '.join(app['compliance'])}", app["compliance"]
+
+
+def directory_mb(directory: str) -> float:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+
+
+def run(args, embed_url: str) -> dict:
+    workdir = tempfile.mkdtemp(prefix="policy_index_")
+    try:
+        corpus_dir = os.path.join(workdir, "corpus")
+        index_dir = os.path.join(workdir, "index")
+        os.makedirs(corpus_dir)
+        files = generate_corpus(corpus_dir, args.pages)
+        full_corpus = "\n\n".join(open(path).read() for path in files)
+        policy = load_policy(DEFAULT_POLICY_PATH)
+
+        client = OllamaClient(embed_url) if embed_url else None
+        embedder = (lambda texts: client.embed(args.embed_model, texts)) if client else None
+
+        started = time.perf_counter()
+        open_index(index_dir, policy, DEFAULT_POLICY_PATH, [corpus_dir], embedder=embedder, embed_model=args.embed_model)
+        build_seconds = time.perf_counter() - started
+
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        index = PolicyIndex.load(index_dir)
+        load_seconds = time.perf_counter() - started
+        rss_after = current_rss_mb()
+
+        apps = [app for app in generate_apps(args.apps * 4) if app["compliance"]][:args.apps]
+        latencies, chars = [], []
+        for app in apps:
+            query, standards = app_query(app)
+            started = time.perf_counter()
+            vector = embedder([query])[0] if embedder else None
+            clauses = index.search(query, standards, args.top_k, query_vector=vector)
+            latencies.append((time.perf_counter() - started) * 1000)
+            chars.append(len(format_clauses(clauses)))
+        mean_chars = sum(chars) / len(chars) if chars else 0.0
+        return {
+            "chunks": len(index),
+            "terms": len(index.meta["vocab"]),
+            "embeddings": embedder is not None,
+            "seconds": {"build": round(build_seconds, 4), "load": round(load_seconds, 4)},
+            "index_mb": round(directory_mb(index_dir), 2),
+            "load_rss_mb": round(rss_after - rss_before, 2) if rss_before is not None and rss_after is not None else None,
+            "query_ms": percentiles(latencies),
+            "prompt": {
+                "full_corpus_chars": len(full_corpus),
+                "full_corpus_tokens": len(full_corpus) // 4,
+                "top_k_chars": round(mean_chars),
+                "top_k_tokens": round(mean_chars / 4),
+                "reduction": round(len(full_corpus) / mean_chars, 1) if mean_chars else None,
+            },
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--apps", type=int, default=1_000, help="Applications queried")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--embed-url", default="", help="Ollama URL for /api/embed, or 'stub' to start a local stub server")
+    parser.add_argument("--embed-model", default="nomic-embed-text")
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    if args.embed_url == "stub":
+        with stub_server() as url:
+            result = run(args, url)
+    else:
+        result = run(args, args.embed_url)
+    emit({
+        "benchmark": "policy_index",
+        "version": git_version(),
+        "pages": args.pages,
+        "apps": args.apps,
+        "top_k": args.top_k,
+        **result,
+        "peak_rss_mb": peak_rss_mb(),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
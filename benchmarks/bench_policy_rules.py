@@ -0,0 +1,135 @@
+"""
+Rule evaluation over the policy DSL (cmdb_connectors/policy.py) compiled by
+ArchitectureGovernanceA2A/rule_engine.py: 1M applications x 100 rules by default.
+
+Generates a seeded policy of `--rules` rules over the synthetic inventory's
+standards and environments, then reports:
+
+  compile        parse_policy() + compile_policy()
+  masks          violation_masks() for every rule over a fresh column view;
+                 rules sharing a condition reuse its memoized mask
+  masks_unshared the same with one column view per rule (no reuse)
+  evaluate       ComplianceRuleEngine.evaluate(), including result objects
+  interpreted    the same rules checked record by record in Python, on a sample,
+                 as a reference for what compiling buys
+
+Usage:
+    python benchmarks/bench_policy_rules.py --apps 1000000 --rules 100 --output policy_rules.json
+"""
+import argparse
+import operator
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from harness import REPO_ROOT, emit, git_version, peak_rss_mb
+from synthetic_cmdb import ENVIRONMENTS, STANDARDS, generate_apps
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "ArchitectureGovernanceA2A"))
+from cmdb_store import CmdbStore  # noqa: E402  (also puts cmdb_connectors on the path)
+from cmdb_connectors import parse_policy  # noqa: E402
+from rule_engine import ComplianceRuleEngine, compile_policy  # noqa: E402
+
+THRESHOLDS = [100, 1_000, 10_000, 100_000]
+OPERATORS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def generate_policy(rules: int, seed: int = 7) -> Dict[str, Any]:
+    """
+    A policy document with `rules` rules: half forbid environments, a quarter
+    bound the user count in some environments and a quarter bound it anywhere.
+    """
+    rng = random.Random(seed)
+    document: Dict[str, Any] = {"standards": {s: {"requirements": []} for s in STANDARDS}, "rules": []}
+    for i in range(rules):
+        forbid: Dict[str, Any] = {}
+        kind = i % 4
+        if kind in (0, 1, 2):
+            forbid["deployment"] = rng.sample(ENVIRONMENTS, rng.randint(1, 2))
+        if kind in (2, 3):
+            forbid["users"] = {rng.choice(list(OPERATORS)): rng.choice(THRESHOLDS)}
+        document["rules"].append({"id": f"rule_{i + 1}", "standard": rng.choice(STANDARDS), "forbid": forbid})
+    return document
+
+
+def interpret(document: Dict[str, Any], apps: List[Dict[str, Any]]) -> int:
+    """
+    Record-at-a-time evaluation of the policy document, without compiling it.
+    """
+    violations = 0
+    for app in apps:
+        for rule in document["rules"]:
+            if rule["standard"] not in app["compliance"]:
+                continue
+            forbid = rule["forbid"]
+            if "deployment" in forbid and app["deployment"] not in forbid["deployment"]:
+                continue
+            if all(OPERATORS[op](app["users"], value) for op, value in forbid.get("users", {}).items()):
+                violations += 1
+    return violations
+
+
+def timed(run, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=1_000_000)
+    parser.add_argument("--rules", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--sample", type=int, default=20_000, help="Applications checked by the interpreted reference")
+    parser.add_argument("--skip-evaluate", action="store_true", help="Skip the evaluate() measurement")
+    parser.add_argument("--output", default="", help="Also write the JSON result to this file")
+    args = parser.parse_args()
+
+    apps = generate_apps(args.apps)
+    store = CmdbStore(apps)
+    sample = apps[:args.sample]
+    del apps
+    document = generate_policy(args.rules)
+
+    started = time.perf_counter()
+    engine = ComplianceRuleEngine(compile_policy(parse_policy(document)))
+    compile_seconds = time.perf_counter() - started
+
+    masks = engine.violation_masks(store.columns())
+    violations = int(sum(mask.sum() for mask in masks.values()))
+    seconds = {
+        "compile": compile_seconds,
+        "masks": timed(lambda: engine.violation_masks(store.columns()), args.repeats),
+        "masks_unshared": timed(lambda: [rule.predicate(store.columns()) for rule in engine.rules], args.repeats),
+    }
+    if not args.skip_evaluate:
+        seconds["evaluate"] = timed(lambda: engine.evaluate(store), 1)
+    interpreted_seconds = timed(lambda: interpret(document, sample), 1)
+
+    checks = args.apps * args.rules
+    emit({
+        "benchmark": "policy_rules",
+        "version": git_version(),
+        "apps": args.apps,
+        "rules": args.rules,
+        "violations": violations,
+        "seconds": {name: round(value, 4) for name, value in seconds.items()},
+        "rule_checks_per_sec": {
+            name: round(checks / value) for name, value in seconds.items() if name != "compile" and value
+        },
+        "interpreted": {
+            "apps": len(sample),
+            "seconds": round(interpreted_seconds, 4),
+            "rule_checks_per_sec": round(len(sample) * args.rules / interpreted_seconds) if interpreted_seconds else 0,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+List-of-dicts CMDB store that the columnar CmdbStore replaced, used as the
+baseline in bench_cmdb_columnar.py.
+"""
+import gc
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cmdb_connectors import iter_batches
+
+
+def _normalize(value: Any) -> str:
+    return str(value).lower().strip()
+
+
+class DictCmdbStore:
+    """
+    The previous list-of-dicts CMDB with precomputed hash indexes, kept as
+    the baseline for bench_cmdb_columnar.py. Same API as CmdbStore
+    (ArchitectureGovernanceA2A/cmdb_store.py), with single-valued filters.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        self._records: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_owner: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_deployment: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_compliance: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_source(cls, source: str, columns: Optional[Sequence[str]] = None, **options: Any) -> "DictCmdbStore":
+        store = cls()
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for batch in iter_batches(source, columns, **options):
+                for record in batch:
+                    if record.get("id") is None:
+                        record["id"] = len(store._records) + 1
+                    store.add(record)
+        finally:
+            if was_enabled:
+                gc.enable()
+        return store
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Adds a record and updates every index.
+        """
+        self._records.append(record)
+        self._by_name[_normalize(record["name"])] = record
+        self._by_id[int(record["id"])] = record
+        self._by_owner[_normalize(record.get("owner", ""))].append(record)
+        self._by_deployment[_normalize(record.get("deployment", ""))].append(record)
+        for tag in record.get("compliance", []):
+            self._by_compliance[_normalize(tag)].append(record)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._records)
+
+    def names(self, limit: Optional[int] = None) -> List[str]:
+        return [record["name"] for record in self._records[:limit]]
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get(_normalize(name))
+
+    def get_by_id(self, app_id: int) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(int(app_id))
+
+    def by_owner(self, owner: str) -> List[Dict[str, Any]]:
+        return list(self._by_owner.get(_normalize(owner), []))
+
+    def by_deployment(self, deployment: str) -> List[Dict[str, Any]]:
+        return list(self._by_deployment.get(_normalize(deployment), []))
+
+    def by_compliance(self, tag: str) -> List[Dict[str, Any]]:
+        return list(self._by_compliance.get(_normalize(tag), []))
+
+    def query(
+        self,
+        deployment: str = "",
+        compliance: str = "",
+        owner: str = "",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        candidates = []
+        if deployment:
+            candidates.append(self._by_deployment.get(_normalize(deployment), []))
+        if compliance:
+            candidates.append(self._by_compliance.get(_normalize(compliance), []))
+        if owner:
+            candidates.append(self._by_owner.get(_normalize(owner), []))
+
+        if not candidates:
+            matches = self._records
+        else:
+            candidates.sort(key=len)
+            smallest, rest = candidates[0], candidates[1:]
+            allowed = [{id(r) for r in c} for c in rest]
+            matches = [r for r in smallest if all(id(r) in ids for ids in allowed)]
+
+        end = None if limit is None else offset + limit
+        return matches[offset:end], len(matches)
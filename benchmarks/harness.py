@@ -0,0 +1,117 @@
+"""
+Shared helpers for the benchmark scripts: stub server lifecycle and statistics.
+"""
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+# The pipelines import the shared cmdb_connectors package from the repository root
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def stub_server(latency_ms: float = 0, jitter_ms: float = 0, tokens_per_sec: float = 0,
+                throttle_rate: float = 0, port: int = 0, extra_args: Sequence[str] = ()) -> Iterator[str]:
+    """
+    Runs stub_llm_server.py in a separate process (so it does not count towards
+    the benchmark's RSS) and yields its base URL.
+    """
+    port = port or free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "stub_llm_server.py"), "--port", str(port),
+         "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms),
+         "--tokens-per-sec", str(tokens_per_sec), "--throttle-rate", str(throttle_rate), *extra_args],
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(url + "/stats", timeout=0.2)
+                break
+            except OSError:
+                time.sleep(0.05)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def stub_stats(url: str) -> Dict[str, int]:
+    with urllib.request.urlopen(url + "/stats") as response:
+        return json.load(response)
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+    return {"count": len(ordered), "p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "max": round(ordered[-1], 4)}
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    # Resident memory right now (Linux only), for before/after comparisons
+    return _proc_status_mb("VmRSS")
+
+
+def peak_rss_mb() -> float:
+    # On Linux ru_maxrss survives exec(), so a child started by a large parent
+    # would report the parent's peak; VmHWM belongs to this process image only.
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_version() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "describe", "--always", "--dirty"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def emit(result: Dict, path: str = "") -> None:
+    text = json.dumps(result, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+def stage_latencies(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {stage: percentiles(values) for stage, values in sorted(samples.items())}
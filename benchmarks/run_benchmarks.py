@@ -0,0 +1,91 @@
+"""
+Runs the benchmark matrix (pipeline x inventory size) and collects the results
+into one JSON file. Each cell runs in its own process so peak RSS is isolated.
+
+Usage:
+    python benchmarks/run_benchmarks.py --pipelines archgov crew --sizes 10 1k 10k 100k --output results.json
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from harness import BENCH_DIR, emit, git_version
+
+SCRIPTS = {
+    "archgov": ["bench_archgov.py", "--mode", "sequential"],
+    "archgov-streaming": ["bench_archgov.py", "--mode", "streaming"],
+    "crew": ["bench_crew.py"],
+    "crew-sequential": ["bench_crew.py", "--process", "sequential"],
+}
+
+
+def run_cell(pipeline: str, size: str, args: argparse.Namespace) -> dict:
+    script, *extra = SCRIPTS[pipeline]
+    command = [
+        sys.executable, os.path.join(BENCH_DIR, script), *extra, "--apps", size,
+        "--repeat", str(args.repeat), "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms), "--tokens-per-sec", str(args.tokens_per_sec),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=BENCH_DIR)
+    if completed.returncode != 0:
+        return {"benchmark": pipeline, "apps": size, "error": completed.stderr.strip().splitlines()[-1:]}
+    # The pipelines print progress to stdout; the result is the trailing JSON object
+    output = completed.stdout
+    return json.loads(output[output.rindex("\n{") + 1:] if "\n{" in output else output)
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """
+    Prints the relative change in wall time and peak RSS per matrix cell.
+    """
+    def index(path):
+        with open(path) as f:
+            return {(r["benchmark"], r.get("mode", ""), str(r["apps"])): r for r in json.load(f)["results"]}
+
+    old, new = index(old_path), index(new_path)
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        if "error" in before or "error" in after:
+            continue
+        wall_before, wall_after = min(before["wall_seconds"]), min(after["wall_seconds"])
+        print(f"{'/'.join(filter(None, key)):32} wall {wall_before:8.3f}s -> {wall_after:8.3f}s "
+              f"({(wall_after - wall_before) / wall_before:+.1%})  "
+              f"rss {before['peak_rss_mb']:7.1f} -> {after['peak_rss_mb']:7.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", nargs="+", choices=sorted(SCRIPTS), default=["archgov", "crew"])
+    parser.add_argument("--sizes", nargs="+", default=["10", "1k", "10k", "100k"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--tokens-per-sec", type=float, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    started = time.time()
+    results = []
+    for pipeline in args.pipelines:
+        for size in args.sizes:
+            print(f"Running {pipeline} with {size} apps...", file=sys.stderr)
+            results.append(run_cell(pipeline, size, args))
+    emit({
+        "version": git_version(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started)),
+        "python": sys.version.split()[0],
+        "results": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
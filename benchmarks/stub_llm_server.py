@@ -0,0 +1,433 @@
+"""
+Local stub LLM server for testing and benchmarking the pipelines without quota.
+
+Speaks three wire formats on one port:
+  - Gemini:  POST /v1beta/models/<model>:generateContent   (ArchGov.py)
+  - OpenAI:  POST /v1/chat/completions                     (Crew via ChatOpenAI)
+  - Ollama:  POST /api/chat, POST /api/generate            (native Ollama clients)
+
+Replies are synthesized from the prompt so each governance stage receives
+plausible JSON (one risk per non-compliant application, one recommendation
+per risk, a report object, an evaluation object). Latency, jitter, output
+token rate and 429 injection are configurable.
+
+With --load-ms the Ollama and OpenAI endpoints emulate model residency: the
+first request for a model (or the first after its keep_alive expired) pays
+the load time, reported as load_duration; keep_alive is honoured per request
+("5m", seconds, -1 = forever, 0 = unload after the call) and /api/ps lists
+resident models. A request without prompt or messages only loads the model.
+
+With --prefill-tokens-per-sec the Ollama and OpenAI endpoints also emulate
+Ollama's prompt cache: only the part of the prompt that differs from a
+recently evaluated prompt is "prefilled" (and reported as prompt_eval_count),
+so stable system prefixes show up as lower time-to-first-token. Ollama
+requests stream NDJSON unless "stream": false is sent, like the real server.
+
+POST /api/embed returns hashed bag-of-words vectors (texts sharing words are
+close), enough to exercise embedding retrieval without a real model.
+
+An Ollama request whose "format" is a JSON schema (structured outputs) gets a
+minimal instance of that schema as its reply, as grammar-constrained decoding
+would guarantee.
+
+Usage:
+    python benchmarks/stub_llm_server.py --port 8089 --latency-ms 200 --tokens-per-sec 80 --throttle-rate 0.2
+    python benchmarks/stub_llm_server.py --port 11434 --load-ms 3000 --prefill-tokens-per-sec 400   # mock Ollama
+    ARCHGOV_GEMINI_BASE_URL=http://127.0.0.1:8089 python ArchitectureGovernanceA2A/ArchGov.py
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_APP_ID = re.compile(r'\\?"applicationId\\?"\s*:\s*(\d+)')
+
+
+class StubConfig:
+    def __init__(
+        self,
+        reply: Optional[str] = None,
+        throttle_rate: float = 0.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        tokens_per_sec: float = 0.0,
+        seed: int = 0,
+        prefill_tokens_per_sec: float = 0.0,
+        prompt_cache_slots: int = 1,
+        load_ms: float = 0.0,
+    ):
+        self.reply = reply
+        self.throttle_rate = throttle_rate
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.prefill_tokens_per_sec = prefill_tokens_per_sec
+        self.prompt_cache_slots = max(1, prompt_cache_slots)
+        self.load_ms = load_ms
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.prompt_eval_tokens = 0
+        self.model_loads = 0
+        self.connections = 0
+        self._prompt_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._slot_ids = 0
+        self._resident: Dict[str, float] = {}
+
+    def load_model(self, model: str, keep_alive: Any) -> float:
+        """
+        Returns the seconds spent loading `model` (0 when resident) and renews its residency.
+        """
+        now = time.monotonic()
+        with self.lock:
+            loading = self.load_ms > 0 and self._resident.get(model, 0.0) <= now
+            if loading:
+                self.model_loads += 1
+                # A model that is unloaded loses its cached prompts as well
+                for key in [k for k, (m, _) in self._prompt_cache.items() if m == model]:
+                    del self._prompt_cache[key]
+            self._resident[model] = now + parse_keep_alive(keep_alive)
+        return self.load_ms / 1000.0 if loading else 0.0
+
+    def resident_models(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self.lock:
+            return [
+                {"name": model, "model": model, "expires_in": round(expires - now, 1)}
+                for model, expires in self._resident.items() if expires > now
+            ]
+
+    def evaluate_prompt(self, model: str, prompt: str) -> int:
+        """
+        Returns the number of prompt tokens that must be evaluated. Like Ollama,
+        the longest common prefix with a cached prompt slot is reused.
+        """
+        with self.lock:
+            best_key, best = None, 0
+            for key, (cached_model, cached) in self._prompt_cache.items():
+                if cached_model != model:
+                    continue
+                common = len(os.path.commonprefix([cached, prompt]))
+                if common > best:
+                    best_key, best = key, common
+            if best_key is not None:
+                del self._prompt_cache[best_key]
+            elif len(self._prompt_cache) >= self.prompt_cache_slots:
+                # Evict the least recently used slot
+                self._prompt_cache.popitem(last=False)
+            self._slot_ids += 1
+            self._prompt_cache[self._slot_ids] = (model, prompt)
+            evaluated = max(1, count_tokens(prompt) - best // 4)
+            self.prompt_eval_tokens += evaluated
+            return evaluated
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "tokens_in": self.tokens_in,
+                "tokens_out": self.tokens_out,
+                "prompt_eval_tokens": self.prompt_eval_tokens,
+                "model_loads": self.model_loads,
+                "connections": self.connections,
+            }
+
+
+def parse_keep_alive(value: Any) -> float:
+    """
+    Converts an Ollama keep_alive value ("10m", "1h", "30s", seconds, -1) to seconds.
+    """
+    if value is None or value == "":
+        return 300.0
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)(ms|s|m|h)?", str(value).strip())
+    if not match:
+        return 300.0
+    number = float(match.group(1))
+    if number < 0:
+        return float("inf")
+    return number * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+
+
+def count_tokens(text: str) -> int:
+    # Same ~4 characters per token heuristic the pipelines use for budgeting
+    return max(1, len(text) // 4)
+
+
+def synthesize_reply(prompt: str) -> str:
+    """
+    Produces a stage-appropriate JSON answer from the prompt text.
+    """
+    app_ids = list(dict.fromkeys(int(i) for i in _APP_ID.findall(prompt)))
+    if "Risk Assessment Agent" in prompt or "Risk and Impact Assessor" in prompt:
+        return json.dumps([
+            {"applicationId": i, "appName": f"App {i}", "risk": "Regulated data exposed in a non-compliant environment.", "severity": "High"}
+            for i in app_ids
+        ])
+    if "Recommendation Agent" in prompt:
+        return json.dumps([
+            {"applicationId": i, "risk": "Regulated data exposed in a non-compliant environment.",
+             "recommendation": f"Migrate App {i} to a compliant environment.", "priority": "High"}
+            for i in app_ids
+        ])
+    if "Reporting Agent" in prompt:
+        return json.dumps({
+            "summary": f"{len(app_ids)} applications need remediation.",
+            "actionItems": [f"Migrate App {i} to a compliant environment." for i in app_ids],
+        })
+    if "Evaluation Agent" in prompt:
+        return json.dumps({"score": 80, "feedback": "The report covers all high-priority risks."})
+    if "Compliance Explainer Agent" in prompt:
+        return json.dumps([
+            {"applicationId": i, "appName": f"App {i}", "isCompliant": False, "reason": "Explained violation."}
+            for i in app_ids
+        ])
+    return json.dumps([])
+
+
+def schema_instance(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Minimal value that validates against a JSON schema (Pydantic's output:
+    $ref into $defs, anyOf for Optional fields, one item per array).
+    """
+    root = root or schema
+    if "$ref" in schema:
+        return schema_instance(root.get("$defs", {})[schema["$ref"].rsplit("/", 1)[-1]], root)
+    if "anyOf" in schema:
+        return schema_instance(next((s for s in schema["anyOf"] if s.get("type") != "null"), {}), root)
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: schema_instance(field, root) for name, field in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [schema_instance(schema.get("items", {}), root)]
+    return {"string": "stub", "boolean": False, "integer": 1, "number": 1.0}.get(kind, None)
+
+
+def stub_embedding(text: str, dimensions: int = 64) -> List[float]:
+    vector = [0.0] * dimensions
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        vector[zlib.crc32(word.encode()) % dimensions] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _gemini_prompt(request: dict) -> str:
+    parts = []
+    system = request.get("systemInstruction") or request.get("system_instruction") or {}
+    parts.extend(p.get("text", "") for p in system.get("parts", []))
+    for content in request.get("contents", []):
+        parts.extend(p.get("text", "") for p in content.get("parts", []) if isinstance(p, dict))
+    return "\n".join(parts)
+
+
+def _chat_prompt(request: dict) -> str:
+    if "messages" in request:
+        return "\n".join(str(m.get("content", "")) for m in request["messages"])
+    return str(request.get("system", "")) + "\n" + str(request.get("prompt", ""))
+
+
+def make_handler(config: StubConfig):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with config.lock:
+                config.connections += 1
+
+        def _send_json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, config.stats())
+            elif self.path == "/api/ps":
+                self._send_json(200, {"models": config.resident_models()})
+            elif self.path in ("/", "/api/tags", "/api/version"):
+                self._send_json(200, {"models": [{"name": "llama3:latest"}], "version": "stub"})
+            else:
+                self._send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            with config.lock:
+                config.requests += 1
+                throttle = config.random.random() < config.throttle_rate
+                jitter = config.random.uniform(0, config.jitter_ms)
+                if throttle:
+                    config.throttled += 1
+
+            if throttle:
+                self._send_json(429, {"error": {
+                    "code": 429, "message": "Resource has been exhausted (stub).", "status": "RESOURCE_EXHAUSTED",
+                }})
+                return
+
+            load = 0.0
+            if self.path in ("/api/chat", "/api/generate", "/v1/chat/completions"):
+                load = config.load_model(request.get("model", ""), request.get("keep_alive"))
+                if self.path != "/v1/chat/completions" and not request.get("prompt") and not request.get("messages"):
+                    # Load-only request, as sent to pre-warm a model
+                    time.sleep(load)
+                    self._send_json(200, {
+                        "model": request.get("model", "stub"), "done": True, "done_reason": "load",
+                        **({"message": {"role": "assistant", "content": ""}} if self.path == "/api/chat" else {"response": ""}),
+                        "load_duration": int(load * 1e9), "total_duration": int(load * 1e9),
+                    })
+                    return
+
+            if self.path == "/api/embed":
+                inputs = request.get("input", [])
+                inputs = [inputs] if isinstance(inputs, str) else inputs
+                self._send_json(200, {"model": request.get("model", "stub"), "embeddings": [stub_embedding(t) for t in inputs]})
+                return
+
+            if ":generateContent" in self.path:
+                prompt = _gemini_prompt(request)
+            elif self.path in ("/v1/chat/completions", "/api/chat", "/api/generate"):
+                prompt = _chat_prompt(request)
+            else:
+                self._send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}", "status": "NOT_FOUND"}})
+                return
+
+            if config.reply is not None:
+                reply = config.reply
+            elif isinstance(request.get("format"), dict):
+                reply = json.dumps(schema_instance(request["format"]))
+            else:
+                reply = synthesize_reply(prompt)
+            tokens_in, tokens_out = count_tokens(prompt), count_tokens(reply)
+            with config.lock:
+                config.tokens_in += tokens_in
+                config.tokens_out += tokens_out
+
+            prompt_eval = tokens_in
+            if config.prefill_tokens_per_sec and ":generateContent" not in self.path:
+                prompt_eval = config.evaluate_prompt(request.get("model", ""), prompt)
+            prefill = prompt_eval / config.prefill_tokens_per_sec if config.prefill_tokens_per_sec else 0.0
+            generation = tokens_out / config.tokens_per_sec if config.tokens_per_sec else 0.0
+            time.sleep((config.latency_ms + jitter) / 1000.0 + load + prefill)
+
+            if self.path in ("/api/chat", "/api/generate"):
+                self._send_ollama(request, reply, prompt_eval, load, prefill, generation, tokens_out)
+                return
+            time.sleep(generation)
+
+            if ":generateContent" in self.path:
+                self._send_json(200, {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": reply}]},
+                        "finishReason": "STOP",
+                    }],
+                    "usageMetadata": {
+                        "promptTokenCount": tokens_in,
+                        "candidatesTokenCount": tokens_out,
+                        "totalTokenCount": tokens_in + tokens_out,
+                    },
+                })
+            else:
+                # CrewAI agents expect a ReAct-style final answer
+                content = f"Thought: I now can give a great answer\nFinal Answer: {reply}"
+                self._send_json(200, {
+                    "id": "stub", "object": "chat.completion", "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": tokens_in, "completion_tokens": tokens_out,
+                              "total_tokens": tokens_in + tokens_out},
+                })
+
+        def _send_ollama(self, request: dict, reply: str, prompt_eval: int, load: float, prefill: float,
+                         generation: float, tokens_out: int) -> None:
+            chat = self.path == "/api/chat"
+            timing = {
+                "done": True, "done_reason": "stop",
+                "total_duration": int((load + prefill + generation) * 1e9), "load_duration": int(load * 1e9),
+                "prompt_eval_count": prompt_eval, "prompt_eval_duration": int(prefill * 1e9),
+                "eval_count": tokens_out, "eval_duration": int(generation * 1e9),
+            }
+
+            def chunk(text: str, done: bool = False) -> dict:
+                body = {"message": {"role": "assistant", "content": text}} if chat else {"response": text}
+                return {"model": request.get("model", "stub"), **body, **(timing if done else {"done": False})}
+
+            if not request.get("stream", True):
+                time.sleep(generation)
+                self._send_json(200, chunk(reply, done=True))
+                return
+
+            # NDJSON stream: the first piece goes out right after prefill
+            pieces = [reply[i:i + 16] for i in range(0, len(reply), 16)] or [""]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for index, piece in enumerate(pieces):
+                if index:
+                    time.sleep(generation / len(pieces))
+                self._write_chunk(json.dumps(chunk(piece)) + "\n")
+            self._write_chunk(json.dumps(chunk("", done=True)) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, text: str) -> None:
+            data = text.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8089, config: StubConfig = None) -> ThreadingHTTPServer:
+    """
+    Starts the stub server in a background thread and returns it; call shutdown() to stop.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(config or StubConfig()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--reply", default=None, help="Fixed text returned by every call (default: synthesized per stage)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random extra latency")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Simulated output token rate (0 = instant)")
+    parser.add_argument("--prefill-tokens-per-sec", type=float, default=0.0,
+                        help="Simulated prompt evaluation rate with prompt-prefix caching (0 = instant, no caching)")
+    parser.add_argument("--prompt-cache-slots", type=int, default=1, help="Cached prompts kept (Ollama's OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Simulated model load time for non-resident models")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        args.reply, args.throttle_rate, args.latency_ms, args.jitter_ms, args.tokens_per_sec,
+        prefill_tokens_per_sec=args.prefill_tokens_per_sec, prompt_cache_slots=args.prompt_cache_slots,
+        load_ms=args.load_ms,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"Stub LLM server listening on http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,40 @@
+"""
+Deterministic synthetic CMDB inventories for benchmarks.
+"""
+import random
+from typing import Any, Dict, List
+
+ENVIRONMENTS = ["prod", "uat", "sandbox", "qa"]
+STANDARDS = ["PCI", "GDPR", "SOC2"]
+TECHNOLOGIES = ["Java/Spring", "Python/Flask", "Node.js/React", "Go", ".NET"]
+SIZES = {"10": 10, "1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+
+def generate_apps(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Returns `count` applications in the ArchGov.py CMDB schema.
+    Roughly a third of them violate at least one compliance rule.
+    """
+    rng = random.Random(seed)
+    apps = []
+    for i in range(1, count + 1):
+        apps.append({
+            "id": i,
+            "name": f"App {i}",
+            "owner": f"Team {rng.randint(1, max(1, count // 50))}",
+            "technology": rng.choice(TECHNOLOGIES),
+            "deployment": rng.choices(ENVIRONMENTS, weights=[6, 2, 1, 1])[0],
+            "compliance": rng.sample(STANDARDS, rng.randint(0, 2)),
+            "users": int(rng.lognormvariate(7, 2)),
+        })
+    return apps
+
+
+def to_crew_schema(apps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converts applications to the architecture_governance.py CMDB schema.
+    """
+    return [
+        {"id": a["id"], "application": a["name"], "owner": a["owner"], "deployment_env": a["deployment"], "compliance": a["compliance"]}
+        for a in apps
+    ]
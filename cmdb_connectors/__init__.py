@@ -0,0 +1,69 @@
+"""
+CMDB connectors shared by the A2A and Crew governance pipelines: one
+canonical record schema, streaming, column-projecting readers for CSV,
+JSON Lines, Parquet and SQLite exports, the compliance bit registry, the
+governance policy DSL and the compliance result model.
+"""
+from .adapters import (
+    ADAPTERS,
+    BATCH_SIZE,
+    PARQUET_AVAILABLE,
+    iter_batches,
+    iter_csv,
+    iter_jsonl,
+    iter_parquet,
+    iter_records,
+    iter_sqlite,
+    load_records,
+    parse_source,
+)
+from .compliance import COMPLIANCE_REGISTRY, MAX_STANDARDS, STANDARDS, ComplianceRegistry, register_standard
+from .policy import (
+    DEFAULT_POLICY_PATH,
+    YAML_AVAILABLE,
+    Policy,
+    PolicyRule,
+    load_policy,
+    parse_policy,
+    render_policy,
+    render_policy_doc,
+    render_rules,
+    violation_reason,
+)
+from .results import ComplianceResult
+from .schema import CANONICAL_FIELDS, FIELD_ALIASES, RecordBuilder, normalize_record, resolve_columns
+
+__all__ = [
+    "ADAPTERS",
+    "BATCH_SIZE",
+    "CANONICAL_FIELDS",
+    "DEFAULT_POLICY_PATH",
+    "COMPLIANCE_REGISTRY",
+    "ComplianceRegistry",
+    "ComplianceResult",
+    "FIELD_ALIASES",
+    "MAX_STANDARDS",
+    "PARQUET_AVAILABLE",
+    "Policy",
+    "PolicyRule",
+    "RecordBuilder",
+    "STANDARDS",
+    "YAML_AVAILABLE",
+    "iter_batches",
+    "iter_csv",
+    "iter_jsonl",
+    "iter_parquet",
+    "iter_records",
+    "iter_sqlite",
+    "load_policy",
+    "load_records",
+    "normalize_record",
+    "parse_policy",
+    "parse_source",
+    "register_standard",
+    "render_policy",
+    "render_policy_doc",
+    "render_rules",
+    "resolve_columns",
+    "violation_reason",
+]
@@ -0,0 +1,187 @@
+import csv
+import gc
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from .schema import RecordBuilder, resolve_columns
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Records per yielded batch; parsers never hold more than one batch of source rows
+BATCH_SIZE = 10_000
+# Table read from SQLite sources unless '?table=' or table= says otherwise
+SQLITE_TABLE = "applications"
+
+Batch = List[Dict[str, Any]]
+
+
+def iter_csv(path: str, columns: Optional[Sequence[str]] = None, batch_size: int = BATCH_SIZE, **options: Any) -> Iterator[Batch]:
+    """
+    Streams a CSV export with a header row. Only the projected columns are
+    converted; compliance tags may be a JSON array or ';'/','/'|' separated.
+    """
+    with open(path, newline="", encoding=options.get("encoding", "utf-8-sig")) as f:
+        reader = csv.reader(f, delimiter=options.get("delimiter", ","))
+        header = next(reader, None)
+        if header is None:
+            return
+        mapping = resolve_columns(header, columns)
+        builder = RecordBuilder(mapping, positions={column: i for i, column in enumerate(header)})
+        rows: List[List[str]] = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) >= batch_size:
+                yield builder.build_batch(rows)
+                rows = []
+        if rows:
+            yield builder.build_batch(rows)
+
+
+def _parse_lines(lines: List[str]) -> List[Any]:
+    # One json.loads over the whole batch is several times faster than one per line
+    try:
+        return json.loads("[" + ",".join(lines) + "]")
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in lines]
+
+
+def iter_jsonl(path: str, columns: Optional[Sequence[str]] = None, batch_size: int = BATCH_SIZE, **options: Any) -> Iterator[Batch]:
+    """
+    Streams a JSON Lines export, one object per line. The column mapping is
+    resolved from the first object's keys.
+    """
+    builder: Optional[RecordBuilder] = None
+    lines: List[str] = []
+    with open(path, encoding=options.get("encoding", "utf-8")) as f:
+        for line in f:
+            if line.isspace():
+                continue
+            lines.append(line)
+            if len(lines) >= batch_size:
+                rows = _parse_lines(lines)
+                builder = builder or RecordBuilder(resolve_columns(list(rows[0]), columns))
+                yield builder.build_batch(rows)
+                lines = []
+    if lines:
+        rows = _parse_lines(lines)
+        builder = builder or RecordBuilder(resolve_columns(list(rows[0]), columns))
+        yield builder.build_batch(rows)
+
+
+def iter_parquet(path: str, columns: Optional[Sequence[str]] = None, batch_size: int = BATCH_SIZE, **options: Any) -> Iterator[Batch]:
+    """
+    Streams a Parquet file row group by row group, reading only the projected
+    columns from disk. Requires pyarrow.
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Reading Parquet CMDB exports requires pyarrow (pip install pyarrow)")
+    parquet = pq.ParquetFile(path)
+    mapping = resolve_columns(parquet.schema_arrow.names, columns)
+    builder = RecordBuilder(mapping)
+    source_columns = [column for column in mapping.values() if column is not None]
+    for record_batch in parquet.iter_batches(batch_size=batch_size, columns=source_columns):
+        data = {column: record_batch.column(column).to_pylist() for column in source_columns}
+        yield builder.build_columns(data, record_batch.num_rows)
+
+
+def _quote_identifier(name: str) -> str:
+    """
+    Quotes a SQLite table or column name, doubling embedded quotes, so names
+    from the source or the '?table=' option are never read as SQL.
+    """
+    if "\x00" in name:
+        raise ValueError(f"Invalid SQLite identifier {name!r}")
+    return '"' + name.replace('"', '""') + '"'
+
+
+def iter_sqlite(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = BATCH_SIZE,
+    table: str = SQLITE_TABLE,
+    **options: Any,
+) -> Iterator[Batch]:
+    """
+    Streams a SQLite table with fetchmany(), selecting only the projected columns.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        source_columns = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote_identifier(table)})")]
+        if not source_columns:
+            raise ValueError(f"SQLite source {path} has no table '{table}'")
+        mapping = resolve_columns(source_columns, columns)
+        selected = [column for column in mapping.values() if column is not None]
+        builder = RecordBuilder(mapping, positions={column: i for i, column in enumerate(selected)})
+        select = ", ".join(_quote_identifier(column) for column in selected) or "NULL"
+        cursor = conn.execute(f"SELECT {select} FROM {_quote_identifier(table)}")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield builder.build_batch(rows)
+    finally:
+        conn.close()
+
+
+ADAPTERS: Dict[str, Callable[..., Iterator[Batch]]] = {
+    ".csv": iter_csv,
+    ".jsonl": iter_jsonl,
+    ".ndjson": iter_jsonl,
+    ".parquet": iter_parquet,
+    ".sqlite": iter_sqlite,
+    ".sqlite3": iter_sqlite,
+    ".db": iter_sqlite,
+}
+
+
+def parse_source(source: str) -> Tuple[str, Callable[..., Iterator[Batch]], Dict[str, str]]:
+    """
+    Splits 'path[?option=value&...]' into the path, its adapter (by file
+    extension) and the options, e.g. 'cmdb.sqlite?table=apps'.
+    """
+    path, _, query = source.partition("?")
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ADAPTERS:
+        raise ValueError(f"Unsupported CMDB source '{source}'; expected one of {sorted(ADAPTERS)}")
+    return path, ADAPTERS[extension], dict(parse_qsl(query))
+
+
+def iter_batches(source: str, columns: Optional[Sequence[str]] = None, batch_size: int = BATCH_SIZE, **options: Any) -> Iterator[Batch]:
+    """
+    Streams canonical records from a CSV, JSON Lines, Parquet or SQLite
+    source in batches of at most `batch_size`, restricted to `columns`.
+    """
+    path, adapter, source_options = parse_source(source)
+    return adapter(path, columns=columns, batch_size=batch_size, **{**source_options, **options})
+
+
+def iter_records(source: str, columns: Optional[Sequence[str]] = None, **options: Any) -> Iterator[Dict[str, Any]]:
+    for batch in iter_batches(source, columns, **options):
+        yield from batch
+
+
+def load_records(source: str, columns: Optional[Sequence[str]] = None, **options: Any) -> List[Dict[str, Any]]:
+    """
+    Loads every record of `source` into a list.
+    """
+    records: List[Dict[str, Any]] = []
+    # Millions of new dicts and lists trigger repeated full garbage collections
+    # that cannot free anything, so the collector is paused while loading.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for batch in iter_batches(source, columns, **options):
+            records.extend(batch)
+    finally:
+        if was_enabled:
+            gc.enable()
+    return records
@@ -0,0 +1,99 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Standards with a fixed bit, in bit order. Their positions never change, so
+# masks built by one pipeline stay valid in the other.
+STANDARDS = ("PCI", "GDPR", "SOC2", "HIPAA", "ISO27001")
+# Width of the integer masks (one uint64 per application in the A2A store)
+MAX_STANDARDS = 64
+
+
+def _key(standard: str) -> str:
+    return str(standard).strip().upper()
+
+
+class ComplianceRegistry:
+    """
+    Assigns every compliance standard one bit of a 64-bit mask, so a set of
+    standards is a single integer and 'PCI or SOC2' is `mask & (PCI | SOC2)`.
+    Names are matched case-insensitively; the first spelling registered is
+    the one decoded. Standards seen for the first time in CMDB data take the
+    next free bit.
+    """
+
+    def __init__(self, standards: Iterable[str] = STANDARDS, capacity: int = MAX_STANDARDS):
+        self.capacity = capacity
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._decoded: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+        for standard in standards:
+            self.register(standard)
+
+    def register(self, standard: str) -> int:
+        """
+        Returns the bit of `standard`, assigning the next free one if it is new.
+        """
+        key = _key(standard)
+        bit = self._bits.get(key)
+        if bit is not None:
+            return bit
+        with self._lock:
+            bit = self._bits.get(key)
+            if bit is None:
+                if len(self._names) >= self.capacity:
+                    raise ValueError(f"Cannot register compliance standard '{standard}': all {self.capacity} bits are in use")
+                bit = len(self._names)
+                self._names.append(str(standard).strip())
+                self._bits[key] = bit
+            return bit
+
+    def bit(self, standard: str) -> Optional[int]:
+        return self._bits.get(_key(standard))
+
+    def mask(self, standards: Iterable[str]) -> int:
+        """
+        Mask of the given standards; unregistered ones match nothing.
+        """
+        mask = 0
+        for standard in standards:
+            bit = self._bits.get(_key(standard))
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def encode(self, standards: Iterable[str]) -> int:
+        """
+        Mask of the given standards, registering any new ones.
+        """
+        mask = 0
+        for standard in standards:
+            mask |= 1 << self.register(standard)
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        names = self._decoded.get(mask)
+        if names is None:
+            names = self._decoded[mask] = [name for bit, name in enumerate(self._names) if mask >> bit & 1]
+        return list(names)
+
+    @property
+    def standards(self) -> List[str]:
+        return list(self._names)
+
+    def __contains__(self, standard: str) -> bool:
+        return _key(standard) in self._bits
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# Shared by every CMDB store unless one is given its own registry
+COMPLIANCE_REGISTRY = ComplianceRegistry()
+
+
+def register_standard(standard: str) -> int:
+    """
+    Registers a new compliance standard (e.g. 'FedRAMP') in the shared registry.
+    """
+    return COMPLIANCE_REGISTRY.register(standard)
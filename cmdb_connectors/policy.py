@@ -0,0 +1,182 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .compliance import COMPLIANCE_REGISTRY, ComplianceRegistry
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+# Policy used by both pipelines unless ARCHGOV_POLICY_PATH / CREW_POLICY_PATH say otherwise
+DEFAULT_POLICY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "policies", "architecture_policy.yaml"
+)
+
+# Comparisons allowed on numeric fields, with their wording in generated prose
+COMPARISONS = {"gt": "more than", "gte": "at least", "lt": "fewer than", "lte": "at most"}
+NUMERIC_FIELDS = ("users",)
+
+
+@dataclass(frozen=True)
+class PolicyRule:
+    """
+    One rule of the policy: an application subject to `standard` violates it
+    when it is deployed in one of `deployment` (if given) and every numeric
+    condition (field, comparison, value) holds.
+    """
+    id: str
+    standard: str
+    deployment: Tuple[str, ...] = ()
+    conditions: Tuple[Tuple[str, str, int], ...] = ()
+    reason: str = ""
+
+
+@dataclass
+class Policy:
+    standards: Dict[str, List[str]] = field(default_factory=dict)
+    rules: List[PolicyRule] = field(default_factory=list)
+
+
+def _environments(envs: Tuple[str, ...]) -> str:
+    quoted = [f"'{env}'" for env in envs]
+    return quoted[0] if len(quoted) == 1 else ", ".join(quoted[:-1]) + " or " + quoted[-1]
+
+
+def _describe(rule: PolicyRule, have: str, deployed: str) -> str:
+    # have/deployed are the verb forms: "has"/"deployed" or "have"/"be deployed"
+    counts = [f"{COMPARISONS[op]} {value:,} {name}" for name, op, value in rule.conditions]
+    where = f"a {_environments(rule.deployment)} environment" if rule.deployment else ""
+    if counts:
+        return f"{have} {' and '.join(counts)}" + (f" in {where}" if where else "")
+    return f"{deployed} in {where}"
+
+
+def violation_reason(rule: PolicyRule) -> str:
+    """
+    e.g. "Subject to 'PCI' compliance but deployed in a 'sandbox' or 'qa' environment."
+    """
+    return rule.reason or f"Subject to '{rule.standard}' compliance but {_describe(rule, 'has', 'deployed')}."
+
+
+def _parse_rule(raw: Any, index: int, registry: ComplianceRegistry) -> PolicyRule:
+    if not isinstance(raw, dict):
+        raise ValueError(f"Policy rule #{index + 1} must be a mapping")
+    rule_id = str(raw.get("id") or f"rule_{index + 1}")
+    unknown = set(raw) - {"id", "standard", "forbid", "reason"}
+    if unknown:
+        raise ValueError(f"Policy rule '{rule_id}' has unknown key(s) {sorted(unknown)}")
+    standard = raw.get("standard")
+    if not standard or not isinstance(standard, str):
+        raise ValueError(f"Policy rule '{rule_id}' needs a 'standard'")
+    forbid = raw.get("forbid") or {}
+    if not isinstance(forbid, dict) or not forbid:
+        raise ValueError(f"Policy rule '{rule_id}' needs a 'forbid' mapping with at least one condition")
+
+    deployment: Tuple[str, ...] = ()
+    conditions = []
+    for name, value in forbid.items():
+        if name == "deployment":
+            envs = [value] if isinstance(value, str) else value
+            if not isinstance(envs, list) or not envs:
+                raise ValueError(f"Policy rule '{rule_id}': 'deployment' must be an environment or a list of them")
+            deployment = tuple(str(env).strip().lower() for env in envs)
+        elif name in NUMERIC_FIELDS:
+            if not isinstance(value, dict) or not value:
+                raise ValueError(f"Policy rule '{rule_id}': '{name}' must be a mapping like {{gt: 10000}}")
+            for op, threshold in value.items():
+                if op not in COMPARISONS:
+                    raise ValueError(f"Policy rule '{rule_id}': unknown comparison '{op}'; expected one of {list(COMPARISONS)}")
+                conditions.append((name, op, int(threshold)))
+        else:
+            raise ValueError(f"Policy rule '{rule_id}': cannot forbid '{name}'; expected deployment or {list(NUMERIC_FIELDS)}")
+
+    registry.register(standard)
+    return PolicyRule(rule_id, standard, deployment, tuple(conditions), str(raw.get("reason") or ""))
+
+
+def parse_policy(data: Dict[str, Any], registry: Optional[ComplianceRegistry] = None) -> Policy:
+    """
+    Validates a policy document (the YAML/JSON structure described in
+    policies/architecture_policy.yaml). Its standards are registered in the
+    compliance bit registry.
+    """
+    registry = registry or COMPLIANCE_REGISTRY
+    if not isinstance(data, dict):
+        raise ValueError("A policy document must be a mapping with 'standards' and 'rules'")
+    standards: Dict[str, List[str]] = {}
+    for name, spec in (data.get("standards") or {}).items():
+        requirements = (spec or {}).get("requirements", []) if isinstance(spec, dict) else spec
+        standards[str(name)] = [str(r) for r in requirements or []]
+        registry.register(str(name))
+    rules = [_parse_rule(raw, i, registry) for i, raw in enumerate(data.get("rules") or [])]
+    seen = set()
+    for rule in rules:
+        if rule.id in seen:
+            raise ValueError(f"Duplicate policy rule id '{rule.id}'")
+        seen.add(rule.id)
+    return Policy(standards, rules)
+
+
+def load_policy(path: str = DEFAULT_POLICY_PATH, registry: Optional[ComplianceRegistry] = None) -> Policy:
+    """
+    Loads a policy from a .yaml/.yml (requires PyYAML) or .json file.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+        elif not YAML_AVAILABLE:
+            raise RuntimeError("Reading YAML policies requires PyYAML (pip install pyyaml), or use a .json policy")
+        else:
+            data = yaml.safe_load(f)
+    return parse_policy(data, registry)
+
+
+def render_policy(policy: Policy) -> Dict[str, Any]:
+    """
+    The policy document parse_policy() reads, e.g. to write it back as YAML
+    or JSON. Generated reasons are left out, so they are regenerated.
+    """
+    rules = []
+    for rule in policy.rules:
+        forbid: Dict[str, Any] = {}
+        if rule.deployment:
+            forbid["deployment"] = list(rule.deployment)
+        for name, op, value in rule.conditions:
+            forbid.setdefault(name, {})[op] = value
+        raw = {"id": rule.id, "standard": rule.standard, "forbid": forbid}
+        if rule.reason:
+            raw["reason"] = rule.reason
+        rules.append(raw)
+    return {
+        "version": 1,
+        "standards": {name: {"requirements": list(reqs)} for name, reqs in policy.standards.items()},
+        "rules": rules,
+    }
+
+
+def render_policy_doc(policy: Policy) -> str:
+    """
+    The policy in prose for the LLM agents: each standard's requirements
+    followed by its rules.
+    """
+    names = list(policy.standards) + [r.standard for r in policy.rules if r.standard not in policy.standards]
+    lines = []
+    for name in dict.fromkeys(names):
+        lines.append(f"{name} requires all applications to have the following:")
+        lines.extend(f"    - {requirement}" for requirement in policy.standards.get(name, []))
+        lines.extend(
+            f"    - Must not {_describe(rule, 'have', 'be deployed')}."
+            for rule in policy.rules if rule.standard == name
+        )
+    return "\n".join(lines)
+
+
+def render_rules(policy: Policy) -> str:
+    """
+    One 'NON-COMPLIANT if' line per rule, for prompts that explain rule results.
+    """
+    return "\n".join(f"- NON-COMPLIANT if: {violation_reason(rule)}" for rule in policy.rules)
@@ -0,0 +1,17 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ComplianceResult(BaseModel):
+    """
+    One application's compliance verdict, the contract both pipelines'
+    compliance stages are validated against. applicationId is the CMDB id;
+    violations lists the broken policy rules when the stage reports them.
+    """
+
+    applicationId: int
+    appName: str
+    isCompliant: bool
+    violations: List[str] = []
+    reason: Optional[str] = None
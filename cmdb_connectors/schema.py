@@ -0,0 +1,183 @@
+import json
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Canonical CMDB record shared by both pipelines (the ArchGov.py schema):
+# id, name, owner, technology, deployment (prod/uat/sandbox/qa/...),
+# compliance (list of standards, e.g. ["PCI", "SOC2"]) and users.
+CANONICAL_FIELDS = ("id", "name", "owner", "technology", "deployment", "compliance", "users")
+
+# Source column names accepted for each canonical field, compared case-insensitively
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "id": ("id", "app_id", "application_id", "applicationid", "sys_id"),
+    "name": ("name", "application", "app_name", "appname", "application_name"),
+    "owner": ("owner", "owned_by", "team"),
+    "technology": ("technology", "tech", "stack"),
+    "deployment": ("deployment", "deployment_env", "environment", "env"),
+    "compliance": ("compliance", "compliance_tags", "standards"),
+    "users": ("users", "user_count", "active_users"),
+}
+
+_TAG_SEPARATORS = re.compile(r"[;,|]")
+
+
+def _blank(value: Any) -> bool:
+    # Missing values: None, empty or whitespace-only cells, and NaN (how
+    # Parquet/pandas exports represent an empty numeric cell)
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _parse_int(value: Any) -> int:
+    # "12.0" and 12.0 (floats from spreadsheets and Parquet) are accepted as 12
+    return int(float(value)) if isinstance(value, str) and "." in value else int(value)
+
+
+def _to_id(value: Any) -> Optional[int]:
+    return None if _blank(value) else _parse_int(value)
+
+
+def _to_int(value: Any) -> int:
+    return 0 if _blank(value) else _parse_int(value)
+
+
+def _to_str(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _to_deployment(value: Any) -> str:
+    return "" if value is None else str(value).strip().lower()
+
+
+def _to_tags(value: Any) -> List[str]:
+    """
+    Accepts a list, a JSON array string, or a ';', ',' or '|' separated string.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(tag) for tag in value]
+    value = str(value).strip()
+    if not value:
+        return []
+    if value.startswith("["):
+        return [str(tag) for tag in json.loads(value)]
+    return [tag.strip() for tag in _TAG_SEPARATORS.split(value) if tag.strip()]
+
+
+def _ints(values: List[Any], convert: Callable[[Any], Any]) -> List[Any]:
+    try:
+        return list(map(int, values))
+    except (TypeError, ValueError):
+        return [convert(v) for v in values]
+
+
+def _strs(values: List[Any]) -> List[str]:
+    return [v if v.__class__ is str else _to_str(v) for v in values]
+
+
+def _deployments(values: List[Any]) -> List[str]:
+    # Few distinct environments, so each is normalized once per batch
+    memo: Dict[Any, str] = {}
+    return [memo[v] if v in memo else memo.setdefault(v, _to_deployment(v)) for v in values]
+
+
+def _tag_lists(values: List[Any]) -> List[List[str]]:
+    memo: Dict[str, List[str]] = {}
+    tags = []
+    for v in values:
+        if v.__class__ is str:
+            parsed = memo.get(v)
+            if parsed is None:
+                parsed = memo[v] = _to_tags(v)
+            tags.append(list(parsed))
+        else:
+            tags.append(_to_tags(v))
+    return tags
+
+
+# Column-at-a-time converters: each takes a batch's values for one field
+CONVERTERS: Dict[str, Callable[[List[Any]], List[Any]]] = {
+    "id": lambda values: _ints(values, _to_id),
+    "name": _strs,
+    "owner": _strs,
+    "technology": _strs,
+    "deployment": _deployments,
+    "compliance": _tag_lists,
+    "users": lambda values: _ints(values, _to_int),
+}
+
+DEFAULTS: Dict[str, Any] = {
+    "id": None, "name": "", "owner": "", "technology": "", "deployment": "", "compliance": [], "users": 0,
+}
+
+
+def resolve_columns(source_columns: Sequence[str], columns: Optional[Sequence[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Maps each requested canonical field (all of them by default) to the
+    source column holding it, or None when the source has no such column.
+    """
+    requested = list(columns or CANONICAL_FIELDS)
+    unknown = [c for c in requested if c not in FIELD_ALIASES]
+    if unknown:
+        raise ValueError(f"Unknown CMDB field(s) {unknown}; expected some of {list(CANONICAL_FIELDS)}")
+    by_lower = {str(column).strip().lower(): column for column in source_columns}
+    mapping: Dict[str, Optional[str]] = {}
+    for field in requested:
+        mapping[field] = next((by_lower[alias] for alias in FIELD_ALIASES[field] if alias in by_lower), None)
+    return mapping
+
+
+class RecordBuilder:
+    """
+    Turns batches of source rows into canonical records for a fixed column
+    mapping. Rows are sequences (positions given by `positions`) or mappings
+    (keys). Values are converted a column at a time, which keeps the per-row
+    Python work to building the dict.
+    """
+
+    def __init__(self, mapping: Dict[str, Optional[str]], positions: Optional[Dict[str, int]] = None):
+        self.fields = list(mapping)
+        self._plan = []
+        for field, column in mapping.items():
+            key = None if column is None else (positions[column] if positions is not None else column)
+            self._plan.append((field, key, CONVERTERS[field]))
+
+    def build_columns(self, columns: Dict[Any, List[Any]], count: int) -> List[Dict[str, Any]]:
+        """
+        Builds `count` records from column-oriented data, keyed like the
+        mapping's source columns (e.g. a Parquet batch).
+        """
+        values = []
+        for field, key, convert in self._plan:
+            default = DEFAULTS[field]
+            if key is None:
+                values.append([list(default) for _ in range(count)] if isinstance(default, list) else [default] * count)
+            else:
+                values.append(convert(columns[key]))
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in zip(*values)]
+
+    def build_batch(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        columns: Dict[Any, List[Any]] = {}
+        for _, key, _ in self._plan:
+            if key is None or key in columns:
+                continue
+            if isinstance(rows[0], dict):
+                columns[key] = [row.get(key) for row in rows]
+            else:
+                columns[key] = [row[key] if key < len(row) else None for row in rows]
+        return self.build_columns(columns, len(rows))
+
+
+def normalize_record(raw: Dict[str, Any], columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Converts one record from any supported layout to the canonical schema.
+    """
+    return RecordBuilder(resolve_columns(list(raw), columns)).build_batch([raw])[0]
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The pipelines import their modules as siblings, as they do when run from their own directories
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("", "ArchitectureGovernanceA2A", "ArchitectureGovernanceCrew", "benchmarks"):
+    path = os.path.join(REPO_ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from cmdb_connectors import load_records, normalize_record
+from cmdb_connectors.schema import _ints, _to_id, _to_int
+
+
+@pytest.mark.parametrize("value", [None, "", "  ", "\t\n"])
+def test_blank_numbers_are_missing(value):
+    assert _to_int(value) == 0
+    assert _to_id(value) is None
+
+
+def test_blank_users_in_a_record():
+    record = normalize_record({"id": " 7 ", "name": "App7", "users": "  "})
+    assert record["id"] == 7
+    assert record["users"] == 0
+
+
+def _sqlite(tmp_path, table, columns):
+    path = str(tmp_path / "cmdb.sqlite")
+    conn = sqlite3.connect(path)
+    quoted = ", ".join('"' + c.replace('"', '""') + '"' for c in columns)
+    conn.execute(f'CREATE TABLE "{table.replace(chr(34), chr(34) * 2)}" ({quoted})')
+    conn.execute(f'INSERT INTO "{table.replace(chr(34), chr(34) * 2)}" VALUES (1, \'App1\', \'  \')')
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_sqlite_identifiers_with_quotes(tmp_path):
+    path = _sqlite(tmp_path, 'my "apps"', ["id", 'name', 'users'])
+    records = load_records(path, ["id", "name", "users"], table='my "apps"')
+    assert [(r["id"], r["name"], r["users"]) for r in records] == [(1, "App1", 0)]
+
+
+def test_sqlite_table_option_is_not_sql(tmp_path):
+    path = _sqlite(tmp_path, "apps", ["id", "name", "users"])
+    with pytest.raises(ValueError, match="has no table"):
+        load_records(path, ["id", "name"], table='apps" UNION SELECT sql, name, 1 FROM sqlite_master --')
+    assert len(load_records(path, ["id", "name"], table="apps")) == 1
+
+
+def test_nan_is_blank():
+    nan = float("nan")
+    assert _ints([nan, 2], _to_id) == [None, 2]
+    assert _ints([nan, 2.0], _to_int) == [0, 2]
+
+
+def test_ids_parse_like_numbers():
+    assert _to_id("1.0") == 1
+    assert _to_id(" 12 ") == 12
+    assert _to_int("3.0") == 3
+
+
+def test_id_less_records_do_not_collide_with_later_ids(tmp_path):
+    from cmdb_store import CmdbStore
+
+    path = tmp_path / "cmdb.csv"
+    path.write_text("id,name\n,NoId1\n2,App2\n,NoId2\n7,App7\n")
+    store = CmdbStore.from_source(str(path))
+    ids = {record["name"]: record["id"] for record in store}
+    assert ids == {"NoId1": 8, "App2": 2, "NoId2": 9, "App7": 7}
+    assert store.get_by_id(8)["name"] == "NoId1"
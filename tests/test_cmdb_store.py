@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+
+from ArchGov import cmdb_data
+from cmdb_store import CmdbStore
+
+DEPLOYMENTS = ["prod", "uat", "sandbox", "qa", "dr"]
+STANDARDS = ["PCI", "SOC2", "GDPR"]
+OWNERS = ["Finance Team", "HR Team", "Core Platform"]
+
+
+@pytest.fixture(scope="module")
+def records():
+    rng = random.Random(7)
+    return [
+        {
+            "id": i + 1,
+            "name": f"App{i + 1}",
+            "owner": rng.choice(OWNERS),
+            "technology": "Go",
+            "deployment": rng.choice(DEPLOYMENTS),
+            "compliance": rng.sample(STANDARDS, rng.randint(0, 3)),
+            "users": rng.randint(0, 50000),
+        }
+        for i in range(1000)
+    ]
+
+
+@pytest.fixture(scope="module")
+def store(records):
+    return CmdbStore(records)
+
+
+def brute_force(records, deployment=(), compliance=(), owner=""):
+    return [
+        r["id"] for r in records
+        if (not deployment or r["deployment"] in deployment)
+        and (not compliance or set(compliance) & set(r["compliance"]))
+        and (not owner or r["owner"].lower() == owner.lower())
+    ]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"deployment": ["sandbox", "qa"]},
+    {"compliance": ["PCI", "GDPR"]},
+    {"deployment": ["prod"], "compliance": ["SOC2"], "owner": "hr team"},
+    {"deployment": ["nowhere"]},
+])
+def test_query_pages_match_a_brute_force_filter(store, records, filters):
+    expected = brute_force(records, **filters)
+    assert store.count(**filters) == len(expected)
+    for offset, limit in [(0, 10), (0, None), (3, 17), (95, 200), (len(expected) - 1, 5), (len(expected) + 1, 5)]:
+        offset = max(offset, 0)
+        page, total = store.query(**filters, offset=offset, limit=limit)
+        end = None if limit is None else offset + limit
+        assert total == len(expected)
+        assert [r["id"] for r in page] == expected[offset:end]
+
+
+def test_comma_separated_filters_match_any_value(store, records):
+    page, total = store.query(deployment="sandbox, qa", compliance="PCI,GDPR")
+    assert [r["id"] for r in page] == brute_force(records, ["sandbox", "qa"], ["PCI", "GDPR"])
+    assert total == len(page)
+
+
+def test_rows_unpack_only_the_requested_page(store):
+    rng = np.random.default_rng(3)
+    bits = rng.random(1003) < 0.3
+    bitmap = np.packbits(bits)
+    positions = np.flatnonzero(bits)
+    for offset, limit in [(0, None), (0, 1), (5, 40), (len(positions) - 2, 10), (len(positions), 10)]:
+        end = None if limit is None else offset + limit
+        rows, total = store._rows(bitmap, offset, limit)
+        assert total == len(positions)
+        assert rows.tolist() == positions[offset:end].tolist()
+
+
+def test_get_by_name_and_id():
+    store = CmdbStore(cmdb_data)
+    assert store.get_by_name("  pci feature DEV ")["id"] == 3
+    assert store.get_by_name("Unknown App") is None
+    assert store.get_by_id(4)["name"] == "Internal HR Portal"
+    assert store.get_by_id("5")["name"] == "SOC2 Staging Env"
+    assert store.get_by_id(99) is None
+    # A later record with the same name or id supersedes the earlier one
+    store.add(dict(cmdb_data[0], users=1))
+    assert store.get_by_name("Customer Payments Gateway")["users"] == 1
+    assert store.get_by_id(1)["users"] == 1
+
+
+def test_records_round_trip_through_the_columns():
+    store = CmdbStore(cmdb_data)
+    assert store.all() == cmdb_data
+    assert store.names(2) == ["Customer Payments Gateway", "User Data Analytics"]
@@ -0,0 +1,22 @@
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+import models
+import schemas
+from cmdb_connectors import ComplianceResult
+
+
+def test_both_pipelines_validate_the_same_model():
+    assert models.ComplianceResult is ComplianceResult
+    assert models.STAGE_MODELS["compliance_validator"] is ComplianceResult
+    assert schemas.STEP_MODELS["compliance"] is ComplianceResult
+    assert get_args(schemas.ComplianceFindings.model_fields["results"].annotation) == (ComplianceResult,)
+
+
+def test_application_id_is_required():
+    with pytest.raises(ValidationError):
+        ComplianceResult.model_validate({"appName": "App1", "isCompliant": True})
+    result = ComplianceResult.model_validate({"applicationId": 1, "appName": "App1", "isCompliant": False, "reason": "x"})
+    assert result.violations == []
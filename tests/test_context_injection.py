@@ -0,0 +1,33 @@
+import json
+
+from context_injection import compact_json
+
+
+def _json_part(text):
+    return text.rsplit(" (+", 1)[0]
+
+
+def test_small_values_are_unchanged():
+    assert compact_json({"a": [1, 2]}, 100) == '{"a":[1,2]}'
+
+
+def test_lists_keep_whole_items():
+    text = compact_json([{"id": i, "name": "x" * 20} for i in range(50)], 300)
+    assert len(text) <= 300
+    kept = json.loads(_json_part(text))
+    assert kept == [{"id": i, "name": "x" * 20} for i in range(len(kept))]
+    assert text.endswith(f"(+{50 - len(kept)} more items omitted)")
+
+
+def test_dicts_drop_keys_instead_of_cutting_mid_token():
+    value = {"summary": "ok", "risks": ["r" * 30] * 20, "score": 80}
+    text = compact_json(value, 200)
+    assert len(text) <= 200
+    assert json.loads(_json_part(text)) == {"summary": "ok", "score": 80}
+    assert text.endswith("(+1 more keys omitted)")
+
+
+def test_long_strings_stay_valid_json():
+    text = compact_json("a" * 500, 100)
+    assert len(text) <= 100
+    assert json.loads(text).endswith("...(truncated)")
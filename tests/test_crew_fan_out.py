@@ -0,0 +1,17 @@
+import pytest
+
+from architecture_governance import _compliant
+from cmdb_connectors import ComplianceResult
+
+
+@pytest.mark.parametrize("verdict, expected", [
+    (ComplianceResult(applicationId=1, appName="App1", isCompliant=True), True),
+    (ComplianceResult(applicationId=2, appName="App2", isCompliant=False), False),
+    ({"applicationId": 3, "isCompliant": True}, True),
+    ('Final Answer: ```json\n{"applicationId": 4, "isCompliant": true}\n```', True),
+    ('{"applicationId": 5, "isCompliant": false}', False),
+    ("The application looks fine.", False),
+    ({"applicationId": 6}, False),
+])
+def test_only_explicitly_compliant_verdicts_skip_risk(verdict, expected):
+    assert _compliant(verdict) is expected
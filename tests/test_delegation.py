@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+
+from delegation import DelegationController
+
+
+def agent(role, max_iter=25):
+    return SimpleNamespace(role=role, max_iter=max_iter)
+
+
+def task(description):
+    return SimpleNamespace(description=description)
+
+
+def delegating(controller, *steps):
+    """
+    An execute callable that, in turn, delegates each (coworker, request) of
+    `steps` and returns the coworkers' answers. A step may itself be a
+    (coworker, request, nested_steps) triple.
+    """
+    def execute(current_task):
+        answers = []
+        for coworker, request, *nested in steps:
+            inner = delegating(controller, *nested[0]) if nested else (lambda t: f"{coworker.role} answered")
+            answers.append(controller.execute(coworker, inner, task(request)))
+        return answers
+    return execute
+
+
+def test_a_task_runs_its_agent_and_allowed_delegations():
+    controller = DelegationController(max_depth=2)
+    lead, analyst = agent("Lead"), agent("Analyst")
+    answers = controller.execute(lead, delegating(controller, (analyst, "check PCI")), task("govern"))
+    assert answers == ["Analyst answered"]
+    summary = controller.summary()
+    assert (summary["tasks"], summary["delegations"], summary["max_depth_seen"]) == (1, 1, 1)
+    assert summary["per_task"] == [{"agent": "Lead", "task": "govern", "llm_calls": 0, "delegations": 1, "refused": 0}]
+
+
+def test_delegating_back_into_the_chain_is_refused():
+    controller = DelegationController()
+    lead, analyst = agent("Lead"), agent("Analyst")
+    answers = controller.execute(
+        lead, delegating(controller, (analyst, "check PCI", [(lead, "you do it")])), task("govern"),
+    )
+    assert answers[0][0].startswith("Delegation to Lead was not performed (Lead is already in this delegation chain)")
+    assert controller.counters["refused_cycle"] == 1
+
+
+def test_delegation_deeper_than_the_limit_is_refused():
+    controller = DelegationController(max_depth=1)
+    lead, analyst, auditor = agent("Lead"), agent("Analyst"), agent("Auditor")
+    answers = controller.execute(
+        lead, delegating(controller, (analyst, "check PCI", [(auditor, "audit PCI")])), task("govern"),
+    )
+    assert "delegation depth limit of 1 reached" in answers[0][0]
+    assert controller.counters["refused_depth"] == 1
+    assert controller.counters["max_depth_seen"] == 1
+
+
+def test_repeating_the_same_request_is_refused():
+    controller = DelegationController(max_repeats=1)
+    lead, analyst = agent("Lead"), agent("Analyst")
+    answers = controller.execute(
+        lead,
+        delegating(controller, (analyst, "check PCI"), (analyst, "check SOC2"), (analyst, "check PCI")),
+        task("govern"),
+    )
+    assert answers[:2] == ["Analyst answered", "Analyst answered"]
+    assert "the same request was already delegated" in answers[2]
+    assert controller.counters["refused_repeat"] == 1
+
+
+def test_delegation_is_refused_once_the_budget_is_spent():
+    controller = DelegationController(max_llm_calls=2)
+    lead, analyst = agent("Lead"), agent("Analyst")
+
+    def execute(current_task):
+        controller.record_llm_call()
+        controller.record_llm_call()
+        return controller.execute(analyst, lambda t: "answered", task("check PCI"))
+
+    assert "LLM call budget of 2 for this task is spent" in controller.execute(lead, execute, task("govern"))
+    assert controller.counters["refused_budget"] == 1
+    assert controller.summary()["per_task"][0]["llm_calls"] == 2
+
+
+def test_max_iter_is_capped_to_the_remaining_budget():
+    controller = DelegationController(max_llm_calls=5)
+    lead, analyst = agent("Lead", max_iter=25), agent("Analyst", max_iter=3)
+    seen = {}
+
+    def coworker(current_task):
+        seen["Analyst"] = analyst.max_iter
+        return "answered"
+
+    def execute(current_task):
+        seen["Lead"] = lead.max_iter
+        for _ in range(3):
+            controller.record_llm_call()
+        return controller.execute(analyst, coworker, task("check PCI"))
+
+    controller.execute(lead, execute, task("govern"))
+    # Lead: 5 calls left of the budget; Analyst: 2 left, below its own max_iter of 3
+    assert seen == {"Lead": 5, "Analyst": 2}
+    assert (lead.max_iter, analyst.max_iter) == (25, 3)
+    assert controller.counters["capped_executions"] == 2
+
+
+def test_retried_execution_is_not_a_delegation():
+    controller = DelegationController()
+    lead = agent("Lead")
+    retried = controller.execute(lead, lambda t: controller.execute(lead, lambda t: "retried", t), task("govern"))
+    assert retried == "retried"
+    assert controller.counters["delegations"] == 0
+
+
+def test_chain_is_reset_after_a_failing_execution():
+    controller = DelegationController()
+    lead = agent("Lead", max_iter=25)
+
+    def fail(current_task):
+        raise RuntimeError("model unavailable")
+
+    with pytest.raises(RuntimeError):
+        controller.execute(lead, fail, task("govern"))
+    assert lead.max_iter == 25
+    assert controller.execute(lead, lambda t: "ok", task("govern again")) == "ok"
+    assert controller.counters["tasks"] == 2
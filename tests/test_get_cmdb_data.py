@@ -0,0 +1,29 @@
+import base64
+import json
+
+import pytest
+
+import ArchGov
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!",
+    base64.urlsafe_b64encode(b"{truncated").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ArchGov._encode_cursor({"offset": "1"}),
+    ArchGov._encode_cursor([1, 2]),
+    ArchGov._encode_cursor({
+        "offset": 0, "page_size": 2, "deployment": "", "compliance": "", "owner": "", "fields": ["name", ["id"]],
+    }),
+])
+def test_malformed_cursor_returns_an_error_message(cursor):
+    reply = ArchGov.get_cmdb_data(cursor=cursor)
+    assert reply.startswith("Sorry, ")
+    assert "not a valid cursor" in reply
+
+
+def test_cursor_continues_the_listing():
+    first = json.loads(ArchGov.get_cmdb_data("all", page_size=2))
+    second = json.loads(ArchGov.get_cmdb_data(cursor=first["next_cursor"]))
+    assert second["page"] == 2
+    assert {app["id"] for app in first["items"]}.isdisjoint(app["id"] for app in second["items"])
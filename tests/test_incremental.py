@@ -0,0 +1,66 @@
+from dataclasses import replace
+
+from cmdb_connectors import DEFAULT_POLICY_PATH, ComplianceRegistry, load_policy
+from incremental import RunStateStore, policy_salt
+
+RECORDS = [
+    {"id": 1, "name": "A", "deployment": "prod", "compliance": ["PCI"], "users": 10},
+    {"id": 2, "name": "B", "deployment": "sandbox", "compliance": ["PCI"], "users": 10},
+    {"id": 3, "name": "C", "deployment": "sandbox", "compliance": ["SOC2"], "users": 10},
+    {"id": 4, "name": "D", "deployment": "qa", "compliance": ["PCI"], "users": 10},
+]
+RESULTS = [
+    {"applicationId": 1, "appName": "A", "isCompliant": True, "reason": None},
+    {"applicationId": 2, "appName": "B", "isCompliant": False, "reason": "sandbox"},
+    {"applicationId": 3, "appName": "C", "isCompliant": False, "reason": "sandbox"},
+    {"applicationId": 4, "appName": "D", "isCompliant": False, "reason": "qa"},
+]
+
+
+def test_only_apps_with_every_output_are_checkpointed(tmp_path):
+    store = RunStateStore(str(tmp_path / "state.sqlite"))
+    risks = [
+        {"applicationId": 2, "risk": "Card data in sandbox", "severity": "High"},
+        {"applicationId": 3, "risk": "Audit scope in sandbox", "severity": "High"},
+    ]
+    recommendations = [
+        # No applicationId: attributed to app 2 through the risk it quotes
+        {"risk": "Card data in sandbox", "recommendation": "Migrate B", "priority": "High"},
+    ]
+
+    incomplete = store.save(RECORDS, RESULTS, risks, recommendations)
+
+    # 3 has no recommendation and 4 no risk, so both are validated again next run
+    assert incomplete == [3, 4]
+    changed, unchanged = store.partition(RECORDS)
+    assert [r["id"] for r in changed] == [3, 4]
+    assert [r["id"] for r in unchanged] == [1, 2]
+    prior = store.prior_outputs([1, 2])
+    assert prior["recommendations"] == [{**recommendations[0], "applicationId": 2}]
+
+
+def test_incomplete_app_forgets_its_previous_checkpoint(tmp_path):
+    store = RunStateStore(str(tmp_path / "state.sqlite"))
+    risk = {"applicationId": 2, "risk": "r", "severity": "High"}
+    recommendation = {"applicationId": 2, "risk": "r", "recommendation": "fix", "priority": "High"}
+    assert store.save(RECORDS[1:2], RESULTS[1:2], [risk], [recommendation]) == []
+
+    # A forced full run whose recommendation failed must not leave the old checkpoint in place
+    assert store.save(RECORDS[1:2], RESULTS[1:2], [risk], []) == [2]
+    assert [r["id"] for r in store.partition(RECORDS[1:2])[0]] == [2]
+
+
+def test_any_policy_change_invalidates_the_fingerprints(tmp_path):
+    policy = load_policy(DEFAULT_POLICY_PATH, ComplianceRegistry())
+    # A stated reason stays the same when the rule's conditions change
+    custom = replace(policy.rules[1], reason="Too many users in UAT.")
+    before = replace(policy, rules=[policy.rules[0], custom, policy.rules[2]])
+    after = replace(before, rules=[policy.rules[0], replace(custom, conditions=(("users", "gt", 5000),)), policy.rules[2]])
+    assert policy_salt(replace(before, rules=list(before.rules))) == policy_salt(before)
+    assert policy_salt(after) != policy_salt(before)
+    assert policy_salt(replace(before, standards={**before.standards, "PCI": ["Encryption."]})) != policy_salt(before)
+
+    path = str(tmp_path / "state.sqlite")
+    RunStateStore(path, salt=policy_salt(before)).save(RECORDS, RESULTS, [], [])
+    assert RunStateStore(path, salt=policy_salt(before)).partition(RECORDS)[1] == [RECORDS[0]]
+    assert RunStateStore(path, salt=policy_salt(after)).partition(RECORDS) == (RECORDS, [])
@@ -0,0 +1,68 @@
+import pytest
+
+from json_stream import IncrementalJsonParser, parse_json
+
+
+def feed_chunks(chunks):
+    parser = IncrementalJsonParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return parser, items
+
+
+def test_bracket_in_prose_before_the_array():
+    assert parse_json("Results [see below]: [1,2]") == [1, 2]
+
+
+def test_brace_in_prose_before_the_object():
+    assert parse_json('Fill in {placeholder} like this: {"score": 90, "feedback": "ok"}') == {"score": 90, "feedback": "ok"}
+
+
+def test_code_fence():
+    text = 'Here you go:\n```json\n[{"applicationId": 3}, {"applicationId": 5}]\n```\nDone.'
+    assert parse_json(text) == [{"applicationId": 3}, {"applicationId": 5}]
+
+
+def test_code_fence_split_across_chunks():
+    parser, items = feed_chunks(["``", "`js", "on\n[1", "0, 2", "0]\n``", "`"])
+    assert items == [10, 20]
+    assert parser.done and parser.is_array
+
+
+def test_array_items_are_returned_as_soon_as_complete():
+    parser = IncrementalJsonParser()
+    assert parser.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(': 2}, 3') == [{"b": 2}]
+    # 3 may still grow into 30 until a delimiter arrives
+    assert parser.feed('0') == []
+    assert parser.feed(']') == [30]
+    assert parser.done
+
+
+def test_split_chunks_with_prose_bracket():
+    _, items = feed_chunks(["Results [s", "ee below]: [1,", "2]"])
+    assert items == [1, 2]
+
+
+def test_split_literal_is_not_mistaken_for_prose():
+    _, items = feed_chunks(["[tr", "ue, nu", "ll]"])
+    assert items == [True, None]
+
+
+def test_truncated_array_raises_on_close():
+    parser = IncrementalJsonParser()
+    assert parser.feed('[{"applicationId": 1}, {"applicationId": ') == [{"applicationId": 1}]
+    with pytest.raises(ValueError, match="Incomplete JSON"):
+        parser.close()
+
+
+def test_truncated_object_raises():
+    with pytest.raises(ValueError, match="Incomplete JSON"):
+        parse_json('{"summary": "cut off')
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError, match="No JSON"):
+        parse_json("I could not produce a report [sorry].")
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from llm_cache import CacheMissError, CachedGemini, ResponseCache
+
+
+class CountingGemini(CachedGemini):
+    calls: int = 0
+
+    async def _generate_uncached(self, llm_request, stream):
+        self.calls += 1
+        pieces = ["Com", "pliant"] if stream else ["Compliant"]
+        for piece in pieces:
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=piece)]), partial=stream)
+        if stream:
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="Compliant")]))
+
+
+def _request():
+    return LlmRequest(
+        model="gemini-test",
+        contents=[types.Content(role="user", parts=[types.Part(text="Is App1 compliant?")])],
+        config=types.GenerateContentConfig(),
+    )
+
+
+def _collect(model, stream):
+    async def run():
+        return [r async for r in model.generate_content_async(_request(), stream=stream)]
+    return asyncio.run(run())
+
+
+def test_streamed_calls_are_recorded_and_replayed(tmp_path):
+    model = CountingGemini(model="gemini-test", cache=ResponseCache(str(tmp_path / "cache.sqlite")))
+    live = _collect(model, stream=True)
+    replayed = _collect(model, stream=True)
+    assert model.calls == 1
+    assert [r.partial for r in replayed] == [r.partial for r in live] == [True, True, None]
+    assert [r.content.parts[0].text for r in replayed] == ["Com", "pliant", "Compliant"]
+    assert all(r.custom_metadata["cache_hit"] for r in replayed)
+    # A non-streamed call of the same request is cached separately
+    assert [r.content.parts[0].text for r in _collect(model, stream=False)] == ["Compliant"]
+    assert model.calls == 2
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_replay_mode_raises_on_a_miss(tmp_path, stream):
+    model = CountingGemini(model="gemini-test", cache=ResponseCache(str(tmp_path / "cache.sqlite"), replay=True))
+    with pytest.raises(CacheMissError):
+        _collect(model, stream=stream)
+    assert model.calls == 0
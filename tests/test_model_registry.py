@@ -0,0 +1,85 @@
+import asyncio
+import gc
+
+import httpx
+import pytest
+
+from model_registry import ClientPool, ModelRegistry, _CountingTransport
+
+
+def _client(pool, handler):
+    return httpx.AsyncClient(transport=_CountingTransport(pool, httpx.MockTransport(handler)))
+
+
+def test_in_flight_is_released_on_transport_errors():
+    pool = ClientPool()
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def run():
+        async with _client(pool, refuse) as client:
+            for _ in range(3):
+                with pytest.raises(httpx.ConnectError):
+                    await client.get("http://gemini.test/")
+
+    asyncio.run(run())
+    assert pool.stats()["requests"] == 3
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_peak_in_flight_counts_concurrent_requests():
+    pool = ClientPool()
+    release = asyncio.Event()
+
+    async def slow(request):
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    async def run():
+        async with _client(pool, slow) as client:
+            requests = [asyncio.create_task(client.get("http://gemini.test/")) for _ in range(4)]
+            while pool.in_flight < 4:
+                await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*requests)
+
+    asyncio.run(run())
+    assert pool.stats()["peak_in_flight"] == 4
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_clients_are_released_with_their_loop(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    pool = ClientPool()
+
+    async def get():
+        return id(pool.client())
+
+    for _ in range(5):
+        asyncio.run(get())
+    gc.collect()
+    assert len(pool._clients) == 0
+
+
+def test_pooled_clients_send_adk_tracking_headers(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    seen = {}
+
+    def handler(request):
+        seen.update(request.headers)
+        return httpx.Response(200, json={"candidates": [{"content": {"role": "model", "parts": [{"text": "ok"}]}}]})
+
+    model = ModelRegistry().get("gemini-test")
+    expected = model._tracking_headers()
+
+    async def run():
+        client = model.api_client
+        async_client = client._api_client._async_httpx_client
+        async_client._transport = _CountingTransport(model.pool, httpx.MockTransport(handler))
+        await client.aio.models.generate_content(model="gemini-test", contents="hi")
+
+    asyncio.run(run())
+    for name, value in expected.items():
+        # google-genai prepends its own version to the ADK values
+        assert seen[name.lower()].endswith(value)
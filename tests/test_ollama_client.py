@@ -0,0 +1,95 @@
+import pytest
+
+from harness import stub_server, stub_stats
+from ollama_client import OllamaClient
+
+MODEL = "llama3:latest"
+MESSAGES = [{"role": "user", "content": "Assess the risk of App1."}]
+
+
+@pytest.fixture(scope="module")
+def ollama_url():
+    # 600 ms per model load, counted as a cold load (> 0.5 s) by the client
+    with stub_server(tokens_per_sec=2000, extra_args=["--load-ms", "600"]) as url:
+        yield url
+
+
+def test_prewarm_keeps_the_model_resident(ollama_url):
+    client = OllamaClient(ollama_url, keep_alive="30m")
+    loads_before = stub_stats(ollama_url)["model_loads"]
+    try:
+        assert client.prewarm("resident-model") == pytest.approx(0.6, abs=0.01)
+        assert "resident-model" in client.loaded_models()
+        response = client.chat("resident-model", MESSAGES)
+        assert response["load_duration"] == 0
+        stats = client.stats()
+    finally:
+        client.close()
+    assert stub_stats(ollama_url)["model_loads"] - loads_before == 1
+    assert stats["cold_loads"] == 1
+    assert stats["load_seconds"] == pytest.approx(0.6, abs=0.01)
+    # prewarm loads without generating, so only the chat counts as a call
+    assert stats["calls"] == 1
+
+
+def test_keep_alive_zero_reloads_every_call(ollama_url):
+    client = OllamaClient(ollama_url, keep_alive=0)
+    loads_before = stub_stats(ollama_url)["model_loads"]
+    try:
+        for _ in range(2):
+            client.chat("unloaded-model", MESSAGES)
+        assert "unloaded-model" not in client.loaded_models()
+        stats = client.stats()
+    finally:
+        client.close()
+    assert stub_stats(ollama_url)["model_loads"] - loads_before == 2
+    assert stats["cold_loads"] == 2
+
+
+def test_chat_timings_are_accumulated(ollama_url):
+    client = OllamaClient(ollama_url)
+    try:
+        client.prewarm(MODEL)
+        responses = [client.chat(MODEL, MESSAGES, options={"temperature": 0}) for _ in range(2)]
+        stats = client.stats()
+    finally:
+        client.close()
+    output_tokens = sum(r["eval_count"] for r in responses)
+    eval_seconds = sum(r["eval_duration"] for r in responses) / 1e9
+    assert stats["calls"] == 2
+    assert stats["prompt_tokens"] == sum(r["prompt_eval_count"] for r in responses) > 0
+    assert stats["output_tokens"] == output_tokens > 0
+    assert stats["eval_seconds"] == pytest.approx(eval_seconds, abs=0.001)
+    assert stats["tokens_per_second"] == pytest.approx(output_tokens / eval_seconds, rel=0.01)
+    assert stats["generation_seconds"] == pytest.approx(stats["prompt_eval_seconds"] + stats["eval_seconds"], abs=0.002)
+    assert stats["wall_seconds"] >= stats["eval_seconds"]
+
+
+def test_embed_returns_one_vector_per_input(ollama_url):
+    client = OllamaClient(ollama_url.replace("http://", ""))
+    try:
+        vectors = client.embed("nomic-embed-text", ["PCI in prod", "GDPR in qa", "PCI in prod"])
+    finally:
+        client.close()
+    assert len(vectors) == 3
+    assert len({len(v) for v in vectors}) == 1
+    assert vectors[0] == vectors[2] != vectors[1]
+
+
+def test_chat_ollama_pooled_reports_usage_and_timings(ollama_url):
+    pytest.importorskip("langchain_core")
+    from langchain_core.messages import HumanMessage
+    from ollama_chat import ChatOllamaPooled
+
+    client = OllamaClient(ollama_url)
+    try:
+        llm = ChatOllamaPooled(client=client, model=MODEL, temperature=0, num_ctx=4096)
+        result = llm.generate([[HumanMessage(content="Assess the risk of App1.")]])
+    finally:
+        client.close()
+    generation = result.generations[0][0]
+    assert generation.text
+    assert set(generation.generation_info) == {"load_duration", "prompt_eval_duration", "eval_duration", "total_duration"}
+    usage = result.llm_output["token_usage"]
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"] > 0
+    assert client.stats()["calls"] == 1
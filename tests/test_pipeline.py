@@ -0,0 +1,51 @@
+import asyncio
+import json
+from typing import AsyncGenerator, List
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from ArchGov import PipelineConfig, cmdb_data
+from cmdb_store import CmdbStore
+from pipeline import GovernancePipeline
+
+# Canned reply per agent, recognised by its instruction
+REPLIES = {
+    "Risk Assessment Agent": "[]",
+    "Recommendation Agent": "[]",
+    "Reporting Agent": '{"summary": "ok", "actionItems": []}',
+    "Evaluation Agent": '{"score": 90, "feedback": "ok"}',
+}
+
+
+class RecordingLlm(BaseLlm):
+    """Answers every agent with a canned reply and keeps the prompts it was sent."""
+
+    model: str = "recording"
+    prompts: List[str] = []
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        system = str(llm_request.config.system_instruction or "")
+        contents = "\n".join(part.text or "" for content in llm_request.contents for part in content.parts or [])
+        self.prompts.append(system + "\n" + contents)
+        reply = next(text for marker, text in REPLIES.items() if marker in system)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=reply)]))
+
+
+def test_risk_prompt_contains_only_non_compliant_apps(tmp_path):
+    llm = RecordingLlm(prompts=[])
+    config = PipelineConfig(session_path=str(tmp_path / "sessions.sqlite"), llm_cache_path="", run_id=None, resume=False)
+    pipeline = GovernancePipeline(config, CmdbStore(cmdb_data), tools=[])
+    pipeline.make_model = lambda model_name="": llm
+
+    outputs = asyncio.run(pipeline.run_sequential(pipeline.store))
+
+    results = {r["applicationId"]: r["isCompliant"] for r in outputs["compliance_results"]}
+    assert results == {1: True, 2: False, 3: False, 4: True, 5: False}
+    risk_prompt = next(p for p in llm.prompts if "Risk Assessment Agent" in p)
+    for app in cmdb_data:
+        assert (app["name"] in risk_prompt) == (not results[app["id"]]), app["name"]
+    # The compliance stage's reply is a summary, not the results
+    assert json.dumps(outputs["compliance_results"]) not in risk_prompt
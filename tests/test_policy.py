@@ -0,0 +1,82 @@
+import json
+import re
+
+import pytest
+import yaml
+
+from cmdb_connectors import (
+    DEFAULT_POLICY_PATH,
+    ComplianceRegistry,
+    PolicyRule,
+    load_policy,
+    parse_policy,
+    render_policy,
+    render_policy_doc,
+    render_rules,
+)
+
+POLICY_DOC = """\
+PCI requires all applications to have the following:
+    - Encrypted data in transit and at rest.
+    - Regular Vulnerability scanning.
+    - Must not be deployed in a 'sandbox' or 'qa' environment.
+SOC2 requires all applications to have the following:
+    - Regular Risk Management assessment.
+    - Must not be deployed in a 'sandbox' environment.
+GDPR requires all applications to have the following:
+    - Data Privacy Controls.
+    - Must not have more than 10,000 users in a 'uat' environment."""
+
+
+def test_default_policy_parses_to_the_expected_rules():
+    policy = load_policy(DEFAULT_POLICY_PATH, ComplianceRegistry())
+    assert policy.standards == {
+        "PCI": ["Encrypted data in transit and at rest.", "Regular Vulnerability scanning."],
+        "SOC2": ["Regular Risk Management assessment."],
+        "GDPR": ["Data Privacy Controls."],
+    }
+    assert policy.rules == [
+        PolicyRule("pci_non_prod", "PCI", ("sandbox", "qa")),
+        PolicyRule("gdpr_uat_users", "GDPR", ("uat",), (("users", "gt", 10000),)),
+        PolicyRule("soc2_sandbox", "SOC2", ("sandbox",)),
+    ]
+    assert render_policy_doc(policy) == POLICY_DOC
+    assert render_rules(policy).splitlines()[0] == (
+        "- NON-COMPLIANT if: Subject to 'PCI' compliance but deployed in a 'sandbox' or 'qa' environment."
+    )
+
+
+@pytest.mark.parametrize("dump, load", [
+    (lambda data: yaml.safe_dump(data, sort_keys=False), yaml.safe_load),
+    (json.dumps, json.loads),
+])
+def test_policy_round_trips_through_render(dump, load):
+    policy = load_policy(DEFAULT_POLICY_PATH, ComplianceRegistry())
+    policy.rules.append(PolicyRule("pci_tiny", "PCI", (), (("users", "gte", 1), ("users", "lt", 10)), "Too small."))
+    again = parse_policy(load(dump(render_policy(policy))), ComplianceRegistry())
+    assert again == policy
+    assert render_policy_doc(again) == render_policy_doc(policy)
+
+
+def test_new_standards_are_registered():
+    registry = ComplianceRegistry()
+    parse_policy({"rules": [{"standard": "HIPAA", "forbid": {"deployment": "qa"}}]}, registry)
+    assert "HIPAA" in registry
+
+
+@pytest.mark.parametrize("rule, message", [
+    ({"standard": "PCI"}, "needs a 'forbid' mapping"),
+    ({"forbid": {"deployment": "qa"}}, "needs a 'standard'"),
+    ({"standard": "PCI", "forbid": {"owner": "HR"}}, "cannot forbid 'owner'"),
+    ({"standard": "PCI", "forbid": {"users": {"ne": 1}}}, "unknown comparison 'ne'"),
+    ({"standard": "PCI", "forbid": {"deployment": "qa"}, "when": 1}, "unknown key(s) ['when']"),
+])
+def test_invalid_rules_are_rejected(rule, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        parse_policy({"rules": [rule]}, ComplianceRegistry())
+
+
+def test_duplicate_rule_ids_are_rejected():
+    rule = {"id": "dup", "standard": "PCI", "forbid": {"deployment": "qa"}}
+    with pytest.raises(ValueError, match="Duplicate policy rule id 'dup'"):
+        parse_policy({"rules": [rule, rule]}, ComplianceRegistry())
@@ -0,0 +1,31 @@
+import os
+
+from cmdb_connectors import DEFAULT_POLICY_PATH, load_policy
+from policy_index import PolicyIndex, open_index
+
+
+def _embed(texts):
+    return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_standards_without_clauses_get_no_hits(tmp_path):
+    index = open_index(str(tmp_path / "index"), load_policy(DEFAULT_POLICY_PATH), DEFAULT_POLICY_PATH)
+
+    assert index.search("deployed in sandbox", ["PCI"])
+    assert {hit["source"] for hit in index.search("deployed in sandbox", ["PCI"], k=10)} == {"policy:PCI"}
+    # No HIPAA clauses in the default policy: other standards' rules must not be returned
+    assert index.search("deployed in sandbox", ["HIPAA"]) == []
+    assert index.search("deployed in sandbox", ["NOT-A-STANDARD"]) == []
+
+
+def test_rebuild_without_embeddings_removes_stale_arrays(tmp_path):
+    directory = str(tmp_path / "index")
+    policy = load_policy(DEFAULT_POLICY_PATH)
+    open_index(directory, policy, DEFAULT_POLICY_PATH, embedder=_embed, embed_model="test")
+    assert os.path.exists(os.path.join(directory, "embeddings.npy"))
+
+    index = open_index(directory, policy, DEFAULT_POLICY_PATH)
+
+    assert not os.path.exists(os.path.join(directory, "embeddings.npy"))
+    assert "embeddings" not in index.arrays
+    assert "embeddings" not in PolicyIndex.load(directory).arrays
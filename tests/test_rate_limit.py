@@ -0,0 +1,78 @@
+import asyncio
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from harness import stub_server, stub_stats
+from model_registry import ModelRegistry
+from rate_limit import TokenBucket, get_rate_limiter
+
+
+def test_limiters_are_per_loop_and_per_settings():
+    async def lookup(**kwargs):
+        return get_rate_limiter("model-a", **kwargs)
+
+    first = asyncio.run(lookup(max_concurrency=4))
+    second = asyncio.run(lookup(max_concurrency=4))
+    assert first is not second
+
+    async def same_loop():
+        return (
+            get_rate_limiter("model-a", max_concurrency=4),
+            get_rate_limiter("model-a", max_concurrency=4),
+            get_rate_limiter("model-a", max_concurrency=8),
+        )
+
+    a, b, c = asyncio.run(same_loop())
+    assert a is b
+    assert c is not a
+    assert c.concurrency.maximum == 8
+
+
+def test_token_bucket_waiters_sleep_concurrently():
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10 tokens/s
+
+    async def run():
+        await bucket.acquire(1)
+        return await asyncio.gather(*(bucket.acquire(1) for _ in range(3)))
+
+    waits = asyncio.run(run())
+    # Each waiter reserved its place in line instead of queueing behind a held lock
+    assert [round(wait, 1) for wait in sorted(waits)] == [0.1, 0.2, 0.3]
+
+
+def test_throttling_halves_the_concurrency_limit(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    with stub_server(throttle_rate=0.3) as url:
+        registry = ModelRegistry(
+            retry_options=types.HttpRetryOptions(
+                attempts=20, initial_delay=0.01, max_delay=0.02, jitter=0, http_status_codes=[429],
+            ),
+            base_url=url,
+            rate_limiter_factory=lambda name: get_rate_limiter(
+                name, requests_per_minute=100_000, tokens_per_minute=10_000_000,
+                initial_concurrency=8, max_concurrency=8,
+            ),
+        )
+        model = registry.get("gemini-test")
+
+        async def call(i):
+            request = LlmRequest(
+                model="gemini-test",
+                contents=[types.Content(role="user", parts=[types.Part(text=f"request {i}")])],
+                config=types.GenerateContentConfig(),
+            )
+            return [response async for response in model.generate_content_async(request)]
+
+        async def run():
+            await asyncio.gather(*(call(i) for i in range(40)))
+            return registry.stats()["gemini-test"]["rate_limit"]
+
+        limits = asyncio.run(run())
+        served = stub_stats(url)
+
+    assert served["throttled"] > 0
+    # Every 429, including SDK retries, reached the AIMD controller
+    assert limits["throttled"] == served["throttled"]
+    assert limits["calls"] == 40
+    assert limits["concurrency_limit"] < 8
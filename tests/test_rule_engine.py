@@ -0,0 +1,46 @@
+from ArchGov import cmdb_data
+from cmdb_connectors import Policy, PolicyRule
+from cmdb_store import CmdbStore
+from rule_engine import ComplianceRuleEngine, compile_policy
+
+EXPECTED = {
+    "Customer Payments Gateway": (True, [], None),
+    "User Data Analytics": (
+        False, ["gdpr_uat_users"], "Subject to 'GDPR' compliance but has more than 10,000 users in a 'uat' environment.",
+    ),
+    "PCI Feature Dev": (
+        False, ["pci_non_prod"], "Subject to 'PCI' compliance but deployed in a 'sandbox' or 'qa' environment.",
+    ),
+    "Internal HR Portal": (True, [], None),
+    "SOC2 Staging Env": (False, ["soc2_sandbox"], "Subject to 'SOC2' compliance but deployed in a 'sandbox' environment."),
+}
+
+
+def test_sample_apps_get_the_expected_verdicts():
+    results = ComplianceRuleEngine().evaluate(CmdbStore(cmdb_data))
+    assert [r.applicationId for r in results] == [1, 2, 3, 4, 5]
+    assert {r.appName: (r.isCompliant, r.violations, r.reason) for r in results} == EXPECTED
+
+
+def test_records_and_store_are_evaluated_alike():
+    engine = ComplianceRuleEngine()
+    assert engine.evaluate(cmdb_data) == engine.evaluate(CmdbStore(cmdb_data))
+
+
+def test_every_violated_rule_is_reported():
+    policy = Policy(rules=[
+        PolicyRule(id="no_sandbox", standard="PCI", deployment=("sandbox",), reason="No sandbox."),
+        PolicyRule(id="few_users", standard="PCI", conditions=(("users", "lt", 100),), reason="Too few users."),
+        PolicyRule(id="no_prod", standard="PCI", deployment=("prod",), reason="No prod."),
+    ])
+    engine = ComplianceRuleEngine(compile_policy(policy))
+    results = {r.appName: r for r in engine.evaluate(cmdb_data)}
+    assert results["PCI Feature Dev"].violations == ["no_sandbox", "few_users"]
+    assert results["PCI Feature Dev"].reason == "No sandbox. Too few users."
+    assert results["Customer Payments Gateway"].violations == ["no_prod"]
+    assert results["SOC2 Staging Env"].isCompliant and results["SOC2 Staging Env"].violations == []
+
+
+def test_no_rules_means_everything_is_compliant():
+    results = ComplianceRuleEngine([]).evaluate(cmdb_data)
+    assert all(r.isCompliant and r.violations == [] and r.reason is None for r in results)
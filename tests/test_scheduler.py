@@ -0,0 +1,98 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from scheduler import Step, TaskGraph
+
+
+def test_steps_start_after_their_inputs_and_get_their_results():
+    log = []
+    lock = threading.Lock()
+
+    def step(name, value):
+        def run(inputs):
+            with lock:
+                log.append(name)
+            return value + sum(inputs.values())
+        return run
+
+    graph = TaskGraph([
+        Step("report", step("report", 100), inputs=("risk", "remediation")),
+        Step("remediation", step("remediation", 10), inputs=("compliance",)),
+        Step("risk", step("risk", 1), inputs=("compliance",)),
+        Step("compliance", step("compliance", 0)),
+    ])
+    assert graph.order == ["compliance", "remediation", "risk", "report"]
+    results = graph.run(max_workers=4)
+    assert results == {"compliance": 0, "remediation": 10, "risk": 1, "report": 111}
+    assert log[0] == "compliance" and log[-1] == "report"
+    assert graph.timings["report"]["start"] >= max(graph.timings[s]["end"] for s in ("risk", "remediation"))
+
+
+def test_independent_steps_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    graph = TaskGraph([Step("a", lambda inputs: barrier.wait()), Step("b", lambda inputs: barrier.wait())])
+    # Would time out (BrokenBarrierError) if the steps ran one after the other
+    assert sorted(graph.run(max_workers=2).values()) == [0, 1]
+
+
+def test_fan_out_keeps_item_order():
+    def assess(item, inputs):
+        time.sleep(0.01 * (5 - item))  # later items finish first
+        return item * inputs["apps"]
+
+    graph = TaskGraph([
+        Step("apps", lambda inputs: 10),
+        Step("risk", assess, inputs=("apps",), fan_out=lambda inputs: range(5)),
+        Step("none", assess, inputs=("apps",), fan_out=lambda inputs: []),
+        Step("report", lambda inputs: (inputs["risk"], inputs["none"]), inputs=("risk", "none")),
+    ])
+    results = graph.run(max_workers=5)
+    assert results["report"] == ([0, 10, 20, 30, 40], [])
+    assert len(graph.timings["risk"]["items"]) == 5
+
+
+def test_first_failure_cancels_steps_not_yet_started():
+    started = []
+
+    def fail(inputs):
+        raise ValueError("model unavailable")
+
+    def slow(item, inputs):
+        started.append(item)
+        time.sleep(0.05)
+
+    graph = TaskGraph([
+        Step("fail", fail),
+        Step("items", slow, fan_out=lambda inputs: range(10)),
+        Step("after", lambda inputs: started.append("after"), inputs=("fail",)),
+    ])
+    with pytest.raises(RuntimeError, match="Crew step 'fail' failed") as raised:
+        graph.run(max_workers=1)
+    assert isinstance(raised.value.__cause__, ValueError)
+    # One worker: the failure is seen while the items are still queued
+    assert len(started) < 10
+    assert "after" not in started
+
+
+def test_steps_run_in_the_callers_context():
+    current = contextvars.ContextVar("current", default="unset")
+    current.set("crew.run")
+    graph = TaskGraph([
+        Step("a", lambda inputs: current.get()),
+        Step("b", lambda item, inputs: current.get(), fan_out=lambda inputs: [1]),
+    ])
+    assert graph.run() == {"a": "crew.run", "b": ["crew.run"]}
+
+
+@pytest.mark.parametrize("steps, message", [
+    ([Step("a", print, inputs=("b",)), Step("b", print, inputs=("a",)), Step("c", print)], r"Cycle between steps \['a', 'b'\]"),
+    ([Step("a", print, inputs=("a",))], r"Cycle between steps \['a'\]"),
+    ([Step("a", print, inputs=("missing",))], r"Step 'a' depends on unknown step\(s\) \['missing'\]"),
+    ([Step("a", print), Step("a", print)], "Duplicate step 'a'"),
+])
+def test_invalid_graphs_are_rejected(steps, message):
+    with pytest.raises(ValueError, match=message):
+        TaskGraph(steps)
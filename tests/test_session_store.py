@@ -0,0 +1,105 @@
+import asyncio
+from typing import AsyncGenerator, List
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.genai import types
+
+from session_store import COMPLETED_STAGES_KEY, ResumableSequentialAgent, SqliteSessionService
+
+APP, USER, SESSION = "archgov-test", "tester", "run-1"
+
+
+class StubStage(BaseAgent):
+    """Emits a tool call, then a final reply stored under `<name>_output`; raises while `crash` is set."""
+
+    calls: List[str] = []
+    crash: bool = False
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        self.calls.append(self.name)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(name="lookup", args={}))]),
+        )
+        if self.crash:
+            raise RuntimeError(f"{self.name} was killed")
+        reply = f"{self.name} done"
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text=reply)]),
+            actions=EventActions(state_delta={f"{self.name}_output": reply}),
+        )
+
+
+def pipeline(crash_second: bool) -> ResumableSequentialAgent:
+    return ResumableSequentialAgent(
+        name="Pipeline",
+        sub_agents=[StubStage(name="first", calls=[]), StubStage(name="second", calls=[], crash=crash_second)],
+        output_keys={"first": "first_output", "second": "second_output"},
+    )
+
+
+async def run(path: str, agent: ResumableSequentialAgent, create: bool, compact_events: bool = True) -> List[Event]:
+    service = SqliteSessionService(path, batch_size=100, compact_events=compact_events)
+    try:
+        if create:
+            await service.create_session(app_name=APP, user_id=USER, session_id=SESSION, state={COMPLETED_STAGES_KEY: []})
+        runner = Runner(agent=agent, app_name=APP, session_service=service)
+        message = types.Content(role="user", parts=[types.Part(text="go")])
+        return [event async for event in runner.run_async(user_id=USER, session_id=SESSION, new_message=message)]
+    finally:
+        await service.close()
+
+
+async def load(path: str):
+    service = SqliteSessionService(path)
+    try:
+        return await service.get_session(app_name=APP, user_id=USER, session_id=SESSION)
+    finally:
+        await service.close()
+
+
+def texts(events: List[Event]) -> List[tuple]:
+    return [(e.author, e.content.parts[0].text) for e in events if e.content and e.content.parts[0].text]
+
+
+def test_resumed_run_replays_completed_stages(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    killed = pipeline(crash_second=True)
+    with pytest.raises(RuntimeError, match="second was killed"):
+        asyncio.run(run(path, killed, create=True))
+    assert [stage.calls for stage in killed.sub_agents] == [["first"], ["second"]]
+    session = asyncio.run(load(path))
+    assert session.state[COMPLETED_STAGES_KEY] == ["first"]
+    assert session.state["first_output"] == "first done"
+
+    resumed = pipeline(crash_second=False)
+    events = asyncio.run(run(path, resumed, create=False))
+    # The completed stage is replayed from state, not run again
+    assert [stage.calls for stage in resumed.sub_agents] == [[], ["second"]]
+    assert texts(events) == [("first", "first done"), ("second", "second done")]
+    assert asyncio.run(load(path)).state[COMPLETED_STAGES_KEY] == ["first", "second"]
+
+
+def test_compaction_keeps_final_responses(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    asyncio.run(run(path, pipeline(crash_second=False), create=True))
+    events = asyncio.run(load(path)).events
+    stage_events = [e for e in events if e.author in ("first", "second")]
+    assert texts(stage_events) == [("first", "first done"), ("second", "second done")]
+    # Both stages' tool calls were dropped once their final reply was stored
+    assert not any(e.get_function_calls() for e in events)
+    assert [e.content.parts[0].text for e in events if e.author == "user"] == ["go"]
+
+
+def test_without_compaction_every_event_is_kept(tmp_path):
+    path = str(tmp_path / "sessions.sqlite")
+    asyncio.run(run(path, pipeline(crash_second=False), create=True, compact_events=False))
+    events = asyncio.run(load(path)).events
+    assert sum(bool(e.get_function_calls()) for e in events) == 2
@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+import sharding
+from sharding import run_sharded, split_into_shards
+
+
+def test_failed_shard_keeps_the_other_shards(monkeypatch):
+    async def fake_run_agent(agent, message, app_name=""):
+        shard = json.loads(message)
+        if any(item["applicationId"] == 3 for item in shard):
+            raise RuntimeError("503 UNAVAILABLE")
+        return [json.dumps([{**item, "reason": "explained"} for item in shard])]
+
+    monkeypatch.setattr(sharding, "run_agent", fake_run_agent)
+    monkeypatch.setattr(sharding, "final_text", lambda events: events[-1])
+    items = [{"applicationId": i, "appName": f"App {i}", "isCompliant": False, "reason": "rule"} for i in range(1, 7)]
+
+    results, failed = asyncio.run(run_sharded(
+        agent=None, shards=split_into_shards(items, 2), build_message=json.dumps, attempts=2, initial_delay=0,
+    ))
+
+    assert failed == [1]
+    assert [r.applicationId for r in results] == [1, 2, 5, 6]
+    assert all(r.reason == "explained" for r in results)
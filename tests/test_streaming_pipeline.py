@@ -0,0 +1,93 @@
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from ArchGov import PipelineConfig, cmdb_data
+from cmdb_store import CmdbStore
+from pipeline import GovernancePipeline
+from streaming_pipeline import run_streaming_pipeline
+
+
+class FlakyRiskLlm(BaseLlm):
+    """Assesses one risk per application, except that it fails for application 3."""
+
+    model: str = "flaky"
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        system = str(llm_request.config.system_instruction or "")
+        if "Risk Assessment Agent" in system:
+            if '"applicationId":3' in system:
+                raise RuntimeError("model unavailable")
+            app_id = int(system.split('"applicationId":')[1].split(",")[0])
+            reply = [{"applicationId": app_id, "risk": f"risk {app_id}", "severity": "High"}]
+        else:
+            reply = [{"applicationId": None, "risk": "r", "recommendation": "fix", "priority": "High"}]
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=json.dumps(reply))]))
+
+
+class UnparseableRiskLlm(BaseLlm):
+    """Replies with nothing for application 2 and with prose for application 5."""
+
+    model: str = "unparseable"
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        system = str(llm_request.config.system_instruction or "")
+        if '"applicationId":2' in system:
+            text = ""
+        elif '"applicationId":5' in system:
+            text = "I could not assess this application."
+        elif "Risk Assessment Agent" in system:
+            text = json.dumps([{"applicationId": 3, "risk": "risk 3", "severity": "High"}])
+        else:
+            text = json.dumps([{"applicationId": 3, "risk": "risk 3", "recommendation": "fix", "priority": "High"}])
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def streaming_pipeline(tmp_path, llm):
+    config = PipelineConfig(
+        session_path=str(tmp_path / "sessions.sqlite"), llm_cache_path="", pipeline_mode="streaming", stage_workers=2,
+    )
+    pipeline = GovernancePipeline(config, CmdbStore(cmdb_data), tools=[])
+    pipeline.make_model = lambda model_name="": llm
+    return pipeline
+
+
+def test_failed_items_are_reported(tmp_path):
+    pipeline = streaming_pipeline(tmp_path, FlakyRiskLlm())
+
+    outputs = asyncio.run(pipeline.run(final_stages=False))
+
+    assert sorted(r["applicationId"] for r in outputs["risks"]) == [2, 5]
+    assert [(f["stage"], f["applicationId"]) for f in outputs["failures"]] == [("riskassessment", 3)]
+    assert "model unavailable" in outputs["failures"][0]["error"]
+
+
+def test_items_without_valid_output_are_reported(tmp_path):
+    pipeline = streaming_pipeline(tmp_path, UnparseableRiskLlm())
+
+    outputs = asyncio.run(pipeline.run(final_stages=False))
+
+    assert [r["applicationId"] for r in outputs["risks"]] == [3]
+    assert len(outputs["recommendations"]) == 1
+    assert sorted((f["stage"], f["applicationId"]) for f in outputs["failures"]) == [
+        ("riskassessment", 2), ("riskassessment", 5),
+    ]
+
+
+def test_failing_source_stops_every_stage():
+    async def source():
+        raise RuntimeError("CMDB export unreadable")
+        yield
+
+    async def run():
+        with pytest.raises(RuntimeError, match="CMDB export unreadable"):
+            await run_streaming_pipeline(source(), risk_agent=None, recommendation_agent=None, workers=2)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
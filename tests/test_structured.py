@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from schemas import RiskAssessment
+from structured import StructuredOutputError, StructuredOutputs
+
+VALID = {"appName": "PCI Feature Dev", "risk": "Card data in a sandbox", "severity": "High"}
+
+
+class ScriptedCompletion:
+    """Returns the given replies in order and records every repair request."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def __call__(self, messages, schema):
+        self.requests.append((messages, schema))
+        return self.replies.pop(0)
+
+
+def test_valid_output_needs_no_completion():
+    complete = ScriptedCompletion()
+    structured = StructuredOutputs(complete)
+    text = f"Thought: I now know the final answer\nFinal Answer: ```json\n{json.dumps(VALID)}\n```"
+    assert structured.parse(RiskAssessment, text) == RiskAssessment(**VALID)
+    assert complete.requests == []
+    assert structured.stats() == {"generated": 0, "valid": 1, "repaired": 0, "failed": 0}
+
+
+def test_json_is_found_past_earlier_fenced_blocks():
+    text = f"Query:\n```sql\nSELECT name FROM apps WHERE env = {{env}}\n```\nResult:\n```json\n{json.dumps(VALID)}\n```"
+    assert StructuredOutputs(ScriptedCompletion()).parse(RiskAssessment, text) == RiskAssessment(**VALID)
+
+
+def test_validation_is_strict():
+    structured = StructuredOutputs(ScriptedCompletion())
+    with pytest.raises(ValueError):
+        # strict mode does not coerce a number into a string field
+        structured.validate(RiskAssessment, json.dumps(dict(VALID, severity=3)))
+
+
+def test_invalid_output_gets_one_repair_pass():
+    complete = ScriptedCompletion(json.dumps(VALID))
+    structured = StructuredOutputs(complete)
+    broken = json.dumps({"appName": "PCI Feature Dev", "risk": "Card data in a sandbox"})
+    assert structured.parse(RiskAssessment, broken) == RiskAssessment(**VALID)
+    [(messages, schema)] = complete.requests
+    assert schema == RiskAssessment.model_json_schema()
+    assert "severity" in messages[1]["content"] and broken in messages[1]["content"]
+    assert structured.stats()["repaired"] == 1
+
+
+def test_gives_up_after_the_repair_pass():
+    complete = ScriptedCompletion("I cannot produce JSON for this.", json.dumps(VALID))
+    structured = StructuredOutputs(complete)
+    with pytest.raises(StructuredOutputError, match="RiskAssessment output still invalid after repair"):
+        structured.parse(RiskAssessment, "no JSON here")
+    # Exactly one repair attempt: the second scripted reply was never requested
+    assert len(complete.requests) == 1
+    assert structured.stats()["failed"] == 1
+
+
+def test_generate_is_schema_constrained():
+    complete = ScriptedCompletion(json.dumps(VALID))
+    structured = StructuredOutputs(complete)
+    assert structured.generate(RiskAssessment, "You assess risk.", "Assess PCI Feature Dev.") == RiskAssessment(**VALID)
+    [(messages, schema)] = complete.requests
+    assert [m["role"] for m in messages] == ["system", "user"]
+    assert schema == RiskAssessment.model_json_schema()
+    assert structured.stats() == {"generated": 1, "valid": 1, "repaired": 0, "failed": 0}